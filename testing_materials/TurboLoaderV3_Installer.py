@@ -6,21 +6,68 @@ Comprehensive, user-friendly installer with advanced detection and validation
 
 import os
 import sys
+import argparse
+import hashlib
 import json
+import logging
 import shutil
 import zipfile
 import subprocess
 import platform
+import queue
+import re
 import time
 import threading
-import winreg
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import requests
-from urllib.parse import urlparse
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Unattended installs must work on machines without Tk
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+except ImportError:
+    tk = None
+
+try:
+    from gdscript_validator import GDScriptValidator
+except ImportError:
+    GDScriptValidator = None
+
+try:
+    from release_patch import apply_patch
+except ImportError:
+    apply_patch = None
+
+try:
+    from install_lock import InstallLock
+except ImportError:
+    InstallLock = None
+
+try:
+    from verify_installation import MANIFEST_NAME
+except ImportError:
+    MANIFEST_NAME = "TurboLoaderV3.manifest.json"
+
+# Detection problems are diagnostics, not installer output
+logger = logging.getLogger(__name__)
+
+def submit_daemon(function: Callable, *args) -> Future:
+    """Run a call on a daemon thread, so a hung filesystem probe can never block interpreter exit"""
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
 
 @dataclass
 class InstallationConfig:
@@ -32,6 +79,44 @@ class InstallationConfig:
     backup_existing: bool = True
     verify_installation: bool = True
     enable_analytics: bool = True
+    
+    # Keys accepted in an answer file and the types they must have
+    ANSWER_FILE_KEYS = {
+        "mods_folder": (str, type(None)),
+        "dungeondraft_path": (str, type(None)),
+        "backup_existing": (bool,),
+        "verify_installation": (bool,),
+        "enable_analytics": (bool,)
+    }
+    
+    @classmethod
+    def from_answer_file(cls, answer_file: Path) -> "InstallationConfig":
+        """Load an unattended installation configuration from a JSON answer file"""
+        with open(answer_file, 'r', encoding='utf-8') as f:
+            answers = json.load(f)
+        
+        if not isinstance(answers, dict):
+            raise ValueError(f"Answer file must contain a JSON object: {answer_file}")
+        
+        unknown_keys = sorted(set(answers) - set(cls.ANSWER_FILE_KEYS))
+        if unknown_keys:
+            raise ValueError(f"Unknown answer file keys: {', '.join(unknown_keys)}")
+        
+        for key, value in answers.items():
+            if not isinstance(value, cls.ANSWER_FILE_KEYS[key]):
+                raise ValueError(f"Answer file key '{key}' has invalid value: {value!r}")
+        
+        config = cls(install_method="unattended")
+        for key in ("backup_existing", "verify_installation", "enable_analytics"):
+            if key in answers:
+                setattr(config, key, answers[key])
+        
+        if answers.get("mods_folder"):
+            config.mods_folder = Path(answers["mods_folder"]).expanduser()
+        if answers.get("dungeondraft_path"):
+            config.dungeondraft_path = Path(answers["dungeondraft_path"]).expanduser()
+        
+        return config
 
 @dataclass
 class SystemRequirements:
@@ -40,9 +125,196 @@ class SystemRequirements:
     memory_sufficient: bool = False
     disk_space_sufficient: bool = False
     dungeondraft_detected: bool = False
+    dungeondraft_path: Optional[Path] = None
     dungeondraft_version: Optional[str] = None
     python_available: bool = False
 
+@dataclass
+class FileOperation:
+    """One planned filesystem change made by an installation"""
+    phase: str  # validate, backup, copy, config
+    action: str  # mkdir, move, copy, extract, write
+    destination: Path
+    source: Optional[Path] = None
+    size: int = 0
+    file_count: int = 0
+    content: Optional[bytes] = None
+    member: Optional[str] = None  # Bundle object digest for extract
+    
+    def describe(self) -> str:
+        """Describe the operation as a single line"""
+        if self.action == "mkdir":
+            return f"mkdir  {self.destination}"
+        if self.action == "move":
+            return f"move   {self.source} -> {self.destination} ({self.file_count} files, {self.size} bytes)"
+        if self.action == "copy":
+            return f"copy   {self.source} -> {self.destination} ({self.size} bytes)"
+        if self.action == "extract":
+            return f"extract {self.source}:{self.member[:12]} -> {self.destination} ({self.size} bytes)"
+        return f"write  {self.destination} ({self.size} bytes)"
+    
+    def to_dict(self) -> Dict:
+        """Machine-readable form of the operation"""
+        return {
+            "phase": self.phase,
+            "action": self.action,
+            "source": str(self.source) if self.source else None,
+            "member": self.member,
+            "destination": str(self.destination),
+            "bytes": self.size,
+            "files": self.file_count
+        }
+
+class BundleReader:
+    """Random-access reader for flattened release bundles: index.json plus objects/<sha256>"""
+    
+    INDEX_NAME = "index.json"
+    FORMAT = 1
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        try:
+            self.index = json.loads(self._zip.read(self.INDEX_NAME))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"{self.path.name} is not a release bundle (no {self.INDEX_NAME})")
+        
+        if self.index.get("format") != self.FORMAT:
+            self._zip.close()
+            raise ValueError(f"Unsupported bundle format {self.index.get('format')}")
+    
+    def close(self):
+        self._zip.close()
+    
+    def components(self) -> List[str]:
+        """Names of the components stored in the bundle"""
+        return sorted(self.index["components"])
+    
+    def files(self, component: str) -> Dict[str, str]:
+        """Relative path to object digest for every file in a component"""
+        if component not in self.index["components"]:
+            raise ValueError(f"Unknown bundle component '{component}' (available: {', '.join(self.components())})")
+        return self.index["components"][component]
+    
+    def object_size(self, digest: str) -> int:
+        return self.index["objects"][digest]["size"]
+    
+    def read(self, digest: str) -> bytes:
+        """Read one object, checking it against its digest"""
+        content = self._zip.read(f"objects/{digest}")
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise ValueError(f"Bundle object {digest[:12]} is corrupt")
+        return content
+    
+    def extract_object(self, digest: str, destination: Path):
+        """Stream one object straight to its destination, replacing it atomically"""
+        temp_path = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")
+        sha256_hash = hashlib.sha256()
+        
+        with self._zip.open(f"objects/{digest}") as source, open(temp_path, 'wb') as target:
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                sha256_hash.update(chunk)
+                target.write(chunk)
+        
+        if sha256_hash.hexdigest() != digest:
+            temp_path.unlink()
+            raise ValueError(f"Bundle object {digest[:12]} is corrupt")
+        os.replace(temp_path, destination)
+    
+    def extract_component(self, component: str, output_dir: Path) -> int:
+        """Extract every file of one component; returns the number of files written"""
+        files = self.files(component)
+        for relative_path, digest in sorted(files.items()):
+            if Path(relative_path).is_absolute() or ".." in Path(relative_path).parts:
+                raise ValueError(f"Unsafe path in bundle: {relative_path}")
+            destination = output_dir / relative_path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            self.extract_object(digest, destination)
+        return len(files)
+
+@dataclass
+class TraceSpan:
+    """Timing and throughput recorded for one installation phase"""
+    name: str
+    start: float
+    duration: float = 0.0
+    bytes_moved: int = 0
+    file_count: int = 0
+
+class InstallTracer:
+    """Span-based instrumentation for installation phases"""
+    
+    def __init__(self):
+        self.spans: List[TraceSpan] = []
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+    
+    @contextmanager
+    def span(self, name: str):
+        """Time a phase; the caller adds bytes and file counts to the yielded span"""
+        span = TraceSpan(name=name, start=time.perf_counter() - self._origin)
+        self.spans.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - self._origin - span.start
+    
+    def to_chrome_trace(self) -> Dict:
+        """Build a Chrome trace (chrome://tracing, Perfetto) of all spans"""
+        events = []
+        for span in self.spans:
+            events.append({
+                "name": span.name,
+                "cat": "install",
+                "ph": "X",
+                "ts": round(span.start * 1_000_000),
+                "dur": round(span.duration * 1_000_000),
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": {
+                    "bytes_moved": span.bytes_moved,
+                    "file_count": span.file_count
+                }
+            })
+        
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "installer_version": "3.0.0",
+                "platform": platform.platform(),
+                "started_at": self.started_at
+            }
+        }
+    
+    def export(self, path: Path) -> Path:
+        """Write the trace atomically as Chrome trace JSON, or one span per line for .jsonl"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        if path.suffix == ".jsonl":
+            with open(temp_path, 'w') as f:
+                for span in self.spans:
+                    f.write(json.dumps({
+                        "phase": span.name,
+                        "start_s": span.start,
+                        "duration_s": span.duration,
+                        "bytes_moved": span.bytes_moved,
+                        "file_count": span.file_count
+                    }) + "\n")
+        else:
+            with open(temp_path, 'w') as f:
+                json.dump(self.to_chrome_trace(), f, indent=2)
+        
+        os.replace(temp_path, path)
+        return path
+    
+    def summary_lines(self) -> List[str]:
+        """Human-readable one-line summary per phase"""
+        return [f"{span.name}: {span.duration * 1000:.1f} ms, "
+                f"{span.file_count} files, {span.bytes_moved} bytes"
+                for span in self.spans]
+
 class DungeondraftDetector:
     """Advanced Dungeondraft installation detection"""
     
@@ -67,17 +339,39 @@ class DungeondraftDetector:
         ]
     }
     
+    # Steam installation roots that may hold a libraryfolders.vdf
+    STEAM_ROOTS = {
+        "Darwin": [
+            "~/Library/Application Support/Steam"
+        ],
+        "Linux": [
+            "~/.steam/steam",
+            "~/.local/share/Steam",
+            "~/.var/app/com.valvesoftware.Steam/.local/share/Steam"
+        ]
+    }
+    
+    # Seconds to wait for all candidate paths before giving up on slow drives
+    PROBE_TIMEOUT = 3.0
+    
+    _VDF_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*|[^\s{}"]+')
+    
     def __init__(self):
         self.os_name = platform.system()
-        
+    
     def detect_installation(self) -> Tuple[Optional[Path], Optional[str]]:
         """Detect Dungeondraft installation path and version"""
         
+        # Probe every Steam library and common location at once
+        steam_candidates = self._get_steam_candidates()
+        common_candidates = [Path(path_str).expanduser()
+                             for path_str in self.COMMON_INSTALL_PATHS.get(self.os_name, [])]
+        valid_paths = self._probe_installations(steam_candidates + common_candidates)
+        
         # Try Steam detection first
-        steam_path = self._detect_steam_installation()
-        if steam_path:
-            version = self._get_dungeondraft_version(steam_path)
-            return steam_path, version
+        for path in steam_candidates:
+            if path in valid_paths:
+                return path, self._get_dungeondraft_version(path)
         
         # Try registry detection (Windows)
         if self.os_name == "Windows":
@@ -87,49 +381,149 @@ class DungeondraftDetector:
                 return registry_path, version
         
         # Try common installation paths
-        for path_str in self.COMMON_INSTALL_PATHS.get(self.os_name, []):
-            path = Path(path_str).expanduser()
-            if self._is_valid_dungeondraft_installation(path):
-                version = self._get_dungeondraft_version(path)
-                return path, version
+        for path in common_candidates:
+            if path in valid_paths:
+                return path, self._get_dungeondraft_version(path)
         
         return None, None
     
-    def _detect_steam_installation(self) -> Optional[Path]:
-        """Detect Dungeondraft through Steam"""
-        try:
-            if self.os_name == "Windows":
-                # Check Steam registry
-                import winreg
-                steam_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                         r"SOFTWARE\WOW6432Node\Valve\Steam")
-                steam_path = winreg.QueryValueEx(steam_key, "InstallPath")[0]
-                
-                # Look for Dungeondraft in Steam library
-                steam_apps = Path(steam_path) / "steamapps" / "common"
-                dungeondraft_steam = steam_apps / "Dungeondraft"
-                
-                if self._is_valid_dungeondraft_installation(dungeondraft_steam):
-                    return dungeondraft_steam
-                    
-            elif self.os_name == "Darwin":  # macOS
-                steam_apps = Path.home() / "Library/Application Support/Steam/steamapps/common"
-                dungeondraft_steam = steam_apps / "Dungeondraft"
+    def _get_steam_candidates(self) -> List[Path]:
+        """List Dungeondraft paths in every known Steam library"""
+        candidates = []
+        
+        for library in self._get_steam_libraries():
+            candidate = library / "steamapps" / "common" / "Dungeondraft"
+            if candidate not in candidates:
+                candidates.append(candidate)
+        
+        return candidates
+    
+    def _get_steam_libraries(self) -> List[Path]:
+        """Collect Steam library roots from libraryfolders.vdf"""
+        libraries = []
+        
+        for steam_root in self._get_steam_roots():
+            if steam_root not in libraries:
+                libraries.append(steam_root)
+            
+            for vdf_path in (steam_root / "steamapps" / "libraryfolders.vdf",
+                             steam_root / "config" / "libraryfolders.vdf"):
+                try:
+                    data = self.parse_vdf(vdf_path.read_text(encoding="utf-8", errors="replace"))
+                except OSError:
+                    continue
                 
-                if self._is_valid_dungeondraft_installation(dungeondraft_steam):
-                    return dungeondraft_steam
+                folders = data.get("libraryfolders") or data.get("LibraryFolders") or {}
+                for key, value in folders.items():
+                    # Current format nests a "path" key, older clients map index -> path
+                    if isinstance(value, dict):
+                        library_path = value.get("path")
+                    elif key.isdigit():
+                        library_path = value
+                    else:
+                        library_path = None
                     
-            elif self.os_name == "Linux":
-                steam_apps = Path.home() / ".steam/steam/steamapps/common"
-                dungeondraft_steam = steam_apps / "Dungeondraft"
-                
-                if self._is_valid_dungeondraft_installation(dungeondraft_steam):
-                    return dungeondraft_steam
+                    if library_path:
+                        library = Path(library_path).expanduser()
+                        if library not in libraries:
+                            libraries.append(library)
+        
+        return libraries
+    
+    def _get_steam_roots(self) -> List[Path]:
+        """Locate Steam installation roots for this platform"""
+        roots = []
+        
+        if self.os_name == "Windows":
+            try:
+                import winreg
+                for hive, key_path in ((winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam"),
+                                       (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam"),
+                                       (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Valve\Steam")):
+                    try:
+                        steam_key = winreg.OpenKey(hive, key_path)
+                    except OSError:
+                        continue
                     
-        except Exception as e:
-            print(f"Steam detection failed: {e}")
+                    try:
+                        for value_name in ("InstallPath", "SteamPath"):
+                            try:
+                                steam_path = Path(winreg.QueryValueEx(steam_key, value_name)[0])
+                            except OSError:
+                                continue
+                            if steam_path not in roots:
+                                roots.append(steam_path)
+                    finally:
+                        winreg.CloseKey(steam_key)
             
-        return None
+            except Exception as e:
+                logger.warning("Steam detection failed: %s", e)
+        else:
+            for root_str in self.STEAM_ROOTS.get(self.os_name, []):
+                root = Path(root_str).expanduser()
+                if root not in roots:
+                    roots.append(root)
+        
+        return roots
+    
+    @classmethod
+    def parse_vdf(cls, text: str) -> Dict:
+        """Parse Valve KeyValues (VDF) text into nested dictionaries"""
+        root = {}
+        stack = [root]
+        pending_key = None
+        
+        for match in cls._VDF_TOKEN.finditer(text):
+            quoted, brace = match.group(1), match.group(2)
+            
+            if brace == "{":
+                section = {}
+                stack[-1][pending_key if pending_key is not None else ""] = section
+                stack.append(section)
+                pending_key = None
+            elif brace == "}":
+                if len(stack) > 1:
+                    stack.pop()
+                pending_key = None
+            elif quoted is None and match.group(0).startswith("//"):
+                continue
+            else:
+                token = match.group(0) if quoted is None else quoted.replace("\\\\", "\\")
+                
+                # Conditional suffixes such as [$WIN32] are ignored
+                if quoted is None and token.startswith("["):
+                    continue
+                
+                if pending_key is None:
+                    pending_key = token
+                else:
+                    stack[-1][pending_key] = token
+                    pending_key = None
+        
+        return root
+    
+    def _probe_installations(self, candidates: List[Path]) -> List[Path]:
+        """Check candidate paths concurrently, skipping any that time out"""
+        if not candidates:
+            return []
+        
+        # Daemon threads, so drives that are still spinning up never block exit
+        futures = {submit_daemon(self._is_valid_dungeondraft_installation, path): path
+                   for path in candidates}
+        done, not_done = wait(futures, timeout=self.PROBE_TIMEOUT)
+        
+        for future in not_done:
+            logger.warning("Timed out probing %s", futures[future])
+        
+        valid_paths = []
+        for future in done:
+            try:
+                if future.result():
+                    valid_paths.append(futures[future])
+            except OSError:
+                continue
+        
+        return valid_paths
     
     def _detect_windows_registry(self) -> Optional[Path]:
         """Detect Dungeondraft through Windows registry"""
@@ -156,26 +550,28 @@ class DungeondraftDetector:
                     continue
                 finally:
                     winreg.CloseKey(subkey)
-                    
+        
         except Exception as e:
-            print(f"Registry detection failed: {e}")
-            
+            logger.warning("Registry detection failed: %s", e)
+        
         return None
     
+    def executable_path(self, path: Path) -> Path:
+        """Dungeondraft executable inside an installation folder"""
+        if self.os_name == "Windows":
+            return path / "Dungeondraft.exe"
+        elif self.os_name == "Darwin":
+            return path / "Contents" / "MacOS" / "Dungeondraft"
+        else:  # Linux
+            return path / "Dungeondraft.x86_64"
+    
     def _is_valid_dungeondraft_installation(self, path: Path) -> bool:
         """Validate if path contains a valid Dungeondraft installation"""
         if not path.exists():
             return False
-            
+        
         # Look for Dungeondraft executable
-        if self.os_name == "Windows":
-            exe_path = path / "Dungeondraft.exe"
-        elif self.os_name == "Darwin":
-            exe_path = path / "Contents" / "MacOS" / "Dungeondraft"
-        else:  # Linux
-            exe_path = path / "Dungeondraft.x86_64"
-            
-        return exe_path.exists()
+        return self.executable_path(path).exists()
     
     def _get_dungeondraft_version(self, path: Path) -> Optional[str]:
         """Extract Dungeondraft version from installation"""
@@ -184,10 +580,10 @@ class DungeondraftDetector:
             version_file = path / "version.txt"
             if version_file.exists():
                 return version_file.read_text().strip()
-                
+            
             # Fallback to default compatible version
             return "1.1.0.0"
-            
+        
         except Exception:
             return "1.1.0.0"
 
@@ -197,8 +593,8 @@ class ModsFolderManager:
     def __init__(self):
         self.os_name = platform.system()
     
-    def get_mods_folder_path(self) -> Path:
-        """Get or create the Dungeondraft mods folder"""
+    def get_default_mods_folder(self) -> Path:
+        """Get the standard Dungeondraft mods folder without creating it"""
         
         # Standard Documents/Dungeondraft Mods location
         if self.os_name == "Windows":
@@ -208,7 +604,11 @@ class ModsFolderManager:
         else:  # Linux
             documents = Path.home() / "Documents"
         
-        mods_folder = documents / "Dungeondraft Mods"
+        return documents / "Dungeondraft Mods"
+    
+    def get_mods_folder_path(self) -> Path:
+        """Get or create the Dungeondraft mods folder"""
+        mods_folder = self.get_default_mods_folder()
         
         # Create if it doesn't exist
         if not mods_folder.exists():
@@ -223,6 +623,12 @@ class SystemValidator:
     MIN_MEMORY_GB = 4
     MIN_DISK_SPACE_MB = 100
     
+    # Seconds to wait for the slowest check before assuming a result
+    CHECK_TIMEOUT = 5.0
+    
+    def __init__(self, mods_folder: Optional[Path] = None):
+        self.mods_folder = mods_folder or ModsFolderManager().get_default_mods_folder()
+    
     def validate_system(self) -> SystemRequirements:
         """Perform comprehensive system validation"""
         
@@ -231,42 +637,472 @@ class SystemValidator:
         # OS Support Check
         requirements.os_supported = platform.system() in ["Windows", "Darwin", "Linux"]
         
-        # Memory Check
+        # Python Check
+        requirements.python_available = sys.version_info >= (3, 7)
+        
+        # Memory, disk and Dungeondraft checks run side by side on daemon threads
+        memory_future = submit_daemon(self._check_memory)
+        disk_future = submit_daemon(self._check_disk_space)
+        detect_future = submit_daemon(DungeondraftDetector().detect_installation)
+        done, _ = wait([memory_future, disk_future, detect_future], timeout=self.CHECK_TIMEOUT)
+        
+        # Assume sufficient if a check can't finish in time
+        requirements.memory_sufficient = memory_future.result() if memory_future in done else True
+        requirements.disk_space_sufficient = disk_future.result() if disk_future in done else True
+        
+        # Dungeondraft Detection
+        if detect_future in done:
+            dungeondraft_path, version = detect_future.result()
+            requirements.dungeondraft_detected = dungeondraft_path is not None
+            requirements.dungeondraft_path = dungeondraft_path
+            requirements.dungeondraft_version = version
+        
+        return requirements
+    
+    def _check_memory(self) -> bool:
+        """Check installed memory against the minimum"""
+        try:
+            total_bytes = self._get_total_memory()
+        except Exception:
+            total_bytes = None
+        
+        if total_bytes is None:
+            return True  # Assume sufficient if can't check
+        
+        return total_bytes / (1024**3) >= self.MIN_MEMORY_GB
+    
+    def _get_total_memory(self) -> Optional[int]:
+        """Read total physical memory in bytes"""
+        
+        # Linux exposes this directly without psutil
+        if platform.system() == "Linux":
+            try:
+                with open("/proc/meminfo", 'r') as f:
+                    for line in f:
+                        if line.startswith("MemTotal:"):
+                            return int(line.split()[1]) * 1024
+            except (OSError, ValueError, IndexError):
+                pass
+        
+        if hasattr(os, "sysconf"):
+            try:
+                return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+            except (ValueError, OSError):
+                pass
+        
         try:
             import psutil
-            memory_gb = psutil.virtual_memory().total / (1024**3)
-            requirements.memory_sufficient = memory_gb >= self.MIN_MEMORY_GB
+            return psutil.virtual_memory().total
         except ImportError:
-            requirements.memory_sufficient = True  # Assume sufficient if can't check
+            return None
+    
+    def _check_disk_space(self) -> bool:
+        """Check free space on the volume that will hold the mods folder"""
+        
+        # The mods folder may not exist yet, so measure its nearest existing parent
+        target = Path(self.mods_folder).expanduser()
+        while not target.exists() and target.parent != target:
+            target = target.parent
         
-        # Disk Space Check
         try:
-            import shutil
-            disk_space = shutil.disk_usage(".").free / (1024**2)  # MB
-            requirements.disk_space_sufficient = disk_space >= self.MIN_DISK_SPACE_MB
+            if hasattr(os, "statvfs"):
+                stats = os.statvfs(target)
+                free_bytes = stats.f_bavail * stats.f_frsize
+            else:
+                free_bytes = shutil.disk_usage(target).free
         except Exception:
-            requirements.disk_space_sufficient = True  # Assume sufficient if can't check
+            return True  # Assume sufficient if can't check
         
-        # Dungeondraft Detection
-        detector = DungeondraftDetector()
-        dungeondraft_path, version = detector.detect_installation()
-        requirements.dungeondraft_detected = dungeondraft_path is not None
-        requirements.dungeondraft_version = version
+        return free_bytes / (1024**2) >= self.MIN_DISK_SPACE_MB
+
+class InstallationEngine:
+    """Headless installation engine shared by the GUI and unattended installs"""
+    
+    PLUGIN_DIR_NAME = "TurboLoaderV3"
+    REQUIRED_FILES = ["TurboLoaderV3.ddmod", "main.gd"]
+    OPTIONAL_FILES = ["preview.png", "README.md", "LICENSE"]
+    
+    # Bundle component holding the plugin files
+    BUNDLE_COMPONENT = "Installer"
+    
+    # Progress reported when each phase starts
+    PHASE_PROGRESS = {"validate": 10, "backup": 20, "copy": 40, "config": 80, "verify": 90}
+    
+    def __init__(self, config: InstallationConfig, source_dir: Optional[Path] = None,
+                 log: Callable[[str], None] = print,
+                 progress: Optional[Callable[[int, str], None]] = None,
+                 bundle: Optional[BundleReader] = None):
+        self.config = config
+        self.source_dir = source_dir or Path(__file__).parent
+        self.bundle = bundle
+        
+        # Seconds to wait for another installer, and how long this one waited
+        self.lock_timeout = 60.0
+        self.lock_wait = 0.0
+        self.log = log
+        self.progress = progress or (lambda value, status: None)
+        self.tracer = InstallTracer()
+        
+        # The trace of the last installation is kept with the caches, outside the planned plugin files
+        default_trace = Path.home() / ".cache" / "TurboLoaderV3" / "install_trace.json"
+        self.trace_path = Path(os.environ.get("TURBOLOADER_TRACE_PATH", default_trace))
+        
+        mods_folder = config.mods_folder or ModsFolderManager().get_default_mods_folder()
+        self.mods_path = Path(mods_folder).expanduser()
+        self.plugin_dir = self.mods_path / self.PLUGIN_DIR_NAME
+    
+    def plan(self) -> List[FileOperation]:
+        """Compute every filesystem change the installation will make, without making it"""
+        operations = []
+        
+        if not self.mods_path.exists():
+            operations.append(FileOperation("validate", "mkdir", self.mods_path))
+        
+        if self.plugin_dir.exists() and self.config.backup_existing:
+            backup_size = 0
+            backup_count = 0
+            for file_path in self.plugin_dir.rglob("*"):
+                if file_path.is_file():
+                    backup_count += 1
+                    backup_size += file_path.stat().st_size
+            
+            backup_dir = self._backup_path()
+            operations.append(FileOperation("backup", "move", backup_dir, source=self.plugin_dir,
+                                            size=backup_size, file_count=backup_count))
+            operations.append(FileOperation("backup", "mkdir", self.plugin_dir))
+        elif not self.plugin_dir.exists():
+            operations.append(FileOperation("backup", "mkdir", self.plugin_dir))
+        
+        if self.bundle:
+            operations.extend(self._plan_bundle_files())
+            syntax_errors = self.validate_scripts(
+                source=self.bundle.read(self.bundle.files(self.BUNDLE_COMPONENT)["main.gd"]), persist=False)
+        else:
+            for file_name in self.REQUIRED_FILES + self.OPTIONAL_FILES:
+                source_file = self.source_dir / file_name
+                if not source_file.exists():
+                    if file_name in self.REQUIRED_FILES:
+                        raise FileNotFoundError(f"Required plugin file not found: {source_file}")
+                    continue
+                
+                operations.append(FileOperation("copy", "copy", self.plugin_dir / file_name,
+                                                source=source_file, size=source_file.stat().st_size,
+                                                file_count=1))
+            # Planning backs dry runs, so the validation cache is not written here
+            syntax_errors = self.validate_scripts(self.source_dir, persist=False)
+        
+        # Refuse plugin files that differ from the build the packager shipped
+        manifest_operation = self._plan_shipped_manifest([op for op in operations if op.phase == "copy"])
+        if manifest_operation is not None:
+            operations.append(manifest_operation)
+        
+        # Refuse to ship a script Dungeondraft would fail to load
+        if syntax_errors:
+            raise ValueError(f"Plugin script has syntax errors: {syntax_errors[0]}")
+        
+        # Create configuration file
+        config = {
+            "installation_date": time.time(),
+            "installer_version": "3.0.0",
+            "dungeondraft_path": str(self.config.dungeondraft_path) if self.config.dungeondraft_path else None,
+            "analytics_enabled": self.config.enable_analytics,
+            "auto_update_check": True
+        }
+        content = json.dumps(config, indent=2).encode("utf-8")
+        operations.append(FileOperation("config", "write", self.plugin_dir / "config.json",
+                                        size=len(content), file_count=1, content=content))
+        
+        return operations
+    
+    def _plan_bundle_files(self) -> List[FileOperation]:
+        """Extract operations for the plugin files stored in the bundle"""
+        operations = []
+        files = self.bundle.files(self.BUNDLE_COMPONENT)
+        
+        for file_name in self.REQUIRED_FILES + self.OPTIONAL_FILES:
+            digest = files.get(file_name)
+            if digest is None:
+                if file_name in self.REQUIRED_FILES:
+                    raise FileNotFoundError(f"Required plugin file not found in {self.bundle.path.name}: {file_name}")
+                continue
+            
+            operations.append(FileOperation("copy", "extract", self.plugin_dir / file_name,
+                                            source=self.bundle.path, size=self.bundle.object_size(digest),
+                                            file_count=1, member=digest))
         
-        # Python Check
-        requirements.python_available = sys.version_info >= (3, 7)
+        return operations
+    
+    def _plan_shipped_manifest(self, copies: List[FileOperation]) -> Optional[FileOperation]:
+        """Check the plugin files against the packager's integrity manifest and plan installing it
+        
+        The installed manifest is what verification later compares against. Without one
+        (e.g. when installing from a source checkout) there is nothing to check.
+        """
+        destination = self.plugin_dir / MANIFEST_NAME
+        if self.bundle:
+            digest = self.bundle.files(self.BUNDLE_COMPONENT).get(MANIFEST_NAME)
+            content = self.bundle.read(digest) if digest is not None else None
+            operation = FileOperation("copy", "extract", destination, source=self.bundle.path,
+                                      size=len(content or b""), file_count=1, member=digest)
+        else:
+            manifest_path = self.source_dir / MANIFEST_NAME
+            content = manifest_path.read_bytes() if manifest_path.is_file() else None
+            operation = FileOperation("copy", "copy", destination, source=manifest_path,
+                                      size=len(content or b""), file_count=1)
         
-        return requirements
+        if content is None:
+            self.log(f"WARN No {MANIFEST_NAME} shipped with the plugin files; their integrity cannot be checked")
+            return None
+        
+        try:
+            expected = json.loads(content.decode("utf-8"))["files"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError(f"The shipped {MANIFEST_NAME} is invalid")
+        
+        # Bundle objects are named by their SHA-256; source files are small enough to hash whole
+        if self.bundle:
+            actual = {op.destination.name: (op.member, op.size) for op in copies}
+        else:
+            actual = {op.destination.name: (hashlib.sha256(op.source.read_bytes()).hexdigest(), op.size)
+                      for op in copies}
+        
+        for file_name in sorted(set(actual) | set(expected)):
+            if file_name not in actual:
+                raise FileNotFoundError(f"{file_name} is listed in the shipped {MANIFEST_NAME} but missing")
+            if file_name not in expected:
+                raise ValueError(f"{file_name} is not listed in the shipped {MANIFEST_NAME}")
+            entry = expected[file_name]
+            if (entry.get("sha256"), entry.get("size")) != actual[file_name]:
+                raise ValueError(f"{file_name} does not match the shipped {MANIFEST_NAME}; "
+                                 "it was changed after packaging")
+        
+        return operation
+    
+    def install(self, operations: Optional[List[FileOperation]] = None) -> bool:
+        """Carry out a plan under the install lock; returns False only if verification was requested and failed
+        
+        Without a plan, planning happens after the lock is taken, so it sees the
+        folder as any previous installer left it.
+        """
+        with self._locked():
+            operations = self.plan() if operations is None else operations
+            copy_total = sum(op.size for op in operations if op.phase == "copy") or 1
+            copied = 0
+            
+            self.log("Starting Turbo Loader v3 installation...")
+            
+            try:
+                for phase in ("validate", "backup", "copy", "config"):
+                    self.progress(self.PHASE_PROGRESS[phase], self._phase_status(phase))
+                    
+                    with self.tracer.span(phase) as span:
+                        for op in operations:
+                            if op.phase != phase:
+                                continue
+                            
+                            self._apply(op)
+                            span.file_count += op.file_count
+                            span.bytes_moved += op.size
+                            
+                            # Copy progress is measured in bytes between the 40% and 80% marks
+                            if phase == "copy":
+                                copied += op.size
+                                self.progress(40 + int(40 * copied / copy_total),
+                                              f"Copying plugin files... ({op.destination.name})")
+                
+                verified = True
+                if self.config.verify_installation:
+                    self.progress(self.PHASE_PROGRESS["verify"], "Verifying installation...")
+                    with self.tracer.span("verify") as span:
+                        verified = self.verify(self.plugin_dir)
+                        for file_path in self.plugin_dir.iterdir():
+                            if file_path.is_file():
+                                span.file_count += 1
+                                span.bytes_moved += file_path.stat().st_size
+                    
+                    if verified:
+                        self.log("PASS Installation verification successful")
+                    else:
+                        self.log("WARN Installation verification failed")
+                
+                self.progress(100, "Installation complete!")
+                self.log("PASS Turbo Loader v3 installed successfully!")
+                return verified
+            
+            finally:
+                for line in self.tracer.summary_lines():
+                    self.log(f"Phase {line}")
+                
+                try:
+                    trace_file = self.tracer.export(self.trace_path)
+                    self.log(f"Saved installation trace: {trace_file}")
+                except OSError as e:
+                    self.log(f"WARN Could not save installation trace: {e}")
+    
+    def apply_patch(self, patch_path: Path) -> bool:
+        """Upgrade an existing installation in place from a release patch"""
+        if apply_patch is None:
+            raise RuntimeError("release_patch.py is required to apply patches")
+        
+        with self._locked():
+            if not self.plugin_dir.is_dir():
+                raise FileNotFoundError(f"No installation to patch at {self.plugin_dir}")
+            
+            self.log(f"Applying {patch_path.name} to {self.plugin_dir}")
+            # Patches carry the new release's manifest, so verification checks against that build
+            allowed = self.REQUIRED_FILES + self.OPTIONAL_FILES + [MANIFEST_NAME]
+            
+            try:
+                with self.tracer.span("patch") as span:
+                    changed = apply_patch(patch_path, self.plugin_dir, allowed, log=self.log)
+                    span.file_count = len(changed)
+                    span.bytes_moved = patch_path.stat().st_size
+                
+                verified = True
+                if self.config.verify_installation:
+                    with self.tracer.span("verify"):
+                        verified = self.verify(self.plugin_dir)
+                
+                self.log(f"PASS Patched {len(changed)} files" if verified else "WARN Patch verification failed")
+                return verified
+            
+            finally:
+                for line in self.tracer.summary_lines():
+                    self.log(f"Phase {line}")
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the mods folder install lock while changing the installation"""
+        if InstallLock is None:
+            yield
+            return
+        
+        lock = InstallLock(self.mods_path, timeout=self.lock_timeout)
+        with self.tracer.span("lock"):
+            lock.acquire()
+        self.lock_wait = lock.wait_seconds
+        if lock.wait_seconds >= 0.1:
+            self.log(f"Waited {lock.wait_seconds:.1f}s for another installation to finish")
+        
+        try:
+            yield
+        finally:
+            lock.release()
+    
+    def _backup_path(self) -> Path:
+        """A backup folder name no earlier backup has used"""
+        name = f"{self.PLUGIN_DIR_NAME}_backup_{int(time.time())}"
+        backup_dir = self.mods_path / name
+        suffix = 1
+        while backup_dir.exists():
+            suffix += 1
+            backup_dir = self.mods_path / f"{name}_{suffix}"
+        return backup_dir
+    
+    def verify(self, plugin_dir: Path) -> bool:
+        """Verify that installation was successful"""
+        required_files = ["TurboLoaderV3.ddmod", "main.gd", "config.json"]
+        
+        for file_name in required_files:
+            file_path = plugin_dir / file_name
+            if not file_path.exists():
+                self.log(f"Missing required file: {file_name}")
+                return False
+        
+        # Validate .ddmod file
+        try:
+            ddmod_file = plugin_dir / "TurboLoaderV3.ddmod"
+            with open(ddmod_file, 'r') as f:
+                ddmod_data = json.load(f)
+            
+            required_fields = ["name", "unique_id", "version", "author"]
+            for field in required_fields:
+                if field not in ddmod_data:
+                    self.log(f"Invalid .ddmod file: missing {field}")
+                    return False
+        
+        except Exception as e:
+            self.log(f"Error validating .ddmod file: {e}")
+            return False
+        
+        for error in self.validate_scripts(plugin_dir):
+            self.log(f"GDScript syntax error: {error}")
+            return False
+        
+        return True
+    
+    def validate_scripts(self, directory: Optional[Path] = None, source: Optional[bytes] = None,
+                         persist: bool = True) -> List[str]:
+        """Syntax-check main.gd from a directory or raw bytes; returns "file:line:column: message" strings
+        
+        With persist False the validation cache is read but never written.
+        """
+        if GDScriptValidator is None:
+            return []
+        
+        validator = GDScriptValidator()
+        errors = []
+        try:
+            if source is not None:
+                result = validator.validate_text(source.decode("utf-8-sig"))
+            else:
+                result = validator.validate_file(directory / "main.gd")
+        except (OSError, UnicodeDecodeError) as e:
+            return [f"main.gd: {e}"]
+        finally:
+            if persist:
+                validator.save()
+        
+        for error in result.errors:
+            errors.append(f"main.gd:{error.line}:{error.column}: {error.message}")
+        return errors
+    
+    def _apply(self, op: FileOperation):
+        """Perform a single planned operation"""
+        if op.action == "mkdir":
+            op.destination.mkdir(parents=True, exist_ok=True)
+            self.log(f"Created directory: {op.destination}")
+        elif op.action == "move":
+            shutil.move(str(op.source), str(op.destination))
+            self.log(f"Backed up existing installation to: {op.destination}")
+        elif op.action == "copy":
+            shutil.copy2(op.source, op.destination)
+            self.log(f"Copied {op.destination.name}")
+        elif op.action == "extract":
+            self.bundle.extract_object(op.member, op.destination)
+            self.log(f"Extracted {op.destination.name}")
+        elif op.action == "write":
+            op.destination.write_bytes(op.content)
+            self.log(f"Created {op.destination.name}")
+        else:
+            raise ValueError(f"Unknown file operation: {op.action}")
+    
+    @staticmethod
+    def _phase_status(phase: str) -> str:
+        """Status line shown while a phase runs"""
+        return {
+            "validate": "Validating paths...",
+            "backup": "Creating plugin directory...",
+            "copy": "Copying plugin files...",
+            "config": "Configuring installation..."
+        }[phase]
 
 class TurboLoaderInstaller:
     """Main installer class with GUI"""
     
+    # Log and progress updates are applied to the widgets in batches on this tick
+    UI_TICK_MS = 50
+    UI_BATCH_LIMIT = 2000
+    
     def __init__(self):
         self.config = InstallationConfig()
         self.requirements = SystemRequirements()
         self.current_step = 0
         self.total_steps = 6
         
+        # Worker threads post UI updates here instead of scheduling callbacks
+        self.ui_queue = queue.Queue()
+        
         # Initialize GUI
         self.root = tk.Tk()
         self.root.title("Turbo Loader v3 - Professional Installer")
@@ -278,6 +1114,7 @@ class TurboLoaderInstaller:
         self.style.theme_use('clam')
         
         self.setup_gui()
+        self.root.after(self.UI_TICK_MS, self._drain_ui_queue)
     
     def setup_gui(self):
         """Setup the installer GUI"""
@@ -391,10 +1228,31 @@ class TurboLoaderInstaller:
         
         # Check system requirements
         self.progress_label.config(text="Checking system requirements...")
-        self.root.update()
+        self.next_btn.config(state="disabled")
+        
+        checking_label = ttk.Label(self.content_frame, text="Checking system requirements...")
+        checking_label.grid(row=0, column=0, pady=(0, 20))
+        
+        # Validation runs off the UI thread; results come back through the UI queue
+        mods_path_var = getattr(self, "mods_path_var", None)
+        mods_folder = Path(mods_path_var.get()) if mods_path_var and mods_path_var.get() else self.config.mods_folder
+        validator = SystemValidator(mods_folder)
+        
+        def run_validation():
+            requirements = validator.validate_system()
+            self.ui_queue.put(("call", lambda: self._show_system_check_results(requirements)))
         
-        validator = SystemValidator()
-        self.requirements = validator.validate_system()
+        threading.Thread(target=run_validation, daemon=True).start()
+    
+    def _show_system_check_results(self, requirements: SystemRequirements):
+        """Display system requirements check results"""
+        
+        # The user may have moved on while the checks were running
+        if self.current_step != 1:
+            return
+        
+        self.clear_content()
+        self.requirements = requirements
         
         # Display results
         check_label = ttk.Label(self.content_frame,
@@ -470,7 +1328,11 @@ class TurboLoaderInstaller:
         detector = DungeondraftDetector()
         mods_manager = ModsFolderManager()
         
-        dungeondraft_path, _ = detector.detect_installation()
+        # Reuse the system check result rather than scanning again
+        if self.requirements.dungeondraft_detected:
+            dungeondraft_path = self.requirements.dungeondraft_path
+        else:
+            dungeondraft_path, _ = detector.detect_installation()
         mods_path = mods_manager.get_mods_folder_path()
         
         # Dungeondraft path
@@ -563,120 +1425,24 @@ class TurboLoaderInstaller:
     def perform_installation(self):
         """Perform the actual installation"""
         try:
-            self.log("Starting Turbo Loader v3 installation...")
-            self.update_install_progress(10, "Validating paths...")
-            
-            # Validate paths
-            dd_path = Path(self.dd_path_var.get()) if self.dd_path_var.get() else None
-            mods_path = Path(self.mods_path_var.get())
-            
-            if not mods_path.exists():
-                mods_path.mkdir(parents=True, exist_ok=True)
-                self.log(f"Created mods directory: {mods_path}")
-            
-            self.update_install_progress(20, "Creating plugin directory...")
-            
-            # Create plugin directory
-            plugin_dir = mods_path / "TurboLoaderV3"
-            if plugin_dir.exists() and self.backup_var.get():
-                backup_dir = mods_path / f"TurboLoaderV3_backup_{int(time.time())}"
-                shutil.move(str(plugin_dir), str(backup_dir))
-                self.log(f"Backed up existing installation to: {backup_dir}")
-            
-            plugin_dir.mkdir(exist_ok=True)
-            self.log(f"Created plugin directory: {plugin_dir}")
-            
-            self.update_install_progress(40, "Copying plugin files...")
-            
-            # Copy plugin files
-            installer_dir = Path(__file__).parent
-            
-            # Copy .ddmod file
-            ddmod_source = installer_dir / "TurboLoaderV3.ddmod"
-            ddmod_dest = plugin_dir / "TurboLoaderV3.ddmod"
-            shutil.copy2(ddmod_source, ddmod_dest)
-            self.log("Copied .ddmod file")
-            
-            # Copy main.gd file
-            main_source = installer_dir / "main.gd"
-            main_dest = plugin_dir / "main.gd"
-            shutil.copy2(main_source, main_dest)
-            self.log("Copied main.gd file")
-            
-            self.update_install_progress(60, "Installing supporting files...")
-            
-            # Copy additional files if they exist
-            for file_name in ["preview.png", "README.md", "LICENSE"]:
-                source_file = installer_dir / file_name
-                if source_file.exists():
-                    dest_file = plugin_dir / file_name
-                    shutil.copy2(source_file, dest_file)
-                    self.log(f"Copied {file_name}")
-            
-            self.update_install_progress(80, "Configuring installation...")
-            
-            # Create configuration file
-            config = {
-                "installation_date": time.time(),
-                "installer_version": "3.0.0",
-                "dungeondraft_path": str(dd_path) if dd_path else None,
-                "analytics_enabled": self.analytics_var.get(),
-                "auto_update_check": True
-            }
-            
-            config_file = plugin_dir / "config.json"
-            with open(config_file, 'w') as f:
-                json.dump(config, f, indent=2)
-            self.log("Created configuration file")
+            self.config.dungeondraft_path = Path(self.dd_path_var.get()) if self.dd_path_var.get() else None
+            self.config.mods_folder = Path(self.mods_path_var.get())
+            self.config.backup_existing = self.backup_var.get()
+            self.config.verify_installation = self.verify_var.get()
+            self.config.enable_analytics = self.analytics_var.get()
             
-            self.update_install_progress(90, "Verifying installation...")
-            
-            # Verify installation if requested
-            if self.verify_var.get():
-                if self.verify_installation(plugin_dir):
-                    self.log("PASS Installation verification successful")
-                else:
-                    self.log("WARN Installation verification failed")
-            
-            self.update_install_progress(100, "Installation complete!")
-            self.log("PASS Turbo Loader v3 installed successfully!")
+            engine = InstallationEngine(self.config, log=self.log,
+                                        progress=self.update_install_progress)
+            engine.install()
             
             # Enable next button
             self.root.after(1000, lambda: self.next_btn.config(state="normal", text="Finish"))
-            
+        
         except Exception as e:
             self.log(f"FAIL Installation failed: {str(e)}")
             self.update_install_progress(0, "Installation failed")
             self.root.after(100, lambda: self.next_btn.config(state="normal", text="Retry"))
     
-    def verify_installation(self, plugin_dir: Path) -> bool:
-        """Verify that installation was successful"""
-        required_files = ["TurboLoaderV3.ddmod", "main.gd", "config.json"]
-        
-        for file_name in required_files:
-            file_path = plugin_dir / file_name
-            if not file_path.exists():
-                self.log(f"Missing required file: {file_name}")
-                return False
-        
-        # Validate .ddmod file
-        try:
-            ddmod_file = plugin_dir / "TurboLoaderV3.ddmod"
-            with open(ddmod_file, 'r') as f:
-                ddmod_data = json.load(f)
-            
-            required_fields = ["name", "unique_id", "version", "author"]
-            for field in required_fields:
-                if field not in ddmod_data:
-                    self.log(f"Invalid .ddmod file: missing {field}")
-                    return False
-                    
-        except Exception as e:
-            self.log(f"Error validating .ddmod file: {e}")
-            return False
-        
-        return True
-    
     def show_completion(self):
         """Show installation completion screen"""
         self.clear_content()
@@ -752,18 +1518,54 @@ class TurboLoaderInstaller:
     
     def update_install_progress(self, progress: int, status: str):
         """Update installation progress"""
-        self.root.after(0, lambda: self.install_progress.config(value=progress))
-        self.root.after(0, lambda: self.install_status.config(text=status))
-        self.root.after(0, lambda: self.progress_label.config(text=status))
+        self.ui_queue.put(("progress", progress, status))
     
     def log(self, message: str):
         """Add message to installation log"""
         timestamp = time.strftime("%H:%M:%S")
         log_message = f"[{timestamp}] {message}\n"
-        self.root.after(0, lambda: self.log_text.insert(tk.END, log_message))
-        self.root.after(0, lambda: self.log_text.see(tk.END))
+        self.ui_queue.put(("log", log_message))
         print(log_message.strip())  # Also print to console
     
+    def _drain_ui_queue(self):
+        """Apply pending log lines and progress updates in one batch"""
+        log_lines = []
+        latest_progress = None
+        callbacks = []
+        
+        try:
+            for _ in range(self.UI_BATCH_LIMIT):
+                item = self.ui_queue.get_nowait()
+                if item[0] == "log":
+                    log_lines.append(item[1])
+                elif item[0] == "call":
+                    callbacks.append(item[1])
+                else:
+                    # Only the most recent progress update is worth drawing
+                    latest_progress = item[1:]
+        except queue.Empty:
+            pass
+        
+        log_text = getattr(self, "log_text", None)
+        if log_lines and log_text is not None and log_text.winfo_exists():
+            log_text.insert(tk.END, "".join(log_lines))
+            log_text.see(tk.END)
+        
+        if latest_progress is not None:
+            progress, status = latest_progress
+            install_progress = getattr(self, "install_progress", None)
+            install_status = getattr(self, "install_status", None)
+            if install_progress is not None and install_progress.winfo_exists():
+                install_progress.config(value=progress)
+            if install_status is not None and install_status.winfo_exists():
+                install_status.config(text=status)
+            self.progress_label.config(text=status)
+        
+        for callback in callbacks:
+            callback()
+        
+        self.root.after(self.UI_TICK_MS, self._drain_ui_queue)
+    
     def browse_dungeondraft_path(self):
         """Browse for Dungeondraft installation path"""
         path = filedialog.askdirectory(title="Select Dungeondraft Installation Folder")
@@ -810,8 +1612,104 @@ class TurboLoaderInstaller:
         """Run the installer"""
         self.root.mainloop()
 
+def run_unattended(config: InstallationConfig, dry_run: bool = False, as_json: bool = False,
+                   bundle: Optional[BundleReader] = None) -> int:
+    """Install without the GUI, or only print the plan when dry_run is set"""
+    engine = InstallationEngine(config, bundle=bundle)
+    
+    try:
+        operations = engine.plan()
+    except Exception as e:
+        print(f"FAIL Could not plan installation: {e}")
+        return 1
+    
+    if dry_run:
+        total_bytes = sum(op.size for op in operations)
+        total_files = sum(op.file_count for op in operations if op.action != "move")
+        
+        if as_json:
+            print(json.dumps({
+                "plugin_directory": str(engine.plugin_dir),
+                "operations": [op.to_dict() for op in operations],
+                "total_bytes": total_bytes,
+                "total_files": total_files
+            }, indent=2))
+        else:
+            print(f"Dry run - no changes will be made to {engine.mods_path}")
+            for op in operations:
+                print(f"  [{op.phase}] {op.describe()}")
+            print(f"Total: {len(operations)} operations, {total_files} files written, {total_bytes} bytes")
+        return 0
+    
+    try:
+        # Planned again under the install lock, in case another installer ran in between
+        verified = engine.install()
+    except Exception as e:
+        print(f"FAIL Installation failed: {e}")
+        return 1
+    
+    return 0 if verified else 1
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Professional Installer")
+    parser.add_argument("--version", action="version", version="Turbo Loader v3 Installer 3.0.0")
+    parser.add_argument("--answer-file", type=Path,
+                        help="JSON answer file for an unattended installation")
+    parser.add_argument("--auto-install", action="store_true",
+                        help="Install with default settings without the GUI")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the planned file operations without touching disk")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the dry-run plan as JSON")
+    parser.add_argument("--apply-patch", type=Path, metavar="PATCH",
+                        help="Upgrade the installed plugin from a release patch (.tlpatch)")
+    parser.add_argument("--bundle", type=Path,
+                        help="Install from a flattened release bundle instead of the installer's folder")
+    parser.add_argument("--extract-component", metavar="NAME",
+                        help="Extract one component of --bundle (e.g. Manual, Documentation)")
+    parser.add_argument("--output", type=Path, default=Path.cwd(),
+                        help="Directory for --extract-component (default: current directory)")
+    args = parser.parse_args()
+    
+    bundle = None
+    if args.bundle:
+        try:
+            bundle = BundleReader(args.bundle)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            print(f"FAIL Could not open bundle: {e}")
+            return 1
+    
+    if args.extract_component:
+        if bundle is None:
+            print("FAIL --extract-component requires --bundle")
+            return 1
+        try:
+            count = bundle.extract_component(args.extract_component, args.output)
+        except (OSError, ValueError) as e:
+            print(f"FAIL Could not extract {args.extract_component}: {e}")
+            return 1
+        print(f"PASS Extracted {count} files from {args.extract_component} to {args.output}")
+        return 0
+    
+    if args.apply_patch:
+        try:
+            config = InstallationConfig.from_answer_file(args.answer_file) if args.answer_file else InstallationConfig()
+            engine = InstallationEngine(config)
+            return 0 if engine.apply_patch(args.apply_patch) else 1
+        except (OSError, ValueError, RuntimeError) as e:
+            # PatchError is a ValueError
+            print(f"FAIL Could not apply patch: {e}")
+            return 1
+    
+    if args.answer_file or args.auto_install or args.dry_run:
+        try:
+            config = InstallationConfig.from_answer_file(args.answer_file) if args.answer_file else InstallationConfig()
+        except (OSError, ValueError) as e:
+            print(f"FAIL Invalid answer file: {e}")
+            return 1
+        return run_unattended(config, dry_run=args.dry_run, as_json=args.json, bundle=bundle)
+    
     print("Turbo Loader v3 - Professional Installer")
     print("=========================================")
     
@@ -828,6 +1726,7 @@ def main():
     # Create and run installer
     installer = TurboLoaderInstaller()
     installer.run()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
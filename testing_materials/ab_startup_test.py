@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - A/B Startup Test
+Alternates Dungeondraft launches with the plugin enabled and disabled, with a
+cold or warm page cache, and reports medians, confidence intervals and effect
+sizes for startup time on this machine
+"""
+
+import os
+import sys
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from TurboLoaderV3_Installer import InstallationEngine, ModsFolderManager
+from benchmark_suite import mann_whitney_greater, percentile
+from launch_profiler import DEFAULT_INTERVAL, find_dungeondraft, profile_launch, save_timeline
+
+try:
+    from install_lock import InstallLock, InstallLockTimeout
+except ImportError:
+    InstallLock = None
+    InstallLockTimeout = TimeoutError
+
+RESULT_FORMAT = 1
+
+ARMS = ("on", "off")
+
+# Startup improvement the README promises, as a fraction of plugin-off startup time
+CLAIMED_SPEEDUP = (0.40, 0.60)
+
+# Dungeondraft prints nothing when it finishes loading, so by default ready means
+# the process tree has gone idle for this long after its startup burst
+DEFAULT_IDLE_READY = 1.0
+
+BOOTSTRAP_RESAMPLES = 5000
+CONFIDENCE = 0.95
+
+# Compared for each arm, with how to read each from a launch timeline
+METRICS = {
+    "time_to_ready": ("s", lambda timeline: timeline["time_to_ready"]),
+    "rss_mb": ("MB", lambda timeline: timeline["summary"]["at_ready"]["rss_mb"]),
+    "cpu_seconds": ("s", lambda timeline: timeline["summary"]["at_ready"]["cpu_seconds"]),
+    "read_mb": ("MB", lambda timeline: timeline["summary"]["at_ready"]["read_mb"])
+}
+
+class ModToggle:
+    """Enables and disables the installed plugin by renaming its .ddmod
+    
+    Dungeondraft only loads mod folders that contain a .ddmod, so hiding the file
+    turns the plugin off without touching anything else. The original state is
+    always restored, and a .ddmod left disabled by an interrupted run is put back
+    before starting.
+    """
+    
+    DDMOD_NAME = "TurboLoaderV3.ddmod"
+    DISABLED_SUFFIX = ".ab-disabled"
+    
+    def __init__(self, plugin_dir: Path):
+        self.enabled_path = plugin_dir / self.DDMOD_NAME
+        self.disabled_path = plugin_dir / (self.DDMOD_NAME + self.DISABLED_SUFFIX)
+    
+    def recover(self) -> bool:
+        """Re-enable a plugin left disabled by an earlier run; True if one was"""
+        if self.disabled_path.exists() and not self.enabled_path.exists():
+            os.replace(self.disabled_path, self.enabled_path)
+            return True
+        return False
+    
+    @property
+    def enabled(self) -> bool:
+        return self.enabled_path.exists()
+    
+    def set(self, enabled: bool):
+        if enabled and not self.enabled:
+            os.replace(self.disabled_path, self.enabled_path)
+        elif not enabled and self.enabled:
+            os.replace(self.enabled_path, self.disabled_path)
+
+def evict_page_cache(paths: List[Path]) -> Tuple[int, int]:
+    """Ask the kernel to drop cached pages of every file under paths; returns (files, bytes)
+    
+    posix_fadvise(DONTNEED) only drops clean pages, so dirty data is synced first.
+    Files are evicted one by one, so nothing outside these paths is disturbed.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        raise RuntimeError("cold cache runs need posix_fadvise, which this platform does not provide")
+    if hasattr(os, "sync"):
+        os.sync()
+    
+    files = total_bytes = 0
+    for root in paths:
+        candidates = [root] if root.is_file() else (path for path in root.rglob("*") if path.is_file())
+        for path in candidates:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                files += 1
+                total_bytes += os.fstat(fd).st_size
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+    return files, total_bytes
+
+def launch_order(runs: int, seed: int) -> List[str]:
+    """Pairs of on/off launches, each pair in random order so drift cannot favour one arm"""
+    rng = random.Random(seed)
+    order = []
+    for _ in range(runs):
+        pair = list(ARMS)
+        rng.shuffle(pair)
+        order.extend(pair)
+    return order
+
+def bootstrap_ci(statistic: Callable[..., float], samples: List[List[float]], seed: int,
+                 resamples: int = BOOTSTRAP_RESAMPLES, confidence: float = CONFIDENCE) -> Tuple[float, float]:
+    """Percentile bootstrap interval, resampling each group independently"""
+    rng = random.Random(seed)
+    estimates = sorted(statistic(*[rng.choices(group, k=len(group)) for group in samples])
+                       for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return percentile(estimates, tail), percentile(estimates, 1 - tail)
+
+def cliffs_delta(first: List[float], second: List[float]) -> float:
+    """Probability first > second minus probability first < second, from -1 to 1"""
+    greater = sum(1 for a in first for b in second if a > b)
+    smaller = sum(1 for a in first for b in second if a < b)
+    return (greater - smaller) / (len(first) * len(second))
+
+def hedges_g(first: List[float], second: List[float]) -> Optional[float]:
+    """Standardised mean difference with the small-sample correction"""
+    n1, n2 = len(first), len(second)
+    if n1 < 2 or n2 < 2:
+        return None
+    pooled = math.sqrt(((n1 - 1) * statistics.variance(first) + (n2 - 1) * statistics.variance(second))
+                       / (n1 + n2 - 2))
+    if pooled == 0:
+        return None
+    correction = 1 - 3 / (4 * (n1 + n2) - 9)
+    return (statistics.mean(first) - statistics.mean(second)) / pooled * correction
+
+def describe_delta(delta: float) -> str:
+    """Conventional magnitude labels for Cliff's delta"""
+    size = abs(delta)
+    if size < 0.147:
+        return "negligible"
+    if size < 0.33:
+        return "small"
+    if size < 0.474:
+        return "medium"
+    return "large"
+
+def compare_arms(on: List[float], off: List[float], seed: int) -> Dict:
+    """Medians with intervals, and how much lower the plugin-on arm is than plugin-off"""
+    def reduction(on_group: List[float], off_group: List[float]) -> float:
+        off_median = statistics.median(off_group)
+        return (off_median - statistics.median(on_group)) / off_median if off_median else 0.0
+    
+    delta = cliffs_delta(off, on)
+    p_value = min(1.0, 2 * min(mann_whitney_greater(on, off), mann_whitney_greater(off, on)))
+    g = hedges_g(off, on)
+    return {
+        "on": {"n": len(on), "median": statistics.median(on),
+               "ci": bootstrap_ci(statistics.median, [on], seed)},
+        "off": {"n": len(off), "median": statistics.median(off),
+                "ci": bootstrap_ci(statistics.median, [off], seed + 1)},
+        "reduction": reduction(on, off),
+        "reduction_ci": bootstrap_ci(reduction, [on, off], seed + 2),
+        "p_value": p_value,
+        "cliffs_delta": delta,
+        "effect": describe_delta(delta),
+        "hedges_g": g
+    }
+
+def judge_claim(comparison: Dict, alpha: float) -> Tuple[str, str]:
+    """Whether the measured startup reduction supports the claimed range"""
+    low, high = comparison["reduction_ci"]
+    claim_low, claim_high = CLAIMED_SPEEDUP
+    if comparison["p_value"] >= alpha or low <= 0 <= high:
+        return "inconclusive", "no significant difference between plugin on and off - more runs may show one"
+    if high < 0:
+        return "refuted", f"startup is {-high:.0%} to {-low:.0%} slower with the plugin enabled"
+    if high < claim_low:
+        return "refuted", f"startup is {low:.0%} to {high:.0%} faster, below the claimed {claim_low:.0%}-{claim_high:.0%}"
+    if low > claim_high:
+        return "exceeded", f"startup is {low:.0%} to {high:.0%} faster, above the claimed {claim_low:.0%}-{claim_high:.0%}"
+    return "supported", f"startup is {low:.0%} to {high:.0%} faster, overlapping the claimed {claim_low:.0%}-{claim_high:.0%}"
+
+def run_ab_test(command: List[str], plugin_dir: Path, runs: int, cache: str, seed: int,
+                ready_pattern: Optional[str], idle_ready: Optional[float], timeout: float,
+                evict_paths: List[Path], timeline_dir: Optional[Path] = None,
+                interval: float = DEFAULT_INTERVAL, log: Callable[[str], None] = print) -> Dict:
+    """Run the launches and collect one metric dictionary per launch"""
+    toggle = ModToggle(plugin_dir)
+    if toggle.recover():
+        log(f"WARN Re-enabled {toggle.enabled_path.name}, left disabled by an interrupted run")
+    if not toggle.enabled:
+        raise FileNotFoundError(f"{toggle.enabled_path} not found - install Turbo Loader v3 first")
+    
+    # Hold the install lock throughout, so nothing installs over a temporarily disabled plugin
+    lock = InstallLock(plugin_dir.parent, timeout=30.0).acquire() if InstallLock is not None else None
+    launches = []
+    try:
+        schedule = launch_order(runs, seed)
+        if cache == "warm":
+            # One unmeasured launch per arm fills the cache for both
+            schedule = [(arm, False) for arm in ARMS] + [(arm, True) for arm in schedule]
+        else:
+            schedule = [(arm, True) for arm in schedule]
+        
+        measured = 0
+        for arm, counted in schedule:
+            toggle.set(arm == "on")
+            evicted = evict_page_cache(evict_paths) if cache == "cold" else None
+            timeline = profile_launch(command, ready_pattern, interval, timeout, linger=0.0,
+                                      idle_ready=idle_ready, label=f"{arm}-{cache}")
+            if not counted:
+                continue
+            
+            measured += 1
+            launch = {"arm": arm, "index": measured, "ready": timeline["time_to_ready"] is not None,
+                      "exit_code": timeline["exit_code"]}
+            if evicted:
+                launch["evicted_files"], launch["evicted_bytes"] = evicted
+            if launch["ready"]:
+                for metric, (_, read) in METRICS.items():
+                    launch[metric] = read(timeline)
+            if timeline_dir:
+                save_timeline(timeline, timeline_dir / f"{measured:03d}_{arm}.json")
+            launches.append(launch)
+            
+            result = f"{launch['time_to_ready']:.3f}s" if launch["ready"] else "not ready"
+            log(f"      {measured:3d}/{len(schedule) - (2 if cache == 'warm' else 0)} plugin {arm:<3} {result}")
+    finally:
+        toggle.set(True)
+        if lock:
+            lock.release()
+    
+    return launches
+
+def analyse(launches: List[Dict], seed: int, alpha: float) -> Dict:
+    """Per-metric comparison of the two arms, over launches that reached ready"""
+    ready = [launch for launch in launches if launch["ready"]]
+    comparisons = {}
+    for metric in METRICS:
+        on = [launch[metric] for launch in ready if launch["arm"] == "on"]
+        off = [launch[metric] for launch in ready if launch["arm"] == "off"]
+        if len(on) >= 2 and len(off) >= 2:
+            comparisons[metric] = compare_arms(on, off, seed)
+    
+    analysis = {"launches": len(launches), "ready": len(ready), "comparisons": comparisons}
+    if "time_to_ready" in comparisons:
+        analysis["verdict"], analysis["explanation"] = judge_claim(comparisons["time_to_ready"], alpha)
+    else:
+        analysis["verdict"], analysis["explanation"] = "inconclusive", "too few launches reached ready"
+    return analysis
+
+def print_report(analysis: Dict, cache: str, runs: int, alpha: float):
+    print()
+    print(f"Results: {analysis['ready']}/{analysis['launches']} launches reached ready, "
+          f"{runs} per arm, {cache} page cache")
+    print("-" * 78)
+    print(f"{'Metric':<14} {'Plugin on (95% CI)':>26} {'Plugin off (95% CI)':>26} {'Lower by':>9}")
+    for metric, comparison in analysis["comparisons"].items():
+        unit = METRICS[metric][0]
+        cells = []
+        for arm in ARMS:
+            low, high = comparison[arm]["ci"]
+            cells.append(f"{comparison[arm]['median']:.3f} ({low:.3f}-{high:.3f}) {unit}")
+        print(f"{metric:<14} {cells[0]:>26} {cells[1]:>26} {comparison['reduction']:>9.1%}")
+    print()
+    
+    timing = analysis["comparisons"].get("time_to_ready")
+    if timing:
+        low, high = timing["reduction_ci"]
+        g = f"{timing['hedges_g']:.2f}" if timing["hedges_g"] is not None else "n/a"
+        print(f"Startup reduction {timing['reduction']:.1%} (95% CI {low:.1%} to {high:.1%}), "
+              f"p={timing['p_value']:.4f}, Cliff's delta {timing['cliffs_delta']:+.2f} ({timing['effect']}), "
+              f"Hedges' g {g}")
+    marker = {"supported": "PASS", "exceeded": "PASS"}.get(analysis["verdict"], "FAIL")
+    print(f"{marker} Claimed {CLAIMED_SPEEDUP[0]:.0%}-{CLAIMED_SPEEDUP[1]:.0%} faster startup "
+          f"{analysis['verdict']}: {analysis['explanation']} (alpha {alpha})")
+
+def main():
+    """Main entry point"""
+    default_directory = Path(os.environ.get("TURBOLOADER_PROFILE_DIR",
+                                            Path.home() / ".cache" / "TurboLoaderV3" / "launch_profiles"))
+    parser = argparse.ArgumentParser(
+        description="Turbo Loader v3 - A/B Startup Test",
+        epilog="Example: ab_startup_test.py --runs 15 --cache cold -- ./Dungeondraft.x86_64")
+    parser.add_argument("command", nargs="*",
+                        help="Command to launch (default: the detected Dungeondraft executable)")
+    parser.add_argument("--mods-folder", type=Path, help="Mods folder holding the installed plugin")
+    parser.add_argument("--runs", type=int, default=10, help="Measured launches per arm (default: 10)")
+    parser.add_argument("--cache", choices=("cold", "warm"), default="warm",
+                        help="Evict the game and mod files from the page cache before each launch, "
+                             "or warm it with one unmeasured launch per arm (default: warm)")
+    parser.add_argument("--evict", type=Path, action="append", default=[], metavar="PATH",
+                        help="Extra file or folder to evict for cold runs (repeatable)")
+    parser.add_argument("--ready-pattern", help="Log line that marks startup as finished in both arms")
+    parser.add_argument("--idle-ready", type=float, default=DEFAULT_IDLE_READY, metavar="SECONDS",
+                        help=f"Otherwise count a launch as ready once idle this long (default: {DEFAULT_IDLE_READY})")
+    parser.add_argument("--timeout", type=float, default=180.0, help="Seconds before a launch is abandoned")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for launch order and bootstrap (default: 1)")
+    parser.add_argument("--timelines", action="store_true",
+                        help="Also save each launch's timeline next to the results")
+    parser.add_argument("--output", type=Path,
+                        help="Results file (default: ~/.cache/TurboLoaderV3/launch_profiles/ab_<time>.json)")
+    parser.add_argument("--json", action="store_true", help="Print the analysis as JSON")
+    args = parser.parse_args()
+    
+    if args.runs < 2:
+        parser.error("--runs must be at least 2")
+    mods_folder = (args.mods_folder or ModsFolderManager().get_default_mods_folder()).expanduser()
+    plugin_dir = mods_folder / InstallationEngine.PLUGIN_DIR_NAME
+    evict_paths = [mods_folder] + [path.expanduser() for path in args.evict]
+    
+    command = args.command
+    if not command:
+        executable = find_dungeondraft()
+        if not executable:
+            parser.error("Dungeondraft was not found; pass the command to launch after --")
+        command = [str(executable)]
+        # The game's own files are evicted too; other commands name theirs with --evict
+        evict_paths.append(executable.parent)
+    
+    output = args.output or default_directory / time.strftime("ab_%Y%m%d_%H%M%S.json")
+    timeline_dir = output.with_suffix("") if args.timelines else None
+    log = (lambda message: None) if args.json else print
+    
+    log("Turbo Loader v3 - A/B Startup Test")
+    log("=" * 55)
+    log(f"Launching {' '.join(command)} {2 * args.runs} times, plugin in {plugin_dir}")
+    try:
+        launches = run_ab_test(command, plugin_dir, args.runs, args.cache, args.seed, args.ready_pattern,
+                               args.idle_ready, args.timeout, evict_paths, timeline_dir, log=log)
+    except InstallLockTimeout as e:
+        print(f"FAIL Another install is running: {e}")
+        return 1
+    except (OSError, RuntimeError) as e:
+        print(f"FAIL {e}")
+        return 1
+    
+    analysis = analyse(launches, args.seed, args.alpha)
+    result = {
+        "format": RESULT_FORMAT,
+        "timestamp": time.time(),
+        "command": command,
+        "cache": args.cache,
+        "runs": args.runs,
+        "seed": args.seed,
+        "ready_pattern": args.ready_pattern,
+        "idle_ready": args.idle_ready,
+        "claimed_speedup": CLAIMED_SPEEDUP,
+        "launches": launches,
+        "analysis": analysis
+    }
+    save_timeline(result, output)
+    
+    if args.json:
+        print(json.dumps(dict(analysis, results=str(output)), indent=2))
+    else:
+        print_report(analysis, args.cache, args.runs, args.alpha)
+        print(f"      Results: {output}")
+    
+    return 0 if analysis["verdict"] in ("supported", "exceeded") else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Benchmark Suite
+Times installer startup, installation, verification and pack indexing,
+appends the results to a local history and fails on significant regressions
+"""
+
+import os
+import sys
+import argparse
+import json
+import math
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from TurboLoaderV3_Installer import InstallationConfig, InstallationEngine
+from create_installer_package import stage_plugin_release
+from generate_asset_library import LibraryConfig, generate_library
+from mod_inventory import ModInventory
+from verify_installation import HashCache, QuickVerification
+
+try:
+    from gdscript_validator import GDScriptValidator
+except ImportError:
+    GDScriptValidator = None
+
+SOURCE_DIR = Path(__file__).parent
+
+HISTORY_FORMAT = 1
+
+# A regression must be significant (one-sided p below alpha), larger than the threshold, and a
+# large effect: a current sample beats a baseline sample with at least this probability
+DEFAULT_ALPHA = 0.01
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MIN_EFFECT = 0.71
+
+# Fewer samples on either side than this is too few for the normal approximation to judge
+MIN_SAMPLES = 8
+
+# Recent passing runs pooled into the baseline, so run-to-run drift counts as normal variation
+BASELINE_RUNS = 5
+
+# The gate only judges benchmarks once this many baseline runs exist
+MIN_BASELINE_RUNS = 3
+
+# Fast benchmarks are looped until one sample takes at least this long, so timer and scheduler noise averages out
+MIN_SAMPLE_SECONDS = 0.02
+
+class BenchmarkContext:
+    """Scratch workspace shared by every benchmark of one run"""
+    
+    def __init__(self, workspace: Path, library_assets: int):
+        self.workspace = workspace
+        self.library_assets = library_assets
+        self.counter = 0
+        self._library: Optional[Path] = None
+        self._plugin_dir: Optional[Path] = None
+        self._release_dir: Optional[Path] = None
+    
+    def fresh_path(self, name: str) -> Path:
+        """A path no earlier sample has used"""
+        self.counter += 1
+        return self.workspace / f"{name}_{self.counter}"
+    
+    @property
+    def release_dir(self) -> Path:
+        """The plugin files and manifest as the Installer package ships them"""
+        if self._release_dir is None:
+            self._release_dir = stage_plugin_release(self.workspace / "release", SOURCE_DIR)
+        return self._release_dir
+    
+    def install(self, mods_folder: Path) -> InstallationEngine:
+        engine = InstallationEngine(InstallationConfig(mods_folder=mods_folder, verify_installation=False),
+                                    self.release_dir, log=lambda message: None)
+        engine.install()
+        return engine
+    
+    @property
+    def plugin_dir(self) -> Path:
+        """An installed copy of the plugin for verification benchmarks"""
+        if self._plugin_dir is None:
+            self._plugin_dir = self.install(self.workspace / "verify_mods").plugin_dir
+        return self._plugin_dir
+    
+    @property
+    def library(self) -> Path:
+        """A synthetic mods folder (sparse packs) for indexing benchmarks"""
+        if self._library is None:
+            config = LibraryConfig(assets=self.library_assets, packs=max(1, self.library_assets // 500),
+                                   content="sparse")
+            generate_library(self.workspace / "library", config)
+            self._library = self.workspace / "library" / "mods"
+        return self._library
+    
+    def verifier(self, cache_name: Optional[str] = None) -> QuickVerification:
+        """Verifier with its caches in the workspace; a new cache name means a cold run"""
+        cache_name = cache_name or self.fresh_path("cache").name
+        validator = GDScriptValidator(self.workspace / f"{cache_name}_gdscript.json") if GDScriptValidator else None
+        return QuickVerification(self.plugin_dir, quiet=True,
+                                 hash_cache=HashCache(self.workspace / f"{cache_name}_hash.json"),
+                                 gdscript_validator=validator)
+
+def timed(function: Callable[[], object]) -> float:
+    start_time = time.perf_counter()
+    function()
+    return time.perf_counter() - start_time
+
+def bench_installer_startup(context: BenchmarkContext) -> float:
+    """New interpreter importing the installer and parsing its arguments"""
+    environment = dict(os.environ, HOME=str(context.workspace), USERPROFILE=str(context.workspace))
+    command = [sys.executable, str(SOURCE_DIR / "TurboLoaderV3_Installer.py"), "--version"]
+    return timed(lambda: subprocess.run(command, env=environment, stdout=subprocess.DEVNULL, check=True))
+
+def bench_install(context: BenchmarkContext) -> float:
+    """Plan and install into an empty mods folder"""
+    mods_folder = context.fresh_path("install")
+    return timed(lambda: context.install(mods_folder))
+
+def bench_verify_cold(context: BenchmarkContext) -> float:
+    """QuickVerification with empty hash and GDScript caches"""
+    verifier = context.verifier()
+    return timed(verifier.verify)
+
+def bench_verify_warm(context: BenchmarkContext) -> float:
+    """QuickVerification with caches left by an earlier run"""
+    verifier = context.verifier("warm")
+    return timed(verifier.verify)
+
+def bench_pack_index_cold(context: BenchmarkContext) -> float:
+    """Index every pack of the synthetic library without a cache"""
+    inventory = ModInventory(context.library, cache_path=context.fresh_path("inventory"))
+    return timed(inventory.scan)
+
+def bench_pack_index_warm(context: BenchmarkContext) -> float:
+    """Index the synthetic library with every pack already cached"""
+    inventory = ModInventory(context.library, cache_path=context.workspace / "inventory_warm.json")
+    return timed(inventory.scan)
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], float]] = {
+    "installer_startup": bench_installer_startup,
+    "install": bench_install,
+    "verify_cold": bench_verify_cold,
+    "verify_warm": bench_verify_warm,
+    "pack_index_cold": bench_pack_index_cold,
+    "pack_index_warm": bench_pack_index_warm
+}
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(samples: List[float]) -> Dict:
+    return {
+        "samples": [round(sample, 6) for sample in samples],
+        "median": statistics.median(samples),
+        "p25": percentile(samples, 0.25),
+        "p75": percentile(samples, 0.75),
+        "min": min(samples),
+        "unit": "s"
+    }
+
+def run_benchmarks(names: List[str], repeats: int, library_assets: int) -> Dict[str, Dict]:
+    """Run each benchmark once to warm up and then `repeats` timed samples, in a scratch HOME"""
+    workspace = Path(tempfile.mkdtemp(prefix="tlv3_bench_"))
+    saved_home = {variable: os.environ.get(variable) for variable in ("HOME", "USERPROFILE")}
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(workspace)
+    context = BenchmarkContext(workspace, library_assets)
+    results = {}
+    
+    try:
+        for name in names:
+            benchmark = BENCHMARKS[name]
+            warmup = benchmark(context)
+            loops = min(1000, max(1, math.ceil(MIN_SAMPLE_SECONDS / max(warmup, 1e-6))))
+            samples = [sum(benchmark(context) for _ in range(loops)) / loops for _ in range(repeats)]
+            results[name] = summarize(samples)
+            results[name]["loops"] = loops
+            if name.startswith("pack_index"):
+                entries = library_assets + 2 * max(1, library_assets // 500)
+                results[name]["throughput"] = {"entries_per_second": round(entries / results[name]["median"])}
+    finally:
+        for variable, value in saved_home.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+        shutil.rmtree(workspace, ignore_errors=True)
+    
+    return results
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided Mann-Whitney U p-value that current samples tend to be larger than baseline
+    
+    Uses the normal approximation with tie and continuity corrections, which is
+    adequate from about eight samples per side.
+    """
+    combined = sorted([(value, 1) for value in current] + [(value, 0) for value in baseline])
+    total = len(combined)
+    rank_sum = 0.0
+    tie_term = 0
+    index = 0
+    while index < total:
+        end = index
+        while end + 1 < total and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        average_rank = (index + end) / 2 + 1
+        rank_sum += average_rank * sum(group for _, group in combined[index:end + 1])
+        tie_term += (end - index + 1) ** 3 - (end - index + 1)
+        index = end + 1
+    
+    n1, n2 = len(current), len(baseline)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def probability_greater(current: List[float], baseline: List[float]) -> float:
+    """Vargha-Delaney A: chance a current sample is larger than a baseline sample, ties counting half"""
+    wins = sum((value > other) + 0.5 * (value == other) for value in current for other in baseline)
+    return wins / (len(current) * len(baseline))
+
+def compare(results: Dict[str, Dict], baseline: List[Dict], alpha: float, threshold: float,
+            min_effect: float = DEFAULT_MIN_EFFECT) -> List[Dict]:
+    """Classify each benchmark against the baseline runs as ok, regression, improvement,
+    inconclusive, collecting or new
+    
+    Samples from all baseline runs are pooled for the Mann-Whitney test. A
+    regression also has to be slower than every baseline run's median, so a
+    single noisy baseline run cannot fail the gate on its own, and a large
+    effect, so a consistent but tiny shift cannot either.
+    """
+    comparisons = []
+    for name, result in results.items():
+        previous = [record["benchmarks"][name] for record in baseline if name in record.get("benchmarks", {})]
+        if not previous:
+            comparisons.append({"benchmark": name, "status": "new", "median": result["median"]})
+            continue
+        
+        pooled = [sample for run in previous for sample in run["samples"]]
+        run_medians = [run["median"] for run in previous]
+        baseline_median = statistics.median(pooled)
+        change = result["median"] / baseline_median - 1 if baseline_median else 0.0
+        p_slower = mann_whitney_greater(result["samples"], pooled)
+        p_faster = mann_whitney_greater(pooled, result["samples"])
+        effect = probability_greater(result["samples"], pooled)
+        
+        if len(previous) < MIN_BASELINE_RUNS:
+            status = "collecting"
+        elif min(len(result["samples"]), len(pooled)) < MIN_SAMPLES:
+            status = "inconclusive"
+        elif (p_slower < alpha and change > threshold and effect >= min_effect
+              and result["median"] > max(run_medians)):
+            status = "regression"
+        elif (p_faster < alpha and change < -threshold and effect <= 1 - min_effect
+              and result["median"] < min(run_medians)):
+            status = "improvement"
+        else:
+            status = "ok"
+        
+        comparisons.append({
+            "benchmark": name,
+            "status": status,
+            "median": result["median"],
+            "baseline_median": baseline_median,
+            "baseline_runs": len(previous),
+            "change": change,
+            "effect": effect,
+            "p_value": p_slower if change >= 0 else p_faster
+        })
+    return comparisons
+
+def machine_key() -> str:
+    """Results are only compared between runs on the same machine and Python"""
+    return f"{platform.node()}|{platform.machine()}|{platform.python_implementation()} {platform.python_version()}"
+
+def current_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SOURCE_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+def load_history(history_path: Path) -> List[Dict]:
+    """Every readable record of the JSONL history, oldest first"""
+    records = []
+    try:
+        with open(history_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("format") == HISTORY_FORMAT:
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+def find_baseline(records: List[Dict], label: Optional[str] = None, runs: int = BASELINE_RUNS) -> List[Dict]:
+    """Latest passing or accepted runs on this machine, or the latest runs with the given label, newest first"""
+    machine = machine_key()
+    if label is not None:
+        matches = [record for record in records if record.get("label") == label]
+    else:
+        matches = [record for record in records if record.get("machine") == machine
+                   and (record.get("passed", True) or record.get("accepted"))]
+    return matches[::-1][:runs]
+
+def append_history(history_path: Path, record: Dict):
+    """Add one run as a single line so concurrent runs never interleave a record"""
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+def render_markdown(record: Dict, comparisons: List[Dict]) -> str:
+    """PERFORMANCE_BENCHMARKS.md for one run"""
+    lines = [
+        "# Performance Benchmarks",
+        "",
+        f"Measured {time.strftime('%Y-%m-%d', time.gmtime(record['timestamp']))} on "
+        f"{record['platform']} ({record['machine'].split('|', 2)[2]}), commit {record.get('commit') or 'unknown'}, "
+        f"{record['repeats']} runs each. Times are medians with the interquartile range.",
+        "",
+        "| Benchmark | Median | P25 - P75 | vs. baseline |",
+        "|---|---|---|---|"
+    ]
+    
+    by_name = {comparison["benchmark"]: comparison for comparison in comparisons}
+    for name, result in record["benchmarks"].items():
+        comparison = by_name.get(name, {})
+        versus = f"{comparison['change']:+.1%} ({comparison['status']})" if "change" in comparison else "-"
+        lines.append(f"| {name} | {result['median'] * 1000:.2f} ms | "
+                     f"{result['p25'] * 1000:.2f} - {result['p75'] * 1000:.2f} ms | {versus} |")
+        if "throughput" in result:
+            lines.append(f"| {name} throughput | {result['throughput']['entries_per_second']:,} entries/s | | |")
+    
+    lines += [
+        "",
+        f"Pack indexing uses a synthetic library of {record['library_assets']:,} assets "
+        "(generate_asset_library.py, sparse packs).",
+        ""
+    ]
+    return "\n".join(lines)
+
+def main():
+    """Main entry point"""
+    default_history = Path.home() / ".cache" / "TurboLoaderV3" / "benchmarks.jsonl"
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Benchmark Suite")
+    parser.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeats", type=int, default=15,
+                        help="Timed runs per benchmark (default: 15)")
+    parser.add_argument("--library-assets", type=int, default=10_000,
+                        help="Assets in the synthetic library used for pack indexing (default: 10000)")
+    parser.add_argument("--history", type=Path,
+                        default=Path(os.environ.get("TURBOLOADER_BENCHMARK_HISTORY", default_history)),
+                        help="JSONL results history (default: ~/.cache/TurboLoaderV3/benchmarks.jsonl)")
+    parser.add_argument("--label", help="Tag this run in the history, e.g. a release name")
+    parser.add_argument("--baseline", metavar="LABEL",
+                        help="Compare against the latest run with this label "
+                             "(default: latest passing run on this machine)")
+    parser.add_argument("--baseline-runs", type=int, default=BASELINE_RUNS,
+                        help=f"Recent runs pooled into the baseline (default: {BASELINE_RUNS})")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help=f"Significance level for the regression test (default: {DEFAULT_ALPHA})")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Smallest median slowdown treated as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-effect", type=float, default=DEFAULT_MIN_EFFECT,
+                        help="Smallest chance a sample is slower than a baseline sample treated as a regression "
+                             f"(default: {DEFAULT_MIN_EFFECT})")
+    parser.add_argument("--accept", action="store_true",
+                        help="Record this run as the new baseline even if it regresses, e.g. after an intended slowdown")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--no-gate", action="store_true", help="Exit 0 even when a regression is found")
+    parser.add_argument("--report", type=Path, help="Also write a Markdown report, e.g. PERFORMANCE_BENCHMARKS.md")
+    parser.add_argument("--json", action="store_true", help="Print the run and comparison as JSON")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    if args.repeats < 2:
+        parser.error("--repeats must be at least 2")
+    if not 0.5 <= args.min_effect <= 1:
+        parser.error("--min-effect must be between 0.5 and 1")
+    if args.accept and args.no_record:
+        parser.error("--accept records the run, so it cannot be combined with --no-record")
+    
+    history_path = args.history.expanduser()
+    baseline = find_baseline(load_history(history_path), args.baseline, args.baseline_runs)
+    
+    results = run_benchmarks(args.benchmarks or list(BENCHMARKS), args.repeats, args.library_assets)
+    comparisons = compare(results, baseline, args.alpha, args.threshold, args.min_effect)
+    regressions = [comparison for comparison in comparisons if comparison["status"] == "regression"]
+    
+    # Re-measure anything flagged and judge it on both sets of samples, so one noisy burst cannot fail the gate
+    if regressions:
+        flagged = [comparison["benchmark"] for comparison in regressions]
+        rerun = run_benchmarks(flagged, args.repeats, args.library_assets)
+        for name in flagged:
+            merged = summarize(results[name]["samples"] + rerun[name]["samples"])
+            results[name] = dict(results[name], **merged)
+        comparisons = compare(results, baseline, args.alpha, args.threshold, args.min_effect)
+        regressions = [comparison for comparison in comparisons if comparison["status"] == "regression"]
+    
+    record = {
+        "format": HISTORY_FORMAT,
+        "timestamp": time.time(),
+        "label": args.label,
+        "commit": current_commit(),
+        "machine": machine_key(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "library_assets": args.library_assets,
+        "passed": not regressions,
+        "accepted": args.accept,
+        "benchmarks": results
+    }
+    if not args.no_record:
+        append_history(history_path, record)
+    if args.report:
+        args.report.write_text(render_markdown(record, comparisons), encoding="utf-8")
+    
+    if args.json:
+        print(json.dumps({"run": record, "baseline_timestamps": [run["timestamp"] for run in baseline],
+                          "comparisons": comparisons}, indent=2))
+    else:
+        print("Turbo Loader v3 - Benchmark Suite")
+        print("=" * 55)
+        if baseline:
+            newest = baseline[0]
+            print(f"Baseline: {len(baseline)} runs, newest {time.strftime('%Y-%m-%d %H:%M', time.localtime(newest['timestamp']))} "
+                  f"({newest.get('label') or newest.get('commit') or 'unlabelled'})")
+        else:
+            print("Baseline: none yet - this run becomes the baseline")
+        print()
+        
+        markers = {"ok": "PASS", "new": "PASS", "collecting": "PASS", "inconclusive": "PASS",
+                   "improvement": "PASS", "regression": "WARN" if args.accept else "FAIL"}
+        for comparison in comparisons:
+            line = f"{markers[comparison['status']]} {comparison['benchmark']:<18} {comparison['median'] * 1000:9.2f} ms"
+            if "change" in comparison:
+                line += (f"  {comparison['change']:+7.1%}  p={comparison['p_value']:.4f}  "
+                         f"A={comparison['effect']:.2f}  {comparison['status']}")
+            throughput = results[comparison["benchmark"]].get("throughput")
+            if throughput:
+                line += f"  ({throughput['entries_per_second']:,} entries/s)"
+            print(line)
+        
+        if not args.no_record:
+            print(f"\nRecorded in {history_path}")
+        if args.accept:
+            print("Accepted as baseline: later runs are compared against these results")
+    
+    return 1 if regressions and not (args.no_gate or args.accept) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
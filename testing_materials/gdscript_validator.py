@@ -0,0 +1,1177 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - GDScript Syntax Validator
+Tokenizes and parses GDScript (Godot 3 and 4 syntax) so broken plugin scripts
+are caught at install and verification time instead of inside Dungeondraft
+"""
+
+import os
+import sys
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Bump when parsing rules change so cached results are re-validated
+VALIDATOR_VERSION = 3
+
+MAX_ERRORS = 50
+
+OPERATORS = [
+    "**=", "<<=", ">>=",
+    "**", "<<", ">>", "<=", ">=", "==", "!=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=",
+    "->", ":=", "&&", "||", "..",
+    "+", "-", "*", "/", "%", "<", ">", "=", "!", "&", "|", "^", "~",
+    "(", ")", "[", "]", "{", "}", ",", ":", ".", ";"
+]
+
+BRACKETS = {"(": ")", "[": "]", "{": "}"}
+
+ASSIGNMENT_OPERATORS = {"=", "+=", "-=", "*=", "/=", "%=", "**=", "&=", "|=", "^=", "<<=", ">>="}
+
+# Binary operator precedence; higher binds tighter
+BINARY_PRECEDENCE = {
+    "or": 1, "||": 1,
+    "and": 2, "&&": 2,
+    "in": 4,
+    "<": 5, ">": 5, "<=": 5, ">=": 5, "==": 5, "!=": 5,
+    "|": 6, "^": 7, "&": 8,
+    "<<": 9, ">>": 9,
+    "+": 10, "-": 10,
+    "*": 11, "/": 11, "%": 11,
+    "**": 13,
+    "is": 14
+}
+
+# Keywords that can never start an expression
+STATEMENT_KEYWORDS = {
+    "if", "elif", "else", "for", "while", "match", "return", "pass", "break", "continue",
+    "breakpoint", "var", "const", "class", "class_name", "extends", "signal", "enum",
+    "static", "when", "and", "or", "in", "is", "as"
+}
+
+# Godot 3 member prefixes that precede var or func
+MEMBER_PREFIXES = {
+    "export", "onready", "remote", "master", "puppet", "slave", "remotesync",
+    "mastersync", "puppetsync", "sync"
+}
+
+@dataclass
+class Token:
+    """Single lexical token"""
+    kind: str  # NAME, NUMBER, STRING, NODEPATH, ANNOTATION, OP, NEWLINE, INDENT, DEDENT, EOF
+    value: str
+    line: int
+    column: int
+
+@dataclass
+class GDScriptError:
+    """Syntax error with a 1-based source position"""
+    line: int
+    column: int
+    message: str
+    
+    def to_dict(self) -> Dict:
+        """Serializable form"""
+        return {"line": self.line, "column": self.column, "message": self.message}
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating one script"""
+    errors: List[GDScriptError] = field(default_factory=list)
+    extends: Optional[str] = None
+    functions: List[str] = field(default_factory=list)
+    classes: List[str] = field(default_factory=list)
+    
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+    
+    def to_dict(self) -> Dict:
+        """Serializable form, as stored in the cache"""
+        return {
+            "valid": self.valid,
+            "errors": [error.to_dict() for error in self.errors],
+            "extends": self.extends,
+            "functions": self.functions,
+            "classes": self.classes
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ValidationResult":
+        """Rebuild a result from its serialized form"""
+        return cls(
+            errors=[GDScriptError(**error) for error in data.get("errors", [])],
+            extends=data.get("extends"),
+            functions=list(data.get("functions", [])),
+            classes=list(data.get("classes", []))
+        )
+
+class GDScriptSyntaxError(Exception):
+    """Raised inside the tokenizer and parser; collected into ValidationResult.errors"""
+    
+    def __init__(self, message: str, line: int, column: int):
+        super().__init__(message)
+        self.error = GDScriptError(line, column, message)
+
+class Tokenizer:
+    """Turn GDScript source into tokens with INDENT/DEDENT and logical NEWLINEs"""
+    
+    def __init__(self, source: str):
+        self.source = source.replace("\r\n", "\n").replace("\r", "\n")
+        self.tokens: List[Token] = []
+        self.errors: List[GDScriptError] = []
+        self.pos = 0
+        self.line = 1
+        self.line_start = 0
+        self.brackets: List[Token] = []
+        self.indents = [""]
+        self.indent_char: Optional[str] = None
+    
+    @property
+    def column(self) -> int:
+        return self.pos - self.line_start + 1
+    
+    def _error(self, message: str, line: Optional[int] = None, column: Optional[int] = None):
+        self.errors.append(GDScriptError(line or self.line, column or self.column, message))
+    
+    def _emit(self, kind: str, value: str, line: int, column: int):
+        self.tokens.append(Token(kind, value, line, column))
+    
+    def _last_is_operand(self) -> bool:
+        """Whether the previous token ends an operand (used to disambiguate %, . and numbers)"""
+        if not self.tokens:
+            return False
+        last = self.tokens[-1]
+        if last.kind in ("NAME", "NUMBER", "STRING", "NODEPATH"):
+            return last.value not in BINARY_PRECEDENCE and last.value not in ("not", "return", "await")
+        return last.kind == "OP" and last.value in (")", "]", "}")
+    
+    def tokenize(self) -> List[Token]:
+        """Tokenize the whole source"""
+        source = self.source
+        at_line_start = True
+        
+        while self.pos < len(source):
+            if at_line_start:
+                # Lines continued inside brackets carry no indentation, even after the bracket closes
+                at_line_start = False
+                if not self.brackets and self._indentation():
+                    continue
+            
+            char = source[self.pos]
+            
+            if char == "\n":
+                if not self.brackets and self.tokens and self.tokens[-1].kind != "NEWLINE":
+                    self._emit("NEWLINE", "", self.line, self.column)
+                self.pos += 1
+                self.line += 1
+                self.line_start = self.pos
+                at_line_start = True
+            elif char in " \t":
+                self.pos += 1
+            elif char == "#":
+                while self.pos < len(source) and source[self.pos] != "\n":
+                    self.pos += 1
+            elif char == "\\" and source.startswith("\n", self.pos + 1):
+                # Explicit line continuation
+                self.pos += 2
+                self.line += 1
+                self.line_start = self.pos
+            elif char in "\"'":
+                self._string("STRING", self.pos)
+            elif char in "&^r" and source[self.pos + 1:self.pos + 2] in ("\"", "'"):
+                # StringName, NodePath and raw string literals
+                self.pos += 1
+                self._string("STRING" if char == "r" else "NODEPATH", self.pos - 1, raw=(char == "r"))
+            elif char.isdigit() or (char == "." and source[self.pos + 1:self.pos + 2].isdigit()
+                                    and not self._last_is_operand()):
+                self._number()
+            elif char.isalpha() or char == "_" or ord(char) > 127:
+                self._name("NAME", self.pos)
+            elif char == "@":
+                self.pos += 1
+                self._name("ANNOTATION", self.pos - 1)
+            elif char == "$" or (char == "%" and not self._last_is_operand()):
+                self._node_path()
+            else:
+                self._operator()
+        
+        for bracket in self.brackets:
+            self._error(f"Unclosed '{bracket.value}'", bracket.line, bracket.column)
+        
+        if self.tokens and self.tokens[-1].kind != "NEWLINE":
+            self._emit("NEWLINE", "", self.line, self.column)
+        for _ in self.indents[1:]:
+            self._emit("DEDENT", "", self.line, self.column)
+        self._emit("EOF", "", self.line, self.column)
+        return self.tokens
+    
+    def _indentation(self) -> bool:
+        """Measure a line's indentation; returns True when the line is blank or a comment"""
+        source = self.source
+        start = self.pos
+        while self.pos < len(source) and source[self.pos] in " \t":
+            self.pos += 1
+        
+        if self.pos >= len(source) or source[self.pos] in "\n#":
+            return True
+        if source[self.pos] == "\\" and source.startswith("\n", self.pos + 1):
+            return True
+        
+        indent = source[start:self.pos]
+        if indent:
+            if " " in indent and "\t" in indent:
+                self._error("Mixed use of tabs and spaces for indentation", column=1)
+            elif self.indent_char is None:
+                self.indent_char = indent[0]
+            elif indent[0] != self.indent_char:
+                expected = "tabs" if self.indent_char == "\t" else "spaces"
+                self._error(f"Indentation uses {'tabs' if indent[0] == chr(9) else 'spaces'} "
+                            f"but the file is indented with {expected}", column=1)
+        
+        current = self.indents[-1]
+        if indent == current:
+            return False
+        if indent.startswith(current):
+            self.indents.append(indent)
+            self._emit("INDENT", indent, self.line, 1)
+            return False
+        
+        while len(self.indents) > 1 and self.indents[-1] != indent and self.indents[-1].startswith(indent):
+            self.indents.pop()
+            self._emit("DEDENT", "", self.line, 1)
+        
+        if self.indents[-1] != indent:
+            self._error("Unindent does not match any outer indentation level", column=1)
+            # Treat the line as a new block so parsing can continue
+            self.indents.append(indent)
+            self._emit("INDENT", indent, self.line, 1)
+        return False
+    
+    def _string(self, kind: str, start: int, raw: bool = False):
+        """Consume a quoted or triple-quoted string"""
+        source = self.source
+        line, column = self.line, start - self.line_start + 1
+        quote = source[self.pos]
+        if source.startswith(quote * 3, self.pos):
+            quote = quote * 3
+        self.pos += len(quote)
+        
+        while True:
+            if self.pos >= len(source):
+                self._error("Unterminated string", line, column)
+                break
+            char = source[self.pos]
+            if char == "\\" and not raw:
+                if source.startswith("\n", self.pos + 1):
+                    self.line += 1
+                    self.line_start = self.pos + 2
+                self.pos += 2
+                continue
+            if source.startswith(quote, self.pos):
+                self.pos += len(quote)
+                break
+            if char == "\n":
+                if len(quote) == 1:
+                    self._error("Unterminated string", line, column)
+                    break
+                self.line += 1
+                self.line_start = self.pos + 1
+            self.pos += 1
+        
+        self._emit(kind, source[start:self.pos], line, column)
+    
+    def _number(self):
+        """Consume an integer, float, hex or binary literal"""
+        source = self.source
+        start = self.pos
+        column = self.column
+        
+        if source.startswith(("0x", "0X", "0b", "0B"), self.pos):
+            self.pos += 2
+            while self.pos < len(source) and (source[self.pos].isalnum() or source[self.pos] == "_"):
+                self.pos += 1
+        else:
+            while self.pos < len(source) and (source[self.pos].isdigit() or source[self.pos] in "_."):
+                # A second dot starts an attribute access, e.g. 1.0.snapped()
+                if source[self.pos] == "." and ("." in source[start:self.pos]
+                                                or not source[self.pos + 1:self.pos + 2].isdigit()
+                                                and source[self.pos + 1:self.pos + 2].isalpha()):
+                    break
+                self.pos += 1
+            if self.pos < len(source) and source[self.pos] in "eE":
+                self.pos += 1
+                if self.pos < len(source) and source[self.pos] in "+-":
+                    self.pos += 1
+                while self.pos < len(source) and source[self.pos].isdigit():
+                    self.pos += 1
+        
+        text = source[start:self.pos]
+        if self.pos < len(source) and (source[self.pos].isalpha() or source[self.pos] == "_"):
+            self._error(f"Invalid numeric literal '{text}{source[self.pos]}'")
+        self._emit("NUMBER", text, self.line, column)
+    
+    def _name(self, kind: str, start: int):
+        """Consume an identifier, keyword or annotation"""
+        source = self.source
+        column = start - self.line_start + 1
+        while self.pos < len(source) and (source[self.pos].isalnum() or source[self.pos] == "_"
+                                          or ord(source[self.pos]) > 127):
+            self.pos += 1
+        
+        if self.pos == start + (1 if kind == "ANNOTATION" else 0):
+            self._error("Expected annotation name after '@'", column=column)
+        self._emit(kind, source[start:self.pos], self.line, column)
+    
+    def _node_path(self):
+        """Consume $Node/Path, $"Node/Path" or %UniqueName"""
+        source = self.source
+        start = self.pos
+        column = self.column
+        self.pos += 1
+        
+        if self.pos < len(source) and source[self.pos] in "\"'":
+            self._string("NODEPATH", start)
+            return
+        
+        while self.pos < len(source) and (source[self.pos].isalnum() or source[self.pos] in "_/%"
+                                          or ord(source[self.pos]) > 127):
+            self.pos += 1
+        if self.pos == start + 1:
+            self._error(f"Expected node path after '{source[start]}'", column=column)
+        self._emit("NODEPATH", source[start:self.pos], self.line, column)
+    
+    def _operator(self):
+        """Consume an operator or bracket, tracking bracket nesting"""
+        source = self.source
+        column = self.column
+        
+        for operator in OPERATORS:
+            if source.startswith(operator, self.pos):
+                break
+        else:
+            self._error(f"Unexpected character '{source[self.pos]}'")
+            self.pos += 1
+            return
+        
+        self.pos += len(operator)
+        token = Token("OP", operator, self.line, column)
+        self.tokens.append(token)
+        
+        if operator in BRACKETS:
+            self.brackets.append(token)
+        elif operator in (")", "]", "}"):
+            if not self.brackets:
+                self._error(f"Unmatched '{operator}'", column=column)
+            elif BRACKETS[self.brackets[-1].value] != operator:
+                opener = self.brackets.pop()
+                self._error(f"'{operator}' does not match '{opener.value}' on line {opener.line}", column=column)
+            else:
+                self.brackets.pop()
+
+class Parser:
+    """Indentation-aware recursive descent parser over Tokenizer output"""
+    
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+        self.errors: List[GDScriptError] = []
+        self.result = ValidationResult()
+        # Set when a multi-line lambda body has already ended the enclosing statement
+        self.block_ended = False
+    
+    # Token helpers
+    
+    def peek(self, offset: int = 0) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+    
+    def advance(self) -> Token:
+        token = self.peek()
+        if token.kind != "EOF":
+            self.pos += 1
+        return token
+    
+    def check(self, value: str, kind: Optional[str] = None) -> bool:
+        token = self.peek()
+        return token.value == value and (kind is None or token.kind == kind) and token.kind in ("OP", "NAME")
+    
+    def accept(self, value: str) -> bool:
+        if self.check(value):
+            self.advance()
+            return True
+        return False
+    
+    def fail(self, message: str, token: Optional[Token] = None):
+        token = token or self.peek()
+        raise GDScriptSyntaxError(message, token.line, token.column)
+    
+    @staticmethod
+    def describe(token: Token) -> str:
+        if token.kind == "NEWLINE":
+            return "end of line"
+        if token.kind in ("INDENT", "DEDENT"):
+            return "indentation change"
+        if token.kind == "EOF":
+            return "end of file"
+        return f"'{token.value}'"
+    
+    def expect(self, value: str, context: str = "") -> Token:
+        if not self.check(value):
+            suffix = f" {context}" if context else ""
+            self.fail(f"Expected '{value}'{suffix}, found {self.describe(self.peek())}")
+        return self.advance()
+    
+    def expect_name(self, context: str) -> Token:
+        token = self.peek()
+        if token.kind != "NAME":
+            self.fail(f"Expected {context}, found {self.describe(token)}")
+        return self.advance()
+    
+    def end_statement(self):
+        if self.block_ended:
+            self.block_ended = False
+            return
+        token = self.peek()
+        if token.kind in ("NEWLINE", "EOF", "DEDENT"):
+            if token.kind == "NEWLINE":
+                self.advance()
+            return
+        if self.accept(";"):
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+            return
+        self.fail(f"Expected end of statement, found {self.describe(token)}")
+    
+    def recover(self):
+        """Skip to the start of the next statement at the current level"""
+        depth = 0
+        while self.peek().kind != "EOF":
+            token = self.advance()
+            if token.kind == "INDENT":
+                depth += 1
+            elif token.kind == "DEDENT":
+                depth -= 1
+                if depth < 0:
+                    self.pos -= 1
+                    return
+            elif token.kind == "NEWLINE" and depth == 0 and self.peek().kind != "INDENT":
+                return
+    
+    # Blocks
+    
+    def parse(self) -> ValidationResult:
+        """Parse a whole script as a class body"""
+        scope = {"kind": "class", "functions": set(), "top": True}
+        while self.peek().kind != "EOF":
+            if self.peek().kind in ("NEWLINE", "DEDENT"):
+                self.advance()
+                continue
+            if self.peek().kind == "INDENT":
+                self.errors.append(GDScriptError(self.peek().line, self.peek().column, "Unexpected indentation"))
+                self.advance()
+                continue
+            self.statement(scope)
+        
+        self.result.errors = self.errors[:MAX_ERRORS]
+        return self.result
+    
+    def statement(self, scope: Dict):
+        """Parse one statement, recording an error and resynchronizing on failure"""
+        start = self.pos
+        self.block_ended = False
+        try:
+            if scope["kind"] == "class":
+                self.member(scope)
+                scope["extends_allowed"] = False
+            else:
+                self.body_statement(scope)
+        except GDScriptSyntaxError as e:
+            self.errors.append(e.error)
+            if self.pos == start:
+                self.advance()
+            self.recover()
+        
+        if len(self.errors) >= MAX_ERRORS:
+            self.pos = len(self.tokens) - 1
+    
+    def suite(self, scope: Dict):
+        """Parse the body after a ':' — either an indented block or statements on the same line"""
+        if self.peek().kind != "NEWLINE":
+            if scope["kind"] == "class":
+                self.member(scope)
+                return
+            self.simple_statement(scope)
+            while self.accept(";") and self.peek().kind not in ("NEWLINE", "EOF"):
+                self.simple_statement(scope)
+            self.end_statement()
+            return
+        
+        self.advance()
+        if self.peek().kind != "INDENT":
+            self.fail(f"Expected an indented block, found {self.describe(self.peek())}")
+        self.advance()
+        
+        while self.peek().kind not in ("DEDENT", "EOF"):
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+                continue
+            if self.peek().kind == "INDENT":
+                self.errors.append(GDScriptError(self.peek().line, self.peek().column, "Unexpected indentation"))
+                self.advance()
+                continue
+            self.statement(scope)
+        self.accept_dedent()
+    
+    def accept_dedent(self):
+        if self.peek().kind == "DEDENT":
+            self.advance()
+    
+    # Class-level members
+    
+    def member(self, scope: Dict):
+        token = self.peek()
+        
+        if token.kind == "ANNOTATION":
+            self.annotation()
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+            return
+        
+        keyword = token.value if token.kind == "NAME" else None
+        
+        if keyword in MEMBER_PREFIXES or keyword == "static":
+            self.advance()
+            if keyword == "export" and self.check("("):
+                self.arguments()
+            if not self.check("var") and not self.check("func") and self.peek().value not in MEMBER_PREFIXES:
+                self.fail(f"Expected 'var' or 'func' after '{keyword}', found {self.describe(self.peek())}")
+            self.member(scope)
+        elif keyword == "extends":
+            self.advance()
+            if scope.get("top"):
+                if self.result.extends is not None:
+                    self.fail("'extends' must appear once at the top of the script", token)
+                self.result.extends = self.type_or_path()
+            else:
+                # Inner classes may name their base as the first statement of the body
+                if not scope.get("extends_allowed"):
+                    self.fail("'extends' must be the first statement of a class", token)
+                self.type_or_path()
+            self.end_statement()
+        elif keyword == "class_name":
+            self.advance()
+            self.expect_name("class name")
+            if self.accept(","):
+                self.expression()
+            if self.accept("extends"):
+                self.result.extends = self.type_or_path()
+            self.end_statement()
+        elif keyword == "tool":
+            self.advance()
+            self.end_statement()
+        elif keyword == "signal":
+            self.advance()
+            self.expect_name("signal name")
+            if self.check("("):
+                self.parameters()
+            self.end_statement()
+        elif keyword == "enum":
+            self.enum()
+        elif keyword == "const":
+            self.const()
+            self.end_statement()
+        elif keyword == "var":
+            if self.var(scope):
+                self.end_statement()
+        elif keyword == "func":
+            self.function(scope)
+        elif keyword == "class":
+            self.inner_class(scope)
+        elif keyword == "pass":
+            self.advance()
+            self.end_statement()
+        elif token.kind == "STRING":
+            # Docstring-style string statements are allowed anywhere
+            self.advance()
+            self.end_statement()
+        else:
+            self.fail(f"Unexpected {self.describe(token)} at class level; expected a declaration")
+    
+    def annotation(self):
+        self.advance()
+        if self.check("(") and self.peek().line == self.tokens[self.pos - 1].line:
+            self.arguments()
+    
+    def type_or_path(self) -> str:
+        token = self.peek()
+        if token.kind == "STRING":
+            self.advance()
+            name = token.value
+            while self.accept("."):
+                name += "." + self.expect_name("class name").value
+            return name
+        return self.type_name()
+    
+    def type_name(self) -> str:
+        name = self.expect_name("type name").value
+        while self.accept("."):
+            name += "." + self.expect_name("type name").value
+        if self.accept("["):
+            self.type_name()
+            while self.accept(","):
+                self.type_name()
+            self.expect("]", "to close typed collection")
+        return name
+    
+    def enum(self):
+        self.advance()
+        if self.peek().kind == "NAME":
+            self.advance()
+        self.expect("{", "to start enum")
+        while not self.check("}"):
+            self.expect_name("enum value")
+            if self.accept("="):
+                self.expression()
+            if not self.accept(","):
+                break
+        self.expect("}", "to close enum")
+        self.end_statement()
+    
+    def const(self):
+        self.advance()
+        self.expect_name("constant name")
+        if self.accept(":="):
+            self.expression()
+        else:
+            if self.accept(":"):
+                self.type_name()
+            self.expect("=", "in constant declaration")
+            self.expression()
+    
+    def var(self, scope: Dict) -> bool:
+        """Parse a variable declaration; returns False when a property block ended the statement"""
+        self.advance()
+        self.expect_name("variable name")
+        
+        if self.accept(":="):
+            self.expression()
+        else:
+            if self.check(":") and self.peek(1).kind != "NEWLINE":
+                self.advance()
+                self.type_name()
+            if self.accept("="):
+                self.expression()
+        
+        if self.accept("setget"):
+            if self.peek().kind == "NAME":
+                self.advance()
+            if self.accept(","):
+                self.expect_name("getter name")
+        
+        if scope["kind"] == "class" and self.check(":"):
+            self.advance()
+            self.property_block()
+            return False
+        return True
+    
+    def property_block(self):
+        """Godot 4 inline get/set definitions"""
+        if self.peek().kind != "NEWLINE":
+            self.property_accessor()
+            while self.accept(","):
+                self.property_accessor()
+            self.end_statement()
+            return
+        
+        self.advance()
+        if self.peek().kind != "INDENT":
+            self.fail("Expected an indented get/set block")
+        self.advance()
+        while self.peek().kind not in ("DEDENT", "EOF"):
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+                continue
+            try:
+                self.property_accessor()
+            except GDScriptSyntaxError as e:
+                self.errors.append(e.error)
+                self.recover()
+        self.accept_dedent()
+    
+    def property_accessor(self):
+        name = self.expect_name("'get' or 'set'")
+        if name.value not in ("get", "set"):
+            self.fail(f"Expected 'get' or 'set', found '{name.value}'", name)
+        if self.accept("="):
+            self.expect_name("accessor function name")
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+            return
+        if name.value == "set":
+            self.expect("(", "after 'set'")
+            self.expect_name("setter parameter")
+            if self.accept(":"):
+                self.type_name()
+            self.expect(")", "to close setter parameter")
+        self.expect(":", f"after '{name.value}'")
+        self.suite({"kind": "function", "loop": False})
+    
+    def function(self, scope: Dict):
+        self.advance()
+        name = self.expect_name("function name")
+        if name.value in scope["functions"]:
+            self.errors.append(GDScriptError(name.line, name.column, f"Function '{name.value}' is already defined"))
+        scope["functions"].add(name.value)
+        if scope.get("top"):
+            self.result.functions.append(name.value)
+        
+        self.parameters()
+        if self.accept("->"):
+            self.type_name()
+        self.expect(":", "after function signature")
+        self.suite({"kind": "function", "loop": False})
+    
+    def parameters(self):
+        self.expect("(", "to start parameter list")
+        while not self.check(")"):
+            self.accept("..")
+            self.expect_name("parameter name")
+            if self.accept(":="):
+                self.expression()
+            else:
+                if self.accept(":"):
+                    self.type_name()
+                if self.accept("="):
+                    self.expression()
+            if not self.accept(","):
+                break
+        self.expect(")", "to close parameter list")
+    
+    def inner_class(self, scope: Dict):
+        self.advance()
+        name = self.expect_name("class name")
+        if scope.get("top"):
+            self.result.classes.append(name.value)
+        header_extends = self.accept("extends")
+        if header_extends:
+            self.type_or_path()
+        self.expect(":", "after class declaration")
+        self.suite({"kind": "class", "functions": set(), "top": False, "extends_allowed": not header_extends})
+    
+    # Function-body statements
+    
+    def body_statement(self, scope: Dict):
+        token = self.peek()
+        keyword = token.value if token.kind == "NAME" else None
+        
+        if keyword == "if":
+            self.advance()
+            self.expression()
+            self.expect(":", "after 'if' condition")
+            self.suite(scope)
+            while self.check("elif"):
+                self.advance()
+                self.expression()
+                self.expect(":", "after 'elif' condition")
+                self.suite(scope)
+            if self.accept("else"):
+                self.expect(":", "after 'else'")
+                self.suite(scope)
+        elif keyword in ("elif", "else"):
+            self.fail(f"'{keyword}' without a matching 'if'")
+        elif keyword == "for":
+            self.advance()
+            self.expect_name("loop variable")
+            if self.accept(":"):
+                self.type_name()
+            self.expect("in", "in 'for' loop")
+            self.expression()
+            self.expect(":", "after 'for' clause")
+            self.suite(dict(scope, loop=True))
+        elif keyword == "while":
+            self.advance()
+            self.expression()
+            self.expect(":", "after 'while' condition")
+            self.suite(dict(scope, loop=True))
+        elif keyword == "match":
+            self.match(scope)
+        elif keyword == "func":
+            # Named local lambdas are expressions too
+            self.simple_statement(scope)
+            self.end_statement()
+        elif keyword == "class":
+            self.fail("Classes can only be declared at class level")
+        else:
+            self.simple_statement(scope)
+            self.end_statement()
+    
+    def simple_statement(self, scope: Dict):
+        token = self.peek()
+        keyword = token.value if token.kind == "NAME" else None
+        
+        if keyword in ("pass", "breakpoint"):
+            self.advance()
+        elif keyword in ("break", "continue"):
+            self.advance()
+            if not scope.get("loop"):
+                self.fail(f"'{keyword}' is only allowed inside a loop", token)
+        elif keyword == "return":
+            self.advance()
+            if scope["kind"] != "function":
+                self.fail("'return' is only allowed inside a function", token)
+            if self.peek().kind not in ("NEWLINE", "EOF", "DEDENT") and not self.check(";"):
+                self.expression()
+        elif keyword == "var":
+            self.var(scope)
+        elif keyword == "const":
+            self.const()
+        elif keyword in STATEMENT_KEYWORDS:
+            self.fail(f"Unexpected '{keyword}'", token)
+        else:
+            target = self.peek()
+            self.expression()
+            operator = self.peek()
+            if operator.kind == "OP" and operator.value in ASSIGNMENT_OPERATORS:
+                # The target must end in a name, attribute or subscript, not a call or literal
+                previous = self.tokens[self.pos - 1]
+                if target.kind not in ("NAME", "NODEPATH") or not (
+                        previous.kind == "NAME" or (previous.kind == "OP" and previous.value == "]")):
+                    self.fail("Invalid assignment target", target)
+                self.advance()
+                self.expression()
+    
+    def match(self, scope: Dict):
+        self.advance()
+        self.expression()
+        self.expect(":", "after 'match' value")
+        if self.peek().kind != "NEWLINE":
+            self.fail("Expected match branches on the following lines")
+        self.advance()
+        if self.peek().kind != "INDENT":
+            self.fail("Expected an indented block of match branches")
+        self.advance()
+        
+        while self.peek().kind not in ("DEDENT", "EOF"):
+            if self.peek().kind == "NEWLINE":
+                self.advance()
+                continue
+            try:
+                self.pattern()
+                while self.accept(","):
+                    self.pattern()
+                if self.accept("when"):
+                    self.expression()
+                self.expect(":", "after match pattern")
+                self.suite(scope)
+            except GDScriptSyntaxError as e:
+                self.errors.append(e.error)
+                self.recover()
+        self.accept_dedent()
+    
+    def pattern(self):
+        if self.accept("var"):
+            self.expect_name("binding name")
+        elif self.accept(".."):
+            pass
+        elif self.accept("["):
+            while not self.check("]"):
+                self.pattern()
+                if not self.accept(","):
+                    break
+            self.expect("]", "to close array pattern")
+        elif self.accept("{"):
+            while not self.check("}"):
+                if self.accept(".."):
+                    pass
+                else:
+                    self.expression()
+                    if self.accept(":"):
+                        self.pattern()
+                if not self.accept(","):
+                    break
+            self.expect("}", "to close dictionary pattern")
+        else:
+            self.expression(allow_ternary=False)
+    
+    # Expressions
+    
+    def expression(self, min_precedence: int = 0, allow_ternary: bool = True):
+        self.unary()
+        
+        while True:
+            token = self.peek()
+            operator = token.value if token.kind in ("OP", "NAME") else None
+            
+            if operator == "not" and self.peek(1).value == "in":
+                precedence = BINARY_PRECEDENCE["in"]
+                if precedence < min_precedence:
+                    return
+                self.advance()
+                self.advance()
+                self.expression(precedence + 1)
+            elif operator == "is":
+                if BINARY_PRECEDENCE["is"] < min_precedence:
+                    return
+                self.advance()
+                self.accept("not")
+                self.type_name()
+            elif operator in BINARY_PRECEDENCE:
+                precedence = BINARY_PRECEDENCE[operator]
+                if precedence < min_precedence:
+                    return
+                self.advance()
+                # ** is right associative
+                self.expression(precedence if operator == "**" else precedence + 1)
+            elif operator == "if" and allow_ternary and min_precedence == 0:
+                self.advance()
+                self.expression(1)
+                self.expect("else", "in conditional expression")
+                self.expression()
+            elif operator == "as" and min_precedence == 0:
+                self.advance()
+                self.type_name()
+            else:
+                return
+    
+    def unary(self):
+        token = self.peek()
+        if token.kind in ("OP", "NAME") and token.value in ("not", "!"):
+            self.advance()
+            self.expression(3)
+        elif token.kind == "OP" and token.value in ("-", "+", "~"):
+            self.advance()
+            self.expression(12)
+        elif token.kind == "NAME" and token.value == "await":
+            self.advance()
+            self.expression(14)
+        else:
+            self.primary()
+            self.postfix()
+    
+    def primary(self):
+        token = self.peek()
+        
+        if token.kind in ("NUMBER", "STRING", "NODEPATH"):
+            self.advance()
+        elif token.kind == "NAME":
+            if token.value == "func":
+                self.lambda_expression()
+            elif token.value in STATEMENT_KEYWORDS:
+                self.fail(f"Expected expression, found keyword '{token.value}'")
+            else:
+                self.advance()
+        elif token.kind == "OP" and token.value == "(":
+            self.advance()
+            self.expression()
+            self.expect(")", "to close parenthesis")
+        elif token.kind == "OP" and token.value == "[":
+            self.advance()
+            while not self.check("]"):
+                self.expression()
+                if not self.accept(","):
+                    break
+            self.expect("]", "to close array")
+        elif token.kind == "OP" and token.value == "{":
+            self.advance()
+            while not self.check("}"):
+                if self.peek().kind == "NAME" and self.peek(1).value == "=":
+                    self.advance()
+                    self.advance()
+                else:
+                    self.expression()
+                    self.expect(":", "in dictionary entry")
+                self.expression()
+                if not self.accept(","):
+                    break
+            self.expect("}", "to close dictionary")
+        elif (token.kind == "OP" and token.value == "."
+              and self.peek(1).kind == "NAME" and self.peek(2).value == "("):
+            # Godot 3 super call: .method() runs the parent class implementation
+            self.advance()
+            self.advance()
+        elif token.kind == "OP" and token.value == ".":
+            # Godot 4 enum shorthand is not valid, but .5 style floats are handled by the tokenizer
+            self.fail("Expected expression, found '.'")
+        else:
+            self.fail(f"Expected expression, found {self.describe(token)}")
+    
+    def postfix(self):
+        while True:
+            if self.check("("):
+                self.arguments()
+            elif self.check("["):
+                self.advance()
+                self.expression()
+                self.expect("]", "to close subscript")
+            elif self.check("."):
+                self.advance()
+                self.expect_name("attribute name")
+            else:
+                return
+    
+    def arguments(self):
+        self.expect("(")
+        while not self.check(")"):
+            self.expression()
+            if not self.accept(","):
+                break
+        self.expect(")", "to close argument list")
+    
+    def lambda_expression(self):
+        self.advance()
+        if self.peek().kind == "NAME":
+            self.advance()
+        self.parameters()
+        if self.accept("->"):
+            self.type_name()
+        self.expect(":", "after lambda signature")
+        
+        if self.peek().kind == "NEWLINE" and self.peek(1).kind == "INDENT":
+            self.suite({"kind": "function", "loop": False})
+            self.block_ended = True
+            return
+        
+        # Single-line body: inside brackets it ends at the next top-level ',' or closer
+        depth = 0
+        while self.peek().kind not in ("NEWLINE", "EOF"):
+            token = self.peek()
+            if token.kind == "OP" and token.value in BRACKETS:
+                depth += 1
+            elif token.kind == "OP" and token.value in (")", "]", "}"):
+                if depth == 0:
+                    return
+                depth -= 1
+            elif token.kind == "OP" and token.value == "," and depth == 0:
+                return
+            self.advance()
+
+def validate_source(source: str) -> ValidationResult:
+    """Tokenize and parse GDScript source text"""
+    tokenizer = Tokenizer(source)
+    tokens = tokenizer.tokenize()
+    result = Parser(tokens).parse()
+    
+    # Tokenizer errors come first; the parser often reports their knock-on effects too
+    errors = tokenizer.errors + result.errors
+    errors.sort(key=lambda error: (error.line, error.column))
+    result.errors = errors[:MAX_ERRORS]
+    return result
+
+class GDScriptValidator:
+    """Validates scripts with results cached by content hash, so unchanged files cost one hash"""
+    
+    def __init__(self, cache_path: Optional[Path] = None):
+        default_path = Path.home() / ".cache" / "TurboLoaderV3" / "gdscript_cache.json"
+        self.cache_path = cache_path or Path(os.environ.get("TURBOLOADER_GDSCRIPT_CACHE", default_path))
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        """Read the cache file on first use, discarding results from older validators"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+            self._entries = data.get("results", {}) if data.get("version") == VALIDATOR_VERSION else {}
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+    
+    def validate_text(self, source: str) -> ValidationResult:
+        """Validate source text, reusing a cached result for identical content"""
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            cached = self._entries.get(digest)
+        if cached is not None:
+            return ValidationResult.from_dict(cached)
+        
+        result = validate_source(source)
+        with self._lock:
+            self._entries[digest] = result.to_dict()
+            self._dirty = True
+        return result
+    
+    def validate_file(self, path: Path) -> ValidationResult:
+        """Validate a script file"""
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return self.validate_text(f.read())
+    
+    def validate_many(self, paths: List[Path], workers: int = 8) -> Dict[Path, ValidationResult]:
+        """Validate several scripts concurrently"""
+        def validate(path: Path) -> ValidationResult:
+            try:
+                return self.validate_file(path)
+            except (OSError, UnicodeDecodeError) as e:
+                return ValidationResult(errors=[GDScriptError(0, 0, f"Could not read file: {e}")])
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(zip(paths, executor.map(validate, paths)))
+    
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+                with open(temp_path, 'w') as f:
+                    json.dump({"version": VALIDATOR_VERSION, "results": self._entries}, f)
+                os.replace(temp_path, self.cache_path)
+                self._dirty = False
+            except OSError:
+                pass  # The cache is only an optimisation
+
+def find_scripts(targets: List[Path]) -> List[Path]:
+    """Expand directories into the .gd files below them"""
+    scripts = []
+    for target in targets:
+        if target.is_dir():
+            scripts.extend(sorted(target.rglob("*.gd")))
+        else:
+            scripts.append(target)
+    return scripts
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - GDScript Syntax Validator")
+    parser.add_argument("targets", nargs="*", type=Path,
+                        default=[Path.home() / "Documents" / "Dungeondraft Mods"],
+                        help="Scripts or folders to validate (default: the Dungeondraft mods folder)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print results as JSON")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and do not update the validation cache")
+    args = parser.parse_args()
+    
+    start_time = time.time()
+    validator = GDScriptValidator(Path(os.devnull) if args.no_cache else None)
+    results = validator.validate_many(find_scripts(args.targets))
+    if not args.no_cache:
+        validator.save()
+    duration = time.time() - start_time
+    
+    if args.json:
+        print(json.dumps({str(path): result.to_dict() for path, result in results.items()}, indent=2))
+    else:
+        for path, result in results.items():
+            if result.valid:
+                print(f"PASS {path}")
+                continue
+            print(f"FAIL {path}")
+            for error in result.errors:
+                print(f"     line {error.line}, column {error.column}: {error.message}")
+        print(f"\nValidated {len(results)} scripts in {duration * 1000:.1f}ms")
+    
+    sys.exit(0 if all(result.valid for result in results.values()) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Synthetic Asset Library Generator
+Writes a deterministic mods folder of GDPC .dungeondraft_pack files (plus
+optional maps) for scale-testing pack scanning, caching and verification
+"""
+
+import os
+import sys
+import argparse
+import hashlib
+import json
+import math
+import random
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+GDPC_MAGIC = b"GDPC"
+
+# Engine version written into pack headers, per pack format
+GODOT_VERSIONS = {1: (3, 4, 2), 2: (4, 2, 1)}
+
+# Asset count and pack count for each --scale preset
+SCALE_PRESETS = {"10k": (10_000, 20), "100k": (100_000, 100), "1m": (1_000_000, 500)}
+
+# Texture folders Dungeondraft reads from a pack, with their relative frequency
+ASSET_CATEGORIES = [
+    ("textures/objects", 60),
+    ("textures/terrain", 8),
+    ("textures/walls", 6),
+    ("textures/paths", 6),
+    ("textures/tilesets/simple", 4),
+    ("textures/portals", 4),
+    ("textures/lights", 4),
+    ("textures/materials", 4),
+    ("textures/caves", 2),
+    ("textures/patterns", 2)
+]
+
+OBJECT_GROUPS = ["furniture", "nature", "dungeon", "tavern", "ships", "clutter", "city", "magic", "camp", "crypt"]
+ASSET_NOUNS = ["barrel", "crate", "table", "chair", "rock", "tree", "bush", "statue", "pillar", "chest",
+               "bed", "door", "torch", "altar", "cart", "sack", "bookshelf", "rug", "bones", "lantern"]
+ASSET_ADJECTIVES = ["old", "broken", "large", "small", "mossy", "ornate", "wooden", "stone", "iron", "burnt"]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Random bytes each pack slices asset content from, so content is cheap but not trivially compressible
+CONTENT_BLOCK_SIZE = 256 * 1024
+
+# (path, size, content or None for a sparse hole)
+PackFile = Tuple[str, int, Optional[bytes]]
+
+@dataclass
+class LibraryConfig:
+    """Everything that determines a generated library; the same config always gives the same bytes"""
+    seed: int = 1
+    packs: int = 20
+    assets: int = 10_000
+    distribution: str = "skewed"  # uniform or skewed (a few very large packs)
+    size_median: int = 24 * 1024
+    size_sigma: float = 1.0
+    size_max: int = 16 * 1024 * 1024
+    duplicate_ids: float = 0.05
+    collision_rate: float = 0.01
+    maps: int = 0
+    map_objects: int = 500
+    pack_format: int = 1
+    content: str = "random"  # random, zeros or sparse
+
+@dataclass
+class PackPlan:
+    """One pack to write, fully decided before any file is written"""
+    file_name: str
+    pack_id: str
+    name: str
+    version: str
+    author: str
+    seed: str
+    assets: List[str] = field(default_factory=list)
+
+def split_assets(total: int, packs: int, distribution: str, rng: random.Random) -> List[int]:
+    """Spread the asset count over the packs; every pack gets at least one asset"""
+    if distribution == "uniform":
+        weights = [1.0] * packs
+    else:
+        weights = [rng.paretovariate(1.2) for _ in range(packs)]
+    
+    scale = max(0, total - packs) / sum(weights)
+    counts = [1 + int(weight * scale) for weight in weights]
+    
+    # Hand out what rounding dropped so the total is exact
+    for index in range(total - sum(counts)):
+        counts[index % packs] += 1
+    return counts
+
+def asset_name(rng: random.Random, category: str, index: int) -> str:
+    stem = f"{rng.choice(ASSET_ADJECTIVES)}_{rng.choice(ASSET_NOUNS)}_{index:05d}"
+    if category == "textures/objects":
+        return f"{category}/{rng.choice(OBJECT_GROUPS)}/{stem}.png"
+    return f"{category}/{stem}.png"
+
+def plan_library(config: LibraryConfig) -> List[PackPlan]:
+    """Decide every pack's identity and asset paths from the seed"""
+    rng = random.Random(config.seed)
+    counts = split_assets(config.assets, config.packs, config.distribution, rng)
+    categories = [category for category, _ in ASSET_CATEGORIES]
+    category_weights = [weight for _, weight in ASSET_CATEGORIES]
+    shared_pool = max(1, int(config.assets * config.collision_rate) // 4)
+    
+    plans: List[PackPlan] = []
+    for index, count in enumerate(counts):
+        if plans and rng.random() < config.duplicate_ids:
+            # Another copy of an earlier pack: same ID, sometimes a different version
+            original = rng.choice(plans)
+            pack_id, name, author = original.pack_id, original.name, original.author
+            version = original.version if rng.random() < 0.5 else f"1.{index % 10}.{rng.randrange(10)}"
+        else:
+            pack_id = f"{rng.getrandbits(32):08x}"
+            name = f"{rng.choice(ASSET_ADJECTIVES).title()} {rng.choice(OBJECT_GROUPS).title()} Pack {index}"
+            author = f"Creator{rng.randrange(50):02d}"
+            version = f"1.0.{rng.randrange(10)}"
+        
+        plan = PackPlan(f"{index:05d}_{pack_id}.dungeondraft_pack", pack_id, name, version, author,
+                        f"{config.seed}:{index}")
+        asset_rng = random.Random(plan.seed)
+        shared_paths = set()
+        for asset_index in range(count):
+            category = asset_rng.choices(categories, category_weights)[0]
+            shared_path = f"res://textures/shared/{asset_rng.randrange(shared_pool):05d}.png"
+            if asset_rng.random() < config.collision_rate and shared_path not in shared_paths:
+                # Paths outside the pack's own folder override whichever pack loads first
+                shared_paths.add(shared_path)
+                plan.assets.append(shared_path)
+            else:
+                plan.assets.append(f"res://packs/{pack_id}/{asset_name(asset_rng, category, asset_index)}")
+        plans.append(plan)
+    
+    return plans
+
+def asset_size(rng: random.Random, config: LibraryConfig) -> int:
+    """Log-normal texture size around the configured median"""
+    size = int(config.size_median * math.exp(rng.gauss(0.0, config.size_sigma)))
+    return max(len(PNG_SIGNATURE), min(size, config.size_max))
+
+def pack_paths(plan: PackPlan) -> List[str]:
+    """Every path stored in a pack, in file-table order"""
+    return [f"res://packs/{plan.pack_id}.json",
+            f"res://packs/{plan.pack_id}/data/default.dungeondraft_tags"] + plan.assets
+
+def pack_files(plan: PackPlan, config: LibraryConfig) -> Iterator[PackFile]:
+    """Manifest, tags file and every asset of one pack, generated lazily in pack_paths() order"""
+    rng = random.Random(f"{plan.seed}:content")
+    block = rng.randbytes(CONTENT_BLOCK_SIZE) if config.content == "random" else b""
+    paths = pack_paths(plan)
+    
+    manifest = json.dumps({
+        "name": plan.name,
+        "id": plan.pack_id,
+        "version": plan.version,
+        "author": plan.author,
+        "custom_color_overrides": {"enabled": False}
+    }, indent=2).encode("utf-8")
+    tags = json.dumps({"tags": {plan.name: plan.assets[:100]}, "sets": {}}).encode("utf-8")
+    yield paths[0], len(manifest), manifest
+    yield paths[1], len(tags), tags
+    
+    for path in plan.assets:
+        size = asset_size(rng, config)
+        if config.content == "sparse":
+            content = None
+        elif config.content == "zeros":
+            content = PNG_SIGNATURE + bytes(size - len(PNG_SIGNATURE))
+        else:
+            body = bytearray()
+            while len(body) < size - len(PNG_SIGNATURE):
+                start = rng.randrange(CONTENT_BLOCK_SIZE)
+                body += block[start:start + size - len(PNG_SIGNATURE) - len(body)]
+            content = PNG_SIGNATURE + bytes(body)
+        yield path, size, content
+
+def write_pack(path: Path, paths: List[str], files: Iterable[PackFile], pack_format: int = 1) -> Tuple[int, int]:
+    """Write a GDPC archive laid out as Godot's PCKPacker does; returns (file size, data bytes)
+    
+    File data is streamed straight to disk and the file table, which needs every
+    MD5, is filled in afterwards. Sparse entries (content None) become holes.
+    """
+    major, minor, patch = GODOT_VERSIONS[pack_format]
+    entry_size = 32 if pack_format == 1 else 36
+    raw_paths = []
+    for file_path in paths:
+        raw = file_path.encode("utf-8")
+        raw_paths.append(raw + b"\0" * (-len(raw) % 4))
+    
+    header_size = 20 + (12 if pack_format >= 2 else 0) + 16 * 4 + 4
+    file_base = header_size + sum(4 + len(raw) + entry_size for raw in raw_paths)
+    
+    header = bytearray(GDPC_MAGIC + struct.pack("<4I", pack_format, major, minor, patch))
+    if pack_format >= 2:
+        header += struct.pack("<IQ", 0, file_base)
+    header += bytes(16 * 4) + struct.pack("<I", len(raw_paths))
+    
+    # Godot 3 offsets are absolute; Godot 4 offsets are relative to file_base
+    offset = file_base if pack_format == 1 else 0
+    table = bytearray()
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    
+    with open(temp_path, 'wb') as f:
+        f.seek(file_base)
+        for raw, (file_path, size, content) in zip(raw_paths, files):
+            if content is None:
+                md5 = bytes(16)
+                f.seek(size, os.SEEK_CUR)
+            else:
+                md5 = hashlib.md5(content).digest()
+                f.write(content)
+            table += struct.pack("<I", len(raw)) + raw + struct.pack("<QQ", offset, size) + md5
+            if pack_format >= 2:
+                table += struct.pack("<I", 0)
+            offset += size
+        
+        f.truncate()
+        total_size = f.tell()
+        f.seek(0)
+        f.write(header)
+        f.write(table)
+    
+    os.replace(temp_path, path)
+    return total_size, total_size - file_base
+
+def write_map(path: Path, plans: List[PackPlan], rng: random.Random, objects: int):
+    """A .dungeondraft_map placing assets from several packs"""
+    sources = rng.sample(plans, min(len(plans), 5))
+    placed = []
+    for node_id in range(objects):
+        plan = rng.choice(sources)
+        placed.append({
+            "node_id": f"{node_id:x}",
+            "texture": rng.choice(plan.assets),
+            "position": f"Vector2( {rng.uniform(0, 8192):.1f}, {rng.uniform(0, 8192):.1f} )",
+            "rotation": round(rng.uniform(-math.pi, math.pi), 4),
+            "scale": "Vector2( 1, 1 )",
+            "mirror": rng.random() < 0.1
+        })
+    
+    map_data = {
+        "header": {
+            "creation_build": "1.1.0.3",
+            "creation_date": {"year": 2024, "month": 1, "day": 1},
+            "uses_default_assets": True,
+            "asset_manifest": [
+                {"name": plan.name, "id": plan.pack_id, "version": plan.version, "author": plan.author}
+                for plan in sources
+            ]
+        },
+        "world": {
+            "width": 32,
+            "height": 32,
+            "levels": {"0": {"label": "Ground", "objects": placed}}
+        }
+    }
+    path.write_text(json.dumps(map_data, indent="\t"), encoding="utf-8")
+
+def expected_conflicts(plans: List[PackPlan]) -> Dict[str, int]:
+    """What a correct inventory of the generated library must report"""
+    versions: Dict[str, set] = {}
+    for plan in plans:
+        versions.setdefault(plan.pack_id, set()).add(plan.version)
+    copies = Counter(plan.pack_id for plan in plans)
+    
+    path_packs = Counter()
+    for plan in plans:
+        path_packs.update(set(plan.assets) | {f"res://packs/{plan.pack_id}/data/default.dungeondraft_tags"})
+    
+    return {
+        "duplicate_ids": sum(1 for pack_id, count in copies.items() if count > 1 and len(versions[pack_id]) == 1),
+        "version_skew": sum(1 for pack_id, count in copies.items() if count > 1 and len(versions[pack_id]) > 1),
+        "file_collisions": sum(1 for count in path_packs.values() if count > 1)
+    }
+
+def generate_library(output: Path, config: LibraryConfig, workers: Optional[int] = None) -> Dict:
+    """Write packs under output/mods and maps under output/maps; returns the library summary"""
+    plans = plan_library(config)
+    mods_folder = output / "mods"
+    mods_folder.mkdir(parents=True, exist_ok=True)
+    
+    def write(plan: PackPlan) -> Dict:
+        paths = pack_paths(plan)
+        size, data_size = write_pack(mods_folder / plan.file_name, paths, pack_files(plan, config),
+                                     config.pack_format)
+        return {
+            "file": plan.file_name,
+            "id": plan.pack_id,
+            "version": plan.version,
+            "entries": len(paths),
+            "data_bytes": data_size,
+            "size": size
+        }
+    
+    # hashlib, zero-filling and file writes release the GIL
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as executor:
+        packs = list(executor.map(write, plans))
+    
+    if config.maps:
+        maps_folder = output / "maps"
+        maps_folder.mkdir(parents=True, exist_ok=True)
+        rng = random.Random(f"{config.seed}:maps")
+        for index in range(config.maps):
+            write_map(maps_folder / f"map_{index:04d}.dungeondraft_map", plans, rng, config.map_objects)
+    
+    summary = {
+        "config": asdict(config),
+        "totals": {
+            "packs": len(packs),
+            "assets": config.assets,
+            "entries": sum(pack["entries"] for pack in packs),
+            "bytes": sum(pack["size"] for pack in packs),
+            "maps": config.maps
+        },
+        "expected_conflicts": expected_conflicts(plans),
+        "packs": packs
+    }
+    (output / "library.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+def parse_size(text: str) -> int:
+    """Byte count with an optional K, M or G suffix"""
+    units = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    text = text.strip().lower().rstrip("b")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Synthetic Asset Library Generator")
+    parser.add_argument("output", type=Path, help="Directory to create (packs go in OUTPUT/mods)")
+    parser.add_argument("--scale", choices=sorted(SCALE_PRESETS),
+                        help="Preset asset and pack counts (10k: 20 packs, 100k: 100, 1m: 500)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--packs", type=int, help="Number of packs (default: 20)")
+    parser.add_argument("--assets", type=int, help="Total assets across all packs (default: 10000)")
+    parser.add_argument("--distribution", choices=["uniform", "skewed"], default="skewed",
+                        help="How assets are spread over packs (default: skewed)")
+    parser.add_argument("--size-median", type=parse_size, default="24K",
+                        help="Median asset size, e.g. 24K (default: 24K)")
+    parser.add_argument("--size-sigma", type=float, default=1.0,
+                        help="Log-normal spread of asset sizes (default: 1.0)")
+    parser.add_argument("--size-max", type=parse_size, default="16M",
+                        help="Largest asset size (default: 16M)")
+    parser.add_argument("--duplicate-ids", type=float, default=0.05,
+                        help="Fraction of packs that reuse an earlier pack's ID (default: 0.05)")
+    parser.add_argument("--collision-rate", type=float, default=0.01,
+                        help="Fraction of assets written to paths shared between packs (default: 0.01)")
+    parser.add_argument("--maps", type=int, default=0, help="Number of .dungeondraft_map files (default: 0)")
+    parser.add_argument("--map-objects", type=int, default=500, help="Objects placed per map (default: 500)")
+    parser.add_argument("--pack-format", type=int, choices=sorted(GODOT_VERSIONS), default=1,
+                        help="GDPC format: 1 for Godot 3 packs, 2 for Godot 4 (default: 1)")
+    parser.add_argument("--content", choices=["random", "zeros", "sparse"], default="random",
+                        help="Asset bytes: random, zero-filled, or sparse holes for huge libraries (default: random)")
+    parser.add_argument("--workers", type=int, help="Packs written concurrently")
+    args = parser.parse_args()
+    
+    assets, packs = SCALE_PRESETS.get(args.scale, (10_000, 20))
+    config = LibraryConfig(
+        seed=args.seed,
+        packs=args.packs or packs,
+        assets=args.assets or assets,
+        distribution=args.distribution,
+        size_median=args.size_median,
+        size_sigma=args.size_sigma,
+        size_max=args.size_max,
+        duplicate_ids=args.duplicate_ids,
+        collision_rate=args.collision_rate,
+        maps=args.maps,
+        map_objects=args.map_objects,
+        pack_format=args.pack_format,
+        content=args.content
+    )
+    
+    if config.packs < 1 or config.assets < config.packs:
+        parser.error("need at least one pack and at least one asset per pack")
+    
+    if config.content != "sparse" and config.assets * config.size_median > 4 * 1024 ** 3:
+        print(f"WARN About {config.assets * config.size_median / 1024 ** 3:.0f} GB of asset data; "
+              f"--content sparse keeps the disk usage to the file tables")
+    
+    start_time = time.time()
+    summary = generate_library(args.output, config, args.workers)
+    totals = summary["totals"]
+    expected = summary["expected_conflicts"]
+    
+    print("Turbo Loader v3 - Synthetic Asset Library")
+    print("=" * 55)
+    print(f"Output: {args.output}")
+    print(f"Packs: {totals['packs']}  Assets: {totals['assets']}  Entries: {totals['entries']}  "
+          f"Size: {totals['bytes'] / 1024 ** 2:.1f} MB  Maps: {totals['maps']}")
+    print(f"Expected conflicts: {expected['duplicate_ids']} duplicate IDs, {expected['version_skew']} "
+          f"version skews, {expected['file_collisions']} file collisions")
+    print(f"\nGenerated in {time.time() - start_time:.2f}s (seed {config.seed})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Install Lock
+Advisory inter-process lock that keeps installs, patches and verifications
+of the same mods folder from interleaving
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+LOCK_NAME = ".TurboLoaderV3.lock"
+
+# How often a waiting process retries the lock
+POLL_INTERVAL = 0.005
+
+class InstallLockTimeout(TimeoutError):
+    """Raised when another process holds the install lock for too long"""
+
+class InstallLock:
+    """Advisory lock on a mods folder
+    
+    Installs and patches take it exclusively; verifications take it shared, so
+    they can run together but never see a half-finished install. With flock the
+    mods folder itself is locked, so taking the lock never writes anything.
+    msvcrt can only lock files and has no shared locks, so on Windows every holder
+    locks <mods folder>/.TurboLoaderV3.lock exclusively and the last one out
+    deletes it; Windows refuses the delete while another process has it open.
+    """
+    
+    def __init__(self, mods_folder: Path, shared: bool = False, timeout: Optional[float] = 60.0):
+        self.mods_folder = Path(mods_folder)
+        self.path = self.mods_folder / LOCK_NAME
+        self.shared = shared
+        self.timeout = timeout
+        self.wait_seconds = 0.0
+        self._fd: Optional[int] = None
+    
+    def _open(self) -> int:
+        """Descriptor to lock; shared holders never create the mods folder"""
+        if not self.shared:
+            self.mods_folder.mkdir(parents=True, exist_ok=True)
+        if fcntl is not None:
+            return os.open(self.mods_folder, os.O_RDONLY)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT)
+    
+    def _try_lock(self) -> bool:
+        if fcntl is not None:
+            mode = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(self._fd, mode | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                return False
+        
+        if msvcrt is not None:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                return False
+        
+        return True  # No locking primitive on this platform
+    
+    def holder(self) -> Optional[int]:
+        """PID recorded by the current Windows holder, if readable"""
+        try:
+            return int(self.path.read_text().split()[0])
+        except (OSError, ValueError, IndexError):
+            return None
+    
+    def acquire(self) -> "InstallLock":
+        """Wait for the lock, up to the timeout"""
+        self._fd = self._open()
+        start_time = time.perf_counter()
+        
+        try:
+            while not self._try_lock():
+                if self.timeout is not None and time.perf_counter() - start_time >= self.timeout:
+                    pid = self.holder()
+                    holder = f" (pid {pid})" if pid is not None else ""
+                    raise InstallLockTimeout(f"{self.mods_folder} is locked by another process{holder}")
+                time.sleep(POLL_INTERVAL)
+        except BaseException:
+            os.close(self._fd)
+            self._fd = None
+            raise
+        
+        self.wait_seconds = time.perf_counter() - start_time
+        if fcntl is not None:
+            if not self.shared:
+                # Left behind by earlier versions, which locked a file instead of the folder
+                try:
+                    self.path.unlink()
+                except OSError:
+                    pass
+        elif msvcrt is not None:
+            os.ftruncate(self._fd, 0)
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            os.write(self._fd, f"{os.getpid()}\n".encode("ascii"))
+        return self
+    
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        
+        if fcntl is None and msvcrt is not None:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass  # Another process has it open and will remove it when done
+    
+    def __enter__(self) -> "InstallLock":
+        return self.acquire()
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.release()
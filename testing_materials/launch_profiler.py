@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Launch Profiler
+Starts Dungeondraft (or any stand-in executable), samples memory, CPU and disk
+I/O from /proc at high frequency, detects when it is ready from its log output
+and saves the whole startup as a timeline file
+"""
+
+import os
+import sys
+import argparse
+import json
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from TurboLoaderV3_Installer import DungeondraftDetector
+except ImportError:
+    DungeondraftDetector = None
+
+try:
+    from metrics_ring import record_metrics
+except ImportError:
+    record_metrics = None
+
+TIMELINE_FORMAT = 1
+
+# Line the plugin prints once start() has finished
+DEFAULT_READY_PATTERN = r"\[TurboLoaderV3\] Successfully initialized and ready"
+
+# Seconds between /proc samples
+DEFAULT_INTERVAL = 0.01
+
+# Idle readiness: the process tree counts as idle below this CPU use, measured over IDLE_WINDOW seconds
+IDLE_CPU_PERCENT = 5.0
+IDLE_WINDOW = 0.1
+
+PROC = Path("/proc")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def read_process(pid: int) -> Optional[Dict]:
+    """Parent pid, CPU time and RSS of one process, or None once it has gone"""
+    try:
+        stat = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    
+    # The command name is parenthesised and may contain spaces, so split after it
+    fields = stat[stat.rindex(")") + 2:].split()
+    if fields[0] == "Z":
+        return None
+    utime, stime, cutime, cstime = (int(value) for value in fields[11:15])
+    process = {
+        "ppid": int(fields[1]),
+        "cpu_seconds": (utime + stime + cutime + cstime) / CLOCK_TICKS,
+        "rss_bytes": int(fields[21]) * PAGE_SIZE,
+        "read_bytes": 0,
+        "write_bytes": 0
+    }
+    
+    # Needs the same user; a setuid child just reports no I/O
+    try:
+        for line in (PROC / str(pid) / "io").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("read_bytes", "write_bytes"):
+                process[key] = int(value)
+    except OSError:
+        pass
+    return process
+
+def process_tree(root_pid: int) -> List[int]:
+    """The root process and all of its descendants"""
+    children = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+    
+    tree, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, []))
+    return tree
+
+class ProcSampler:
+    """Samples a process tree from /proc on a fixed schedule
+    
+    Launchers often exec a wrapper that starts the real game, so every sample
+    sums the whole tree. The tree is rescanned every TREE_REFRESH samples rather
+    than every sample, because listing /proc costs more than reading a few files.
+    
+    With idle_after set, the sampler also notices when a process that has been
+    busy stays idle for that many seconds, and records when the idle spell began.
+    That marks readiness for builds that print nothing when they finish loading.
+    """
+    
+    TREE_REFRESH = 10
+    
+    def __init__(self, pid: int, interval: float = DEFAULT_INTERVAL, idle_after: Optional[float] = None):
+        self.pid = pid
+        self.interval = interval
+        self.idle_after = idle_after
+        self.idle_at = None
+        self.idle = threading.Event()
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._start_time = None
+    
+    def start(self, start_time: float) -> "ProcSampler":
+        self._start_time = start_time
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        pids = [self.pid]
+        previous = None
+        deadline = time.perf_counter()
+        window_start = 0
+        busy = False
+        idle_since = None
+        
+        while not self._stop.is_set():
+            if len(self.samples) % self.TREE_REFRESH == 0:
+                pids = process_tree(self.pid)
+            processes = [process for process in map(read_process, pids) if process]
+            now = time.perf_counter()
+            if not processes:
+                break
+            
+            sample = {
+                "t": round(now - self._start_time, 5),
+                "processes": len(processes),
+                "rss_bytes": sum(process["rss_bytes"] for process in processes),
+                "cpu_seconds": round(sum(process["cpu_seconds"] for process in processes), 3),
+                "read_bytes": sum(process["read_bytes"] for process in processes),
+                "write_bytes": sum(process["write_bytes"] for process in processes)
+            }
+            # CPU use since the previous sample, where 100 is one full core
+            if previous and sample["t"] > previous["t"]:
+                cpu_delta = max(0.0, sample["cpu_seconds"] - previous["cpu_seconds"])
+                sample["cpu_percent"] = round(100 * cpu_delta / (sample["t"] - previous["t"]), 1)
+            else:
+                sample["cpu_percent"] = 0.0
+            self.samples.append(sample)
+            previous = sample
+            
+            if self.idle_after is not None and self.idle_at is None:
+                # Ticks are too coarse for one interval, so judge CPU use over a short window
+                while sample["t"] - self.samples[window_start]["t"] > IDLE_WINDOW:
+                    window_start += 1
+                oldest = self.samples[max(0, window_start - 1)]
+                span = sample["t"] - oldest["t"]
+                windowed = 100 * (sample["cpu_seconds"] - oldest["cpu_seconds"]) / span if span > 0 else 0.0
+                if windowed >= IDLE_CPU_PERCENT:
+                    busy, idle_since = True, None
+                elif busy:
+                    idle_since = oldest["t"] if idle_since is None else idle_since
+                    if sample["t"] - idle_since >= self.idle_after:
+                        self.idle_at = idle_since
+                        self.idle.set()
+            
+            # Keep to the schedule instead of drifting by the cost of each sample
+            deadline += self.interval
+            self._stop.wait(max(0.0, deadline - time.perf_counter()))
+
+class LogWatcher:
+    """Timestamps the output of the launched process and of an optional log file"""
+    
+    def __init__(self, ready_pattern: Optional[str], start_time: float, echo: bool = False):
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.start_time = start_time
+        self.echo = echo
+        self.lines = []
+        self.ready_at = None
+        self.ready = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+    
+    def _add(self, source: str, line: str):
+        elapsed = round(time.perf_counter() - self.start_time, 5)
+        line = line.rstrip("\r\n")
+        with self._lock:
+            self.lines.append({"t": elapsed, "source": source, "line": line})
+            if self.ready_at is None and self.ready_pattern and self.ready_pattern.search(line):
+                self.ready_at = elapsed
+                self.ready.set()
+        if self.echo:
+            print(f"[{elapsed:8.3f}s] {line}")
+    
+    def watch_stream(self, stream, source: str = "stdout"):
+        def run():
+            for line in iter(stream.readline, ""):
+                self._add(source, line)
+            stream.close()
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+    
+    def watch_file(self, path: Path, stop: threading.Event, poll: float = 0.02):
+        """Follow a log file from its current end; a file created later is read from the start"""
+        def run():
+            position = path.stat().st_size if path.exists() else 0
+            pending = ""
+            while True:
+                stopping = stop.is_set()
+                try:
+                    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                        if os.fstat(f.fileno()).st_size < position:
+                            position = 0  # Truncated or rotated
+                        f.seek(position)
+                        pending += f.read()
+                        position = f.tell()
+                except OSError:
+                    pass
+                *complete, pending = pending.split("\n")
+                for line in complete:
+                    self._add(path.name, line)
+                if stopping:
+                    break
+                stop.wait(poll)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+    
+    def join(self, timeout: float = 2.0):
+        for thread in self._threads:
+            thread.join(timeout)
+
+def find_dungeondraft() -> Optional[Path]:
+    """Dungeondraft executable from the installer's detection, if installed"""
+    if DungeondraftDetector is None:
+        return None
+    detector = DungeondraftDetector()
+    install_path, _ = detector.detect_installation()
+    return detector.executable_path(install_path) if install_path else None
+
+def summarize_samples(samples: List[Dict], ready_at: Optional[float]) -> Dict:
+    """Peaks, totals and the achieved sampling rate"""
+    if not samples:
+        return {"samples": 0}
+    
+    gaps = [later["t"] - earlier["t"] for earlier, later in zip(samples, samples[1:])]
+    summary = {
+        "samples": len(samples),
+        "mean_interval_ms": round(1000 * sum(gaps) / len(gaps), 3) if gaps else None,
+        "max_interval_ms": round(1000 * max(gaps), 3) if gaps else None,
+        "peak_rss_mb": round(max(sample["rss_bytes"] for sample in samples) / 1024 ** 2, 1),
+        "peak_cpu_percent": max(sample["cpu_percent"] for sample in samples),
+        "cpu_seconds": samples[-1]["cpu_seconds"],
+        "read_mb": round(samples[-1]["read_bytes"] / 1024 ** 2, 2),
+        "write_mb": round(samples[-1]["write_bytes"] / 1024 ** 2, 2),
+        "max_processes": max(sample["processes"] for sample in samples)
+    }
+    
+    # The same figures up to the ready line, which is what startup comparisons care about
+    if ready_at is not None:
+        before_ready = [sample for sample in samples if sample["t"] <= ready_at] or samples[:1]
+        summary["at_ready"] = {
+            "rss_mb": round(before_ready[-1]["rss_bytes"] / 1024 ** 2, 1),
+            "cpu_seconds": before_ready[-1]["cpu_seconds"],
+            "read_mb": round(before_ready[-1]["read_bytes"] / 1024 ** 2, 2),
+            "write_mb": round(before_ready[-1]["write_bytes"] / 1024 ** 2, 2),
+            "read_bytes": before_ready[-1]["read_bytes"]
+        }
+    return summary
+
+def stop_process(process: subprocess.Popen, grace: float = 5.0):
+    """Terminate politely, then kill"""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def profile_launch(command: List[str], ready_pattern: Optional[str] = DEFAULT_READY_PATTERN,
+                   interval: float = DEFAULT_INTERVAL, timeout: float = 120.0,
+                   linger: Optional[float] = 0.0, log_file: Optional[Path] = None,
+                   env: Optional[Dict[str, str]] = None, cwd: Optional[Path] = None,
+                   echo: bool = False, label: Optional[str] = None,
+                   idle_ready: Optional[float] = None) -> Dict:
+    """Launch a command and record its startup timeline
+    
+    Ready is the first line matching ready_pattern or, with idle_ready set and no
+    such line yet, the start of the first idle spell of idle_ready seconds. With
+    linger set, the process is stopped that many seconds after ready (or at the
+    timeout); with linger None it runs until it exits.
+    """
+    if not (PROC / "self" / "stat").exists():
+        raise RuntimeError("launch profiling needs /proc, which is only available on Linux")
+    
+    wall_start = time.time()
+    start_time = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               stdin=subprocess.DEVNULL, text=True, errors='replace', bufsize=1,
+                               env=env, cwd=cwd)
+    sampler = ProcSampler(process.pid, interval, idle_ready).start(start_time)
+    watcher = LogWatcher(ready_pattern, start_time, echo)
+    watcher.watch_stream(process.stdout)
+    stop_following = threading.Event()
+    if log_file:
+        watcher.watch_file(Path(log_file).expanduser(), stop_following)
+    
+    stopped = False
+    deadline = start_time + timeout
+    try:
+        while process.poll() is None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                stopped = True
+                break
+            ready_at = watcher.ready_at if watcher.ready_at is not None else sampler.idle_at
+            if linger is not None and ready_at is not None:
+                ready_deadline = start_time + ready_at + linger
+                if time.perf_counter() >= ready_deadline:
+                    stopped = True
+                    break
+                remaining = min(remaining, ready_deadline - time.perf_counter())
+            try:
+                process.wait(min(remaining, 0.05) if remaining > 0 else 0)
+            except subprocess.TimeoutExpired:
+                pass
+    finally:
+        stop_process(process)
+        exited_at = time.perf_counter() - start_time
+        sampler.stop()
+        stop_following.set()
+        watcher.join()
+    
+    ready_at, ready_source = watcher.ready_at, "log"
+    if ready_at is None and sampler.idle_at is not None:
+        ready_at, ready_source = sampler.idle_at, "idle"
+    
+    events = [{"t": 0.0, "event": "launch"}]
+    if watcher.lines:
+        events.append({"t": watcher.lines[0]["t"], "event": "first_output"})
+    if ready_at is not None:
+        events.append({"t": ready_at, "event": "ready"})
+    events.append({"t": round(exited_at, 5), "event": "stopped" if stopped else "exit"})
+    events.sort(key=lambda event: event["t"])
+    
+    return {
+        "format": TIMELINE_FORMAT,
+        "label": label,
+        "command": command,
+        "started": wall_start,
+        "interval": interval,
+        "ready_pattern": ready_pattern,
+        "idle_ready": idle_ready,
+        "time_to_ready": ready_at,
+        "ready_source": ready_source if ready_at is not None else None,
+        "timed_out": ready_at is None and stopped,
+        "exit_code": None if stopped else process.returncode,
+        "duration": round(exited_at, 5),
+        "summary": summarize_samples(sampler.samples, ready_at),
+        "events": events,
+        "log": watcher.lines,
+        "samples": sampler.samples
+    }
+
+def save_timeline(timeline: Dict, path: Path):
+    """Write a timeline atomically"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(timeline, indent=1), encoding="utf-8")
+    os.replace(temp_path, path)
+
+def load_timeline(path: Path) -> Dict:
+    timeline = json.loads(Path(path).read_text(encoding="utf-8"))
+    if timeline.get("format") != TIMELINE_FORMAT:
+        raise ValueError(f"{path} is not a launch timeline (format {timeline.get('format')})")
+    return timeline
+
+def describe(timeline: Dict, name: str) -> str:
+    """One line comparing a timeline's startup numbers"""
+    summary = timeline["summary"]
+    ready = timeline["time_to_ready"]
+    at_ready = summary.get("at_ready", {})
+    ready_text = f"{ready:8.3f}s" if ready is not None else "   never "
+    return (f"{name:<28} ready {ready_text}  rss {at_ready.get('rss_mb', summary.get('peak_rss_mb', 0)):8.1f} MB  "
+            f"cpu {at_ready.get('cpu_seconds', summary.get('cpu_seconds', 0)):7.2f}s  "
+            f"read {at_ready.get('read_mb', summary.get('read_mb', 0)):8.2f} MB  "
+            f"({summary.get('samples', 0)} samples)")
+
+def main():
+    """Main entry point"""
+    default_directory = Path(os.environ.get("TURBOLOADER_PROFILE_DIR",
+                                            Path.home() / ".cache" / "TurboLoaderV3" / "launch_profiles"))
+    parser = argparse.ArgumentParser(
+        description="Turbo Loader v3 - Launch Profiler",
+        epilog="Example: launch_profiler.py --label no-mods -- ./Dungeondraft.x86_64")
+    parser.add_argument("command", nargs="*",
+                        help="Command to launch (default: the detected Dungeondraft executable)")
+    parser.add_argument("--ready-pattern", default=DEFAULT_READY_PATTERN,
+                        help="Regular expression of the log line that marks startup as finished")
+    parser.add_argument("--log-file", type=Path,
+                        help="Also follow this log file, e.g. Dungeondraft's godot.log")
+    parser.add_argument("--idle-ready", type=float, metavar="SECONDS",
+                        help="Also count the process as ready once it has been idle this long, "
+                             "for builds without a ready line")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Seconds between samples (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="Stop the process if it is not ready after this many seconds (default: 120)")
+    parser.add_argument("--linger", type=float, default=2.0,
+                        help="Seconds to keep sampling after the ready line (default: 2)")
+    parser.add_argument("--keep-running", action="store_true",
+                        help="Keep sampling until the process exits instead of stopping after --linger")
+    parser.add_argument("--label", help="Name of the configuration being profiled")
+    parser.add_argument("--output", type=Path,
+                        help="Timeline file (default: ~/.cache/TurboLoaderV3/launch_profiles/<time>.json)")
+    parser.add_argument("--echo", action="store_true", help="Print the process output as it arrives")
+    parser.add_argument("--record", action="store_true",
+                        help="Append startup time, RSS and bytes read at ready to the metrics ring buffer")
+    parser.add_argument("--show", nargs="+", type=Path, metavar="TIMELINE",
+                        help="Compare saved timelines instead of launching anything")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+    
+    if args.show:
+        timelines = [(path, load_timeline(path)) for path in args.show]
+        if args.json:
+            print(json.dumps([dict(timeline["summary"], file=str(path), label=timeline["label"],
+                                   time_to_ready=timeline["time_to_ready"])
+                              for path, timeline in timelines], indent=2))
+        else:
+            for path, timeline in timelines:
+                print(describe(timeline, timeline["label"] or path.stem))
+        return 0
+    
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    command = args.command
+    if not command:
+        executable = find_dungeondraft()
+        if not executable:
+            parser.error("Dungeondraft was not found; pass the command to launch after --")
+        command = [str(executable)]
+    
+    try:
+        timeline = profile_launch(command, args.ready_pattern, args.interval, args.timeout,
+                                  None if args.keep_running else args.linger, args.log_file,
+                                  echo=args.echo, label=args.label, idle_ready=args.idle_ready)
+    except (OSError, RuntimeError) as e:
+        print(f"FAIL Could not profile {' '.join(command)}: {e}")
+        return 1
+    
+    output = args.output or default_directory / time.strftime(
+        f"%Y%m%d_%H%M%S{'_' + args.label if args.label else ''}.json", time.localtime(timeline["started"]))
+    save_timeline(timeline, output)
+    
+    at_ready = timeline["summary"].get("at_ready")
+    if args.record and record_metrics is not None and at_ready:
+        record_metrics({"startup_ms": timeline["time_to_ready"] * 1000, "rss_mb": at_ready["rss_mb"],
+                        "process_bytes_read": at_ready["read_bytes"]})
+    
+    if args.json:
+        print(json.dumps(dict(timeline["summary"], time_to_ready=timeline["time_to_ready"],
+                              exit_code=timeline["exit_code"], timeline=str(output)), indent=2))
+    else:
+        print("Turbo Loader v3 - Launch Profiler")
+        print("=" * 55)
+        marker = "PASS" if timeline["time_to_ready"] is not None else "FAIL"
+        print(f"{marker} {describe(timeline, args.label or Path(command[0]).name)}")
+        summary = timeline["summary"]
+        if summary["samples"]:
+            print(f"      Peak RSS {summary['peak_rss_mb']} MB, peak CPU {summary['peak_cpu_percent']}%, "
+                  f"{summary['max_processes']} processes, sampled every {summary['mean_interval_ms']} ms "
+                  f"(worst gap {summary['max_interval_ms']} ms)")
+        if timeline["time_to_ready"] is None:
+            reason = "timed out" if timeline["timed_out"] else f"exited with code {timeline['exit_code']}"
+            print(f"      Ready line never appeared: {reason}")
+        print(f"      Timeline: {output}")
+    
+    return 0 if timeline["time_to_ready"] is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
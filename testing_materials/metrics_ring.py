@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Metrics Ring Buffer
+Fixed-size, memory-mapped binary history of timestamped performance metrics,
+the on-disk counterpart of the plugin's PerformanceMonitor, with a report of
+percentiles over time windows
+"""
+
+import os
+import sys
+import argparse
+import json
+import mmap
+import re
+import statistics
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+MAGIC = b"TLV3RING"
+RING_FORMAT = 1
+
+# Header: magic, format, record size, capacity, records ever written; padded to 64 bytes
+HEADER_FORMAT = "<8sHHIQ"
+HEADER_SIZE = 64
+INDEX_OFFSET = 16
+
+# Record: sequence number, metric id, reserved, unix timestamp, value
+RECORD_FORMAT = "<IHHdd"
+RECORD_BODY_FORMAT = "<HHdd"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+SEQUENCE_MASK = 0xFFFFFFFF
+
+# 131072 records of 24 bytes is 3 MB: a year of a dozen launches a day, each recording every metric
+DEFAULT_CAPACITY = 131072
+
+# Recorded metrics: id in the file and display unit. Ids are stored on disk, so never reuse one.
+# cache_hit_rate and pack_bytes_read are reserved for the loader's own counters; the launch
+# profiler can only see process_bytes_read, everything the launched process tree read, and
+# inventory_cache_hit_rate is the share of mod_inventory.py entries served from its parse cache
+METRICS = {
+    "startup_ms": (1, "ms"),
+    "rss_mb": (2, "MB"),
+    "cache_hit_rate": (3, "ratio"),
+    "pack_bytes_read": (4, "bytes"),
+    "process_bytes_read": (5, "bytes"),
+    "inventory_cache_hit_rate": (6, "ratio")
+}
+METRIC_NAMES = {metric_id: name for name, (metric_id, _) in METRICS.items()}
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+class MetricsFormatError(Exception):
+    """Raised when a metrics file exists but is not a ring buffer this version can read"""
+
+def default_metrics_path() -> Path:
+    default_path = Path.home() / ".cache" / "TurboLoaderV3" / "metrics.ring"
+    return Path(os.environ.get("TURBOLOADER_METRICS_PATH", default_path))
+
+class MetricsRing:
+    """Memory-mapped ring buffer of (timestamp, metric, value) records
+    
+    The file is created at its full size, so appending never grows it. Writers
+    take a non-blocking lock and drop the sample if another process holds it,
+    so append() never waits. Each record carries the sequence number of its
+    write; readers skip slots whose number does not match, which covers records
+    being rewritten while they read and those already overwritten.
+    """
+    
+    def __init__(self, path: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY, readonly: bool = False):
+        self.path = Path(path) if path else default_metrics_path()
+        self.readonly = readonly
+        self.dropped = 0
+        self._file = None
+        self._map = None
+        
+        if readonly:
+            self._file = open(self.path, 'rb')
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a+b')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._create(capacity)
+        
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE)
+            magic, ring_format, record_size, self.capacity, _ = struct.unpack_from(HEADER_FORMAT, self._map)
+            if magic != MAGIC or ring_format != RING_FORMAT or record_size != RECORD_SIZE:
+                raise MetricsFormatError(f"{self.path} is not a format {RING_FORMAT} metrics ring")
+            if len(self._map) < HEADER_SIZE + self.capacity * RECORD_SIZE:
+                raise MetricsFormatError(f"{self.path} is truncated")
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise MetricsFormatError(f"{self.path} is not a metrics ring: {e}")
+        except BaseException:
+            self.close()
+            raise
+    
+    def _create(self, capacity: int):
+        """Write the header and size the file, unless another process got there first"""
+        self._lock(blocking=True)
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                header = struct.pack(HEADER_FORMAT, MAGIC, RING_FORMAT, RECORD_SIZE, capacity, 0)
+                self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+                self._file.flush()
+                # Left sparse: unwritten slots cost no disk space
+                self._file.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+        finally:
+            self._unlock()
+    
+    def _lock(self, blocking: bool = False) -> bool:
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                return True
+            except BlockingIOError:
+                return False
+        if msvcrt is not None:
+            self._file.seek(0)
+            try:
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                return False
+        return True
+    
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    @property
+    def written(self) -> int:
+        """Records ever appended, including those since overwritten"""
+        return struct.unpack_from("<Q", self._map, INDEX_OFFSET)[0]
+    
+    def append_many(self, values: Dict[str, float], timestamp: Optional[float] = None) -> bool:
+        """Append several metrics with one timestamp; False if the sample was dropped"""
+        ids = []
+        for name, value in values.items():
+            if name not in METRICS:
+                raise ValueError(f"unknown metric {name!r}; known metrics: {', '.join(METRICS)}")
+            ids.append((METRICS[name][0], float(value)))
+        timestamp = time.time() if timestamp is None else timestamp
+        
+        if not self._lock():
+            self.dropped += 1
+            return False
+        try:
+            index = self.written
+            for metric_id, value in ids:
+                offset = HEADER_SIZE + (index % self.capacity) * RECORD_SIZE
+                # Clear the sequence first, so readers never pair the new number with the old record
+                struct.pack_into("<I", self._map, offset, 0)
+                struct.pack_into(RECORD_BODY_FORMAT, self._map, offset + 4,
+                                 metric_id, 0, timestamp, value)
+                struct.pack_into("<I", self._map, offset, (index + 1) & SEQUENCE_MASK)
+                index += 1
+            struct.pack_into("<Q", self._map, INDEX_OFFSET, index)
+        finally:
+            self._unlock()
+        return True
+    
+    def append(self, metric: str, value: float, timestamp: Optional[float] = None) -> bool:
+        return self.append_many({metric: value}, timestamp)
+    
+    def records(self, since: Optional[float] = None, until: Optional[float] = None,
+                metrics: Optional[List[str]] = None) -> Iterator[Tuple[float, str, float]]:
+        """Stored records, oldest first, as (timestamp, metric, value)"""
+        wanted = {METRICS[name][0] for name in metrics} if metrics else None
+        written = self.written
+        # One copy of the slots, so a busy writer cannot shift them while they are decoded
+        slots = list(struct.iter_unpack(RECORD_FORMAT,
+                                        self._map[HEADER_SIZE:HEADER_SIZE + self.capacity * RECORD_SIZE]))
+        
+        for index in range(max(0, written - self.capacity), written):
+            sequence, metric_id, _, timestamp, value = slots[index % self.capacity]
+            if sequence != (index + 1) & SEQUENCE_MASK or metric_id not in METRIC_NAMES:
+                continue
+            if wanted is not None and metric_id not in wanted:
+                continue
+            if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+                continue
+            yield timestamp, METRIC_NAMES[metric_id], value
+    
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> "MetricsRing":
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+def record_metrics(values: Dict[str, float], path: Optional[Path] = None) -> bool:
+    """Append one sample without ever raising, for callers where metrics are optional"""
+    try:
+        with MetricsRing(path) as ring:
+            return ring.append_many(values)
+    except (OSError, ValueError, MetricsFormatError):
+        return False
+
+def parse_duration(text: str) -> float:
+    """Seconds in a duration such as 90s, 15m, 6h, 1d or 2w"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", text.lower())
+    if not match:
+        raise ValueError(f"invalid duration {text!r}; use a number followed by s, m, h, d or w")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+def window_start(timestamp: float, window: float) -> float:
+    """Start of the window holding timestamp, aligned to local midnight for day-sized windows"""
+    offset = time.localtime(timestamp).tm_gmtoff
+    return (timestamp + offset) // window * window - offset
+
+def summarize_windows(records: List[Tuple[float, str, float]], window: float,
+                      percentiles: List[int]) -> Dict[str, List[Dict]]:
+    """Per metric, per window: count, the requested percentiles, min and max"""
+    grouped: Dict[str, Dict[float, List[float]]] = {}
+    for timestamp, metric, value in records:
+        grouped.setdefault(metric, {}).setdefault(window_start(timestamp, window), []).append(value)
+    
+    summary = {}
+    for metric in METRICS:
+        if metric not in grouped:
+            continue
+        rows = []
+        for start, values in sorted(grouped[metric].items()):
+            # Inclusive quantiles interpolate linearly between the observed values; p0 and p100 are the extremes
+            cuts = [min(values)] + (statistics.quantiles(values, n=100, method="inclusive")
+                                    if len(values) > 1 else values * 99) + [max(values)]
+            row = {"start": start, "count": len(values), "min": min(values), "max": max(values)}
+            for percent in percentiles:
+                row[f"p{percent}"] = cuts[percent]
+            rows.append(row)
+        summary[metric] = rows
+    return summary
+
+def window_label(start: float, window: float) -> str:
+    pattern = "%Y-%m-%d" if window >= 86400 else "%Y-%m-%d %H:%M"
+    return time.strftime(pattern, time.localtime(start))
+
+def print_report(summary: Dict[str, List[Dict]], window: float, percentiles: List[int]):
+    print("Turbo Loader v3 - Metrics Report")
+    print("=" * 55)
+    if not summary:
+        print("No metrics recorded in this period")
+        return
+    columns = [f"p{percent}" for percent in percentiles]
+    for metric, rows in summary.items():
+        print()
+        print(f"{metric} ({METRICS[metric][1]})")
+        print(f"{'Window':<17} {'Count':>6} " + " ".join(f"{column:>12}" for column in columns) + f" {'max':>12}")
+        for row in rows:
+            print(f"{window_label(row['start'], window):<17} {row['count']:>6} "
+                  + " ".join(f"{row[column]:>12.6g}" for column in columns) + f" {row['max']:>12.6g}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Turbo Loader v3 - Metrics Ring Buffer",
+        epilog="Examples: metrics_ring.py --window 1d --since 30d; "
+               "metrics_ring.py --record startup_ms=1840 rss_mb=412")
+    parser.add_argument("--path", type=Path, default=default_metrics_path(),
+                        help="Ring buffer file (default: ~/.cache/TurboLoaderV3/metrics.ring)")
+    parser.add_argument("--record", nargs="+", metavar="METRIC=VALUE",
+                        help=f"Append one sample instead of reporting; metrics: {', '.join(METRICS)}")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help=f"Records kept when a new file is created (default: {DEFAULT_CAPACITY})")
+    parser.add_argument("--window", default="1d", help="Report window size, e.g. 1h, 1d, 1w (default: 1d)")
+    parser.add_argument("--since", default="30d", help="How far back to report (default: 30d)")
+    parser.add_argument("--metric", action="append", choices=list(METRICS), help="Only report this metric")
+    parser.add_argument("--percentiles", default="50,90,99",
+                        help="Comma-separated whole percentiles to report (default: 50,90,99)")
+    parser.add_argument("--info", action="store_true", help="Show the file's capacity and usage")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if args.record:
+        values = {}
+        for item in args.record:
+            name, _, value = item.partition("=")
+            if name not in METRICS:
+                parser.error(f"unknown metric {name!r}; known metrics: {', '.join(METRICS)}")
+            try:
+                values[name] = float(value)
+            except ValueError:
+                parser.error(f"{item!r} is not METRIC=VALUE")
+        if args.capacity < 1:
+            parser.error("--capacity must be positive")
+        try:
+            with MetricsRing(args.path, args.capacity) as ring:
+                recorded = ring.append_many(values)
+        except (OSError, MetricsFormatError) as e:
+            print(f"FAIL Could not record metrics: {e}")
+            return 1
+        print(f"{'PASS Recorded' if recorded else 'WARN Dropped, the ring was busy:'} "
+              f"{', '.join(f'{name}={value:g}' for name, value in values.items())}")
+        return 0 if recorded else 1
+    
+    try:
+        window = parse_duration(args.window)
+        since = time.time() - parse_duration(args.since)
+        percentiles = [int(part) for part in args.percentiles.split(",") if part.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+    if not percentiles or any(not 0 <= percent <= 100 for percent in percentiles):
+        parser.error("--percentiles must be whole numbers from 0 to 100")
+    
+    if not args.path.exists():
+        records, capacity, written = [], None, 0
+    else:
+        try:
+            with MetricsRing(args.path, readonly=True) as ring:
+                records = list(ring.records(since=since, metrics=args.metric))
+                capacity, written = ring.capacity, ring.written
+        except (OSError, MetricsFormatError) as e:
+            print(f"FAIL Could not read metrics: {e}")
+            return 1
+    
+    if args.info:
+        stored = min(written, capacity or 0)
+        info = {"path": str(args.path), "capacity": capacity, "written": written, "stored": stored,
+                "file_bytes": HEADER_SIZE + (capacity or 0) * RECORD_SIZE if capacity else 0}
+        if args.json:
+            print(json.dumps(info, indent=2))
+        else:
+            print(f"{info['path']}: {stored}/{capacity or 0} records stored, {written} written, "
+                  f"{info['file_bytes'] / 1024 ** 2:.1f} MB")
+        return 0
+    
+    summary = summarize_windows(records, window, percentiles)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary, window, percentiles)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
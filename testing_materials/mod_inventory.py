@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Mods Folder Inventory
+Parses every .ddmod and .dungeondraft_pack in a mods folder and reports
+duplicate IDs, version skew and file-override collisions
+"""
+
+import os
+import sys
+import argparse
+import json
+import re
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from metrics_ring import record_metrics
+except ImportError:
+    record_metrics = None
+
+GDPC_MAGIC = b"GDPC"
+
+# Pack manifests live at res://packs/<id>.json (older packs use res://packs/<id>/pack.json)
+PACK_MANIFEST_PATTERN = re.compile(r"^res://packs/([^/]+?)(?:\.json|/pack\.json)$")
+
+MAX_PACK_MANIFEST_SIZE = 1024 * 1024
+
+class PackFormatError(Exception):
+    """Raised when a .dungeondraft_pack is not a readable GDPC archive"""
+
+def read_pack_index(path: Path) -> Tuple[Dict, List[Dict]]:
+    """Read a GDPC header and file table without touching the file data"""
+    with open(path, 'rb') as f:
+        header = f.read(20)
+        if len(header) < 20 or header[:4] != GDPC_MAGIC:
+            raise PackFormatError("missing GDPC header")
+        
+        pack_format, major, minor, patch = struct.unpack("<4I", header[4:20])
+        file_base = 0
+        if pack_format >= 2:
+            # Godot 4 packs add flags and a base offset for file data
+            flags, file_base = struct.unpack("<IQ", f.read(12))
+            if flags & 1:
+                raise PackFormatError("encrypted packs are not supported")
+        elif pack_format != 1:
+            raise PackFormatError(f"unsupported pack format {pack_format}")
+        
+        f.read(16 * 4)  # Reserved
+        raw_count = f.read(4)
+        if len(raw_count) < 4:
+            raise PackFormatError("truncated file table")
+        file_count = struct.unpack("<I", raw_count)[0]
+        
+        entries = []
+        for _ in range(file_count):
+            raw_length = f.read(4)
+            if len(raw_length) < 4:
+                raise PackFormatError("truncated file table")
+            path_length = struct.unpack("<I", raw_length)[0]
+            raw_path = f.read(path_length)
+            record = f.read(32 if pack_format == 1 else 36)
+            if len(raw_path) < path_length or len(record) < 32:
+                raise PackFormatError("truncated file table")
+            
+            offset, size = struct.unpack("<QQ", record[:16])
+            entries.append({
+                "path": raw_path.rstrip(b"\0").decode("utf-8", "replace"),
+                "offset": file_base + offset,
+                "size": size
+            })
+    
+    pack_info = {
+        "pack_format": pack_format,
+        "godot_version": f"{major}.{minor}.{patch}"
+    }
+    return pack_info, entries
+
+def read_pack(path: Path) -> Dict:
+    """Read a pack's file table and its embedded pack manifest"""
+    pack_info, entries = read_pack_index(path)
+    manifest = {}
+    manifest_id = None
+    
+    for entry in entries:
+        match = PACK_MANIFEST_PATTERN.match(entry["path"])
+        if not match or entry["size"] > MAX_PACK_MANIFEST_SIZE:
+            continue
+        with open(path, 'rb') as f:
+            f.seek(entry["offset"])
+            try:
+                manifest = json.loads(f.read(entry["size"]).decode("utf-8-sig"))
+            except ValueError:
+                manifest = {}
+        manifest_id = match.group(1)
+        break
+    
+    return {
+        "kind": "pack",
+        "id": manifest.get("id") or manifest_id,
+        "name": manifest.get("name"),
+        "version": manifest.get("version"),
+        "author": manifest.get("author"),
+        "format": pack_info,
+        "files": [entry["path"] for entry in entries]
+    }
+
+def read_ddmod(path: Path) -> Dict:
+    """Read a .ddmod definition"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        mod_data = json.load(f)
+    
+    return {
+        "kind": "mod",
+        "id": mod_data.get("unique_id"),
+        "name": mod_data.get("name"),
+        "version": mod_data.get("version"),
+        "author": mod_data.get("author"),
+        "dd_version": mod_data.get("dd_version"),
+        "dependencies": mod_data.get("dependencies", [])
+    }
+
+class ModInventory:
+    """Cached inventory of every mod and asset pack below a mods folder"""
+    
+    EXTENSIONS = {".ddmod": read_ddmod, ".dungeondraft_pack": read_pack}
+    
+    def __init__(self, mods_folder: Path, cache_path: Optional[Path] = None, workers: int = 16):
+        self.mods_folder = Path(mods_folder).expanduser()
+        default_path = Path.home() / ".cache" / "TurboLoaderV3" / "mod_inventory.json"
+        self.cache_path = cache_path or Path(os.environ.get("TURBOLOADER_INVENTORY_CACHE", default_path))
+        self.workers = workers
+        self.entries: List[Dict] = []
+        self.cache_hits = 0
+        self._cache: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _load_cache(self):
+        """Read the parsed-entry cache, keyed by path and (size, mtime_ns)"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                self._cache = json.load(f)
+        except (OSError, ValueError):
+            self._cache = {}
+    
+    def _save_cache(self):
+        """Write the cache atomically, replacing this folder's entries and keeping other folders'"""
+        # Re-read so entries another folder's scan saved in the meantime survive
+        self._load_cache()
+        prefix = os.path.join(str(self.mods_folder), "")
+        entries = {path: entry for path, entry in self._cache.items() if not path.startswith(prefix)}
+        entries.update((entry["path"], entry) for entry in self.entries)
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(temp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass  # The cache is only an optimisation
+    
+    def _find_files(self) -> List[Tuple[str, os.stat_result]]:
+        """Walk the mods folder with scandir, collecting mod and pack files"""
+        found = []
+        pending = [str(self.mods_folder)]
+        
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in self.EXTENSIONS:
+                            found.append((entry.path, entry.stat()))
+            except OSError:
+                continue
+        
+        return sorted(found)
+    
+    def _parse(self, item: Tuple[str, os.stat_result]) -> Dict:
+        """Parse one file, reusing the cached result while its stat key is unchanged"""
+        path, st = item
+        key = [st.st_size, st.st_mtime_ns]
+        
+        cached = self._cache.get(path)
+        if cached and cached.get("key") == key:
+            with self._lock:
+                self.cache_hits += 1
+            return cached
+        
+        reader = self.EXTENSIONS[os.path.splitext(path)[1].lower()]
+        try:
+            entry = reader(Path(path))
+        except (OSError, ValueError, PackFormatError, struct.error) as e:
+            entry = {"kind": "pack" if reader is read_pack else "mod", "id": None, "error": str(e)}
+        
+        entry["path"] = path
+        entry["key"] = key
+        return entry
+    
+    def scan(self) -> List[Dict]:
+        """Parse every mod and pack in parallel"""
+        self._load_cache()
+        self.cache_hits = 0
+        files = self._find_files()
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            self.entries = list(executor.map(self._parse, files))
+        
+        self._save_cache()
+        return self.entries
+    
+    def conflicts(self) -> Dict[str, List[Dict]]:
+        """Index duplicate IDs, version skew and file-override collisions in one pass"""
+        by_id: Dict[Tuple[str, str], List[Dict]] = {}
+        by_file: Dict[str, List[str]] = {}
+        errors = []
+        
+        for entry in self.entries:
+            if entry.get("error"):
+                errors.append({"path": entry["path"], "error": entry["error"]})
+                continue
+            if entry.get("id"):
+                by_id.setdefault((entry["kind"], entry["id"]), []).append(entry)
+            for file_path in entry.get("files", []):
+                # The pack's own manifest is expected to be unique per pack
+                if not PACK_MANIFEST_PATTERN.match(file_path):
+                    by_file.setdefault(file_path, []).append(entry["path"])
+        
+        duplicate_ids = []
+        version_skew = []
+        for (kind, entry_id), copies in sorted(by_id.items()):
+            if len(copies) < 2:
+                continue
+            versions = sorted({str(copy.get("version")) for copy in copies})
+            report = {
+                "kind": kind,
+                "id": entry_id,
+                "versions": versions,
+                "paths": [copy["path"] for copy in copies]
+            }
+            (version_skew if len(versions) > 1 else duplicate_ids).append(report)
+        
+        collisions = [
+            {"file": file_path, "packs": sorted(paths)}
+            for file_path, paths in sorted(by_file.items())
+            if len(paths) > 1
+        ]
+        
+        return {
+            "duplicate_ids": duplicate_ids,
+            "version_skew": version_skew,
+            "file_collisions": collisions,
+            "unreadable": errors
+        }
+    
+    def report(self) -> Dict:
+        """Inventory plus conflict index, as written by --json"""
+        mods = [entry for entry in self.entries if entry["kind"] == "mod"]
+        packs = [entry for entry in self.entries if entry["kind"] == "pack"]
+        
+        return {
+            "mods_folder": str(self.mods_folder),
+            "summary": {
+                "mods": len(mods),
+                "packs": len(packs),
+                "pack_files": sum(len(entry.get("files", [])) for entry in packs),
+                "cache_hits": self.cache_hits
+            },
+            "conflicts": self.conflicts(),
+            "entries": [
+                {key: value for key, value in entry.items() if key not in ("files", "key")}
+                for entry in self.entries
+            ]
+        }
+
+def print_report(report: Dict):
+    """Human-readable inventory summary"""
+    summary = report["summary"]
+    conflicts = report["conflicts"]
+    
+    print("Turbo Loader v3 - Mods Folder Inventory")
+    print("=" * 55)
+    print(f"Mods Folder: {report['mods_folder']}")
+    print(f"Mods: {summary['mods']}  Packs: {summary['packs']}  "
+          f"Pack files: {summary['pack_files']}  Cached: {summary['cache_hits']}")
+    print()
+    
+    for duplicate in conflicts["duplicate_ids"]:
+        print(f"WARN  Duplicate {duplicate['kind']} ID {duplicate['id']} ({len(duplicate['paths'])} copies)")
+        for path in duplicate["paths"]:
+            print(f"      {path}")
+    
+    for skew in conflicts["version_skew"]:
+        print(f"WARN  Version skew for {skew['kind']} {skew['id']}: {', '.join(skew['versions'])}")
+        for path in skew["paths"]:
+            print(f"      {path}")
+    
+    for collision in conflicts["file_collisions"][:50]:
+        print(f"WARN  {collision['file']} is overridden by {len(collision['packs'])} packs")
+        for path in collision["packs"]:
+            print(f"      {path}")
+    if len(conflicts["file_collisions"]) > 50:
+        print(f"      ... {len(conflicts['file_collisions']) - 50} more collisions (use --json for all)")
+    
+    for error in conflicts["unreadable"]:
+        print(f"FAIL Could not read {error['path']}: {error['error']}")
+    
+    if not any(conflicts.values()):
+        print("PASS No conflicts found")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Mods Folder Inventory")
+    parser.add_argument("mods_folder", nargs="?", type=Path,
+                        default=Path.home() / "Documents" / "Dungeondraft Mods",
+                        help="Mods folder to scan (default: ~/Documents/Dungeondraft Mods)")
+    parser.add_argument("--workers", type=int, default=16,
+                        help="Files parsed concurrently (default: 16)")
+    parser.add_argument("--cache", type=Path,
+                        help="Inventory cache file (default: ~/.cache/TurboLoaderV3/mod_inventory.json)")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the full inventory as JSON")
+    parser.add_argument("--record", action="store_true",
+                        help="Append the inventory cache hit rate to the metrics ring buffer")
+    args = parser.parse_args()
+    
+    if not args.mods_folder.is_dir():
+        print(f"FAIL Mods folder not found: {args.mods_folder}")
+        sys.exit(1)
+    
+    start_time = time.time()
+    inventory = ModInventory(args.mods_folder, args.cache, args.workers)
+    inventory.scan()
+    report = inventory.report()
+    report["summary"]["duration_seconds"] = round(time.time() - start_time, 3)
+    
+    if args.record and record_metrics is not None and inventory.entries:
+        record_metrics({"inventory_cache_hit_rate": inventory.cache_hits / len(inventory.entries)})
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+        print(f"\nScanned in {report['summary']['duration_seconds']}s")
+    
+    conflicts = report["conflicts"]
+    sys.exit(1 if conflicts["duplicate_ids"] or conflicts["version_skew"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Release Patch Generator
+Builds per-file binary deltas (bsdiff-style) between two release trees so
+upgrades only transfer and write what changed
+"""
+
+import os
+import sys
+import argparse
+import bz2
+import hashlib
+import json
+import struct
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PATCH_FORMAT = 1
+
+DELTA_MAGIC = b"TLDIFF1\0"
+
+# Bytes hashed to find candidate matches in the old file
+BLOCK_SIZE = 8
+
+# How far an approximate match may run past its best score before giving up
+LOOKAHEAD = 256
+
+# (extra_len, old_offset, diff_len) per control entry
+CONTROL_ENTRY = struct.Struct("<IQI")
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be applied to the target tree"""
+
+def _extend_match(old: bytes, old_pos: int, new: bytes, new_pos: int) -> int:
+    """Length of the best approximate match, scored like bsdiff: 2 * equal bytes - length"""
+    limit = min(len(old) - old_pos, len(new) - new_pos)
+    
+    # Skip over the exact part of the match in chunks
+    length = 0
+    while (length + 64 <= limit
+           and old[old_pos + length:old_pos + length + 64] == new[new_pos + length:new_pos + length + 64]):
+        length += 64
+    
+    equal = length
+    best_score = length
+    best_length = length
+    for offset in range(length, limit):
+        if old[old_pos + offset] == new[new_pos + offset]:
+            equal += 1
+        score = 2 * equal - (offset + 1)
+        if score > best_score:
+            best_score = score
+            best_length = offset + 1
+        elif offset + 1 - best_length > LOOKAHEAD:
+            break
+    
+    return best_length
+
+def make_delta(old: bytes, new: bytes) -> bytes:
+    """Encode new as copy-with-difference regions of old plus literal extra bytes"""
+    index: Dict[bytes, int] = {}
+    for position in range(len(old) - BLOCK_SIZE + 1):
+        index.setdefault(old[position:position + BLOCK_SIZE], position)
+    
+    controls = []
+    diff = bytearray()
+    extra = bytearray()
+    last = 0
+    new_pos = 0
+    
+    while new_pos <= len(new) - BLOCK_SIZE:
+        old_pos = index.get(new[new_pos:new_pos + BLOCK_SIZE])
+        if old_pos is None:
+            new_pos += 1
+            continue
+        
+        # Pull the match backwards over bytes that would otherwise be literal
+        while new_pos > last and old_pos > 0 and old[old_pos - 1] == new[new_pos - 1]:
+            old_pos -= 1
+            new_pos -= 1
+        
+        length = _extend_match(old, old_pos, new, new_pos)
+        extra += new[last:new_pos]
+        diff += bytes((new[new_pos + k] - old[old_pos + k]) & 0xFF for k in range(length))
+        controls.append((new_pos - last, old_pos, length))
+        
+        new_pos += length
+        last = new_pos
+    
+    if last < len(new):
+        extra += new[last:]
+        controls.append((len(new) - last, 0, 0))
+    
+    control = b"".join(CONTROL_ENTRY.pack(*entry) for entry in controls)
+    sections = [bz2.compress(bytes(section)) for section in (control, diff, extra)]
+    header = DELTA_MAGIC + struct.pack("<QIII", len(new), *(len(section) for section in sections))
+    return header + b"".join(sections)
+
+def apply_delta(old: bytes, delta: bytes) -> bytes:
+    """Rebuild the new file from the old file and a make_delta() result"""
+    if not delta.startswith(DELTA_MAGIC):
+        raise PatchError("Not a Turbo Loader delta")
+    
+    header_size = len(DELTA_MAGIC) + 20
+    new_size, *section_sizes = struct.unpack("<QIII", delta[len(DELTA_MAGIC):header_size])
+    sections = []
+    offset = header_size
+    for size in section_sizes:
+        sections.append(bz2.decompress(delta[offset:offset + size]))
+        offset += size
+    control, diff, extra = sections
+    
+    new = bytearray()
+    diff_pos = 0
+    extra_pos = 0
+    for extra_len, old_pos, diff_len in CONTROL_ENTRY.iter_unpack(control):
+        new += extra[extra_pos:extra_pos + extra_len]
+        extra_pos += extra_len
+        
+        if old_pos + diff_len > len(old):
+            raise PatchError("Delta refers past the end of the original file")
+        
+        # Most difference bytes are zero, so copy the old bytes and fix up the rest
+        start = len(new)
+        new += old[old_pos:old_pos + diff_len]
+        region = diff[diff_pos:diff_pos + diff_len]
+        if region.count(0) != diff_len:
+            for k, value in enumerate(region):
+                if value:
+                    new[start + k] = (new[start + k] + value) & 0xFF
+        diff_pos += diff_len
+    
+    if len(new) != new_size:
+        raise PatchError(f"Delta produced {len(new)} bytes, expected {new_size}")
+    return bytes(new)
+
+def read_release_tree(source: Path) -> Dict[str, bytes]:
+    """Load a release from a directory or zip, dropping a shared top-level folder"""
+    files: Dict[str, bytes] = {}
+    
+    if source.is_dir():
+        for file_path in sorted(source.rglob("*")):
+            if file_path.is_file():
+                files[file_path.relative_to(source).as_posix()] = file_path.read_bytes()
+    else:
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    files[info.filename] = zf.read(info)
+    
+    # Manual packages wrap everything in TurboLoaderV3/
+    roots = {name.split("/", 1)[0] for name in files}
+    if len(roots) == 1 and all("/" in name for name in files):
+        prefix = roots.pop() + "/"
+        files = {name[len(prefix):]: content for name, content in files.items()}
+    
+    return files
+
+def release_version(files: Dict[str, bytes]) -> Optional[str]:
+    """Version from the tree's .ddmod, if it has one"""
+    try:
+        return json.loads(files["TurboLoaderV3.ddmod"].decode("utf-8-sig")).get("version")
+    except (KeyError, ValueError):
+        return None
+
+def create_patch(old_files: Dict[str, bytes], new_files: Dict[str, bytes], output: Path) -> Dict:
+    """Write a patch archive: patch.json plus one delta or full copy per changed file"""
+    index = {
+        "format": PATCH_FORMAT,
+        "from_version": release_version(old_files),
+        "to_version": release_version(new_files),
+        "created": time.time(),
+        "files": {}
+    }
+    
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_STORED) as zf:
+        for name in sorted(set(old_files) | set(new_files)):
+            old = old_files.get(name)
+            new = new_files.get(name)
+            
+            if new is None:
+                index["files"][name] = {
+                    "action": "delete",
+                    "source_sha256": hashlib.sha256(old).hexdigest()
+                }
+                continue
+            
+            target_sha256 = hashlib.sha256(new).hexdigest()
+            if old == new:
+                continue
+            
+            full = bz2.compress(new)
+            entry = {"target_sha256": target_sha256, "size": len(new)}
+            
+            if old is not None:
+                delta = make_delta(old, new)
+                entry["source_sha256"] = hashlib.sha256(old).hexdigest()
+                if len(delta) < len(full):
+                    entry.update(action="patch", blob=f"files/{name}.delta", blob_size=len(delta))
+                    zf.writestr(entry["blob"], delta)
+                    index["files"][name] = entry
+                    continue
+            
+            entry.update(action="replace" if old is not None else "add",
+                         blob=f"files/{name}.bz2", blob_size=len(full))
+            zf.writestr(entry["blob"], full)
+            index["files"][name] = entry
+        
+        zf.writestr("patch.json", json.dumps(index, indent=2))
+    
+    return index
+
+def apply_patch(patch_path: Path, target_dir: Path, allowed: Optional[List[str]] = None,
+                log=print) -> List[str]:
+    """Apply a patch in place; every source is checked first and nothing is written on mismatch
+    
+    Files outside `allowed` (when given) are skipped. Returns the names that changed.
+    """
+    with zipfile.ZipFile(patch_path) as zf:
+        index = json.loads(zf.read("patch.json"))
+        if index.get("format") != PATCH_FORMAT:
+            raise PatchError(f"Unsupported patch format {index.get('format')}")
+        
+        # Build every new file in memory before touching the target
+        writes: Dict[str, bytes] = {}
+        deletes: List[str] = []
+        for name, entry in sorted(index["files"].items()):
+            if allowed is not None and name not in allowed:
+                log(f"Skipping {name} (not part of the plugin)")
+                continue
+            
+            if Path(name).is_absolute() or ".." in Path(name).parts:
+                raise PatchError(f"Unsafe path in patch: {name}")
+            
+            target = target_dir / name
+            old = target.read_bytes() if target.is_file() else None
+            if "source_sha256" in entry:
+                if old is None:
+                    raise PatchError(f"{name} is missing; this patch is for version {index.get('from_version')}")
+                if hashlib.sha256(old).hexdigest() != entry["source_sha256"]:
+                    raise PatchError(f"{name} does not match version {index.get('from_version')}")
+            
+            if entry["action"] == "delete":
+                deletes.append(name)
+                continue
+            
+            blob = zf.read(entry["blob"])
+            new = apply_delta(old, blob) if entry["action"] == "patch" else bz2.decompress(blob)
+            if hashlib.sha256(new).hexdigest() != entry["target_sha256"]:
+                raise PatchError(f"Patched {name} failed its checksum")
+            writes[name] = new
+    
+    for name, content in writes.items():
+        target = target_dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(content)
+        os.replace(temp_path, target)
+        log(f"Updated {name} ({len(content)} bytes)")
+    
+    for name in deletes:
+        (target_dir / name).unlink()
+        log(f"Removed {name}")
+    
+    return sorted(writes) + deletes
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Release Patch Generator")
+    parser.add_argument("old", type=Path, help="Previous release directory or zip")
+    parser.add_argument("new", type=Path, help="New release directory or zip")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="Patch file to write (default: TurboLoaderV3_<old>_to_<new>.tlpatch)")
+    args = parser.parse_args()
+    
+    start_time = time.time()
+    old_files = read_release_tree(args.old)
+    new_files = read_release_tree(args.new)
+    
+    output = args.output or Path(f"TurboLoaderV3_{release_version(old_files) or 'old'}_to_"
+                                 f"{release_version(new_files) or 'new'}.tlpatch")
+    index = create_patch(old_files, new_files, output)
+    
+    print("Turbo Loader v3 - Release Patch")
+    print("=" * 55)
+    for name, entry in index["files"].items():
+        size = f"{entry['blob_size']} of {entry['size']} bytes" if "blob_size" in entry else ""
+        print(f"   {entry['action']:<8} {name} {size}")
+    
+    new_size = sum(len(content) for content in new_files.values())
+    print(f"\nWrote {output} ({output.stat().st_size} bytes for a {new_size} byte release) "
+          f"in {time.time() - start_time:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
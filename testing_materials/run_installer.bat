@@ -1 +1,3 @@
-@echo off\npython TurboLoaderV3_Installer.py\npause
\ No newline at end of file
+@echo off
+python TurboLoaderV3_Installer.py
+pause
@@ -1 +1,2 @@
-#!/bin/bash\npython3 TurboLoaderV3_Installer.py
\ No newline at end of file
+#!/bin/bash
+python3 TurboLoaderV3_Installer.py
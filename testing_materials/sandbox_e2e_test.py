@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Sandboxed E2E Test - In-Process Installer Scenarios
+Runs the real InstallationEngine and QuickVerification against an isolated
+temporary HOME per scenario, in parallel, without Docker or network access
+"""
+
+import os
+import sys
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import TurboLoaderV3_Installer as installer
+from TurboLoaderV3_Installer import BundleReader, InstallationConfig, InstallationEngine
+from create_installer_package import plugin_manifest, write_bundle
+from release_patch import create_patch, read_release_tree
+from verify_installation import MANIFEST_NAME, QuickVerification
+
+SOURCE_DIR = Path(__file__).parent
+
+# Files a release ships for the plugin itself
+PLUGIN_FILES = ["TurboLoaderV3.ddmod", "main.gd", "README.md"]
+
+# Variables that could point a scenario outside its sandbox
+ISOLATED_VARIABLES = ["HOME", "USERPROFILE", "TURBOLOADER_HASH_CACHE", "TURBOLOADER_GDSCRIPT_CACHE",
+                      "TURBOLOADER_INVENTORY_CACHE", "TURBOLOADER_METRICS_PATH", "TURBOLOADER_PROFILE_DIR",
+                      "TURBOLOADER_BENCHMARK_HISTORY", "TURBOLOADER_TRACE_PATH"]
+
+# Cache locations inside each sandbox, so snapshots see anything a scenario caches
+SANDBOX_CACHES = {
+    "TURBOLOADER_HASH_CACHE": ".cache/TurboLoaderV3/hash_cache.json",
+    "TURBOLOADER_GDSCRIPT_CACHE": ".cache/TurboLoaderV3/gdscript_cache.json",
+    "TURBOLOADER_INVENTORY_CACHE": ".cache/TurboLoaderV3/mod_inventory.json",
+    "TURBOLOADER_METRICS_PATH": ".cache/TurboLoaderV3/metrics.ring",
+    "TURBOLOADER_PROFILE_DIR": ".cache/TurboLoaderV3/launch_profiles",
+    "TURBOLOADER_BENCHMARK_HISTORY": ".cache/TurboLoaderV3/benchmarks.jsonl",
+    "TURBOLOADER_TRACE_PATH": ".cache/TurboLoaderV3/install_trace.json"
+}
+
+class ScenarioFailure(AssertionError):
+    """Raised when a scenario's expectation does not hold"""
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise ScenarioFailure(message)
+
+def package_release(source_dir: Path):
+    """Write the integrity manifest the packager ships beside the plugin files"""
+    entries = [(file_name, source_dir / file_name) for file_name in PLUGIN_FILES
+               if (source_dir / file_name).exists()]
+    (source_dir / MANIFEST_NAME).write_text(plugin_manifest(entries, "", "3.0.0"))
+
+class Sandbox:
+    """A throwaway customer home directory"""
+    
+    def __init__(self, home: Path):
+        self.home = home
+        self.mods_folder = home / "Documents" / "Dungeondraft Mods"
+        self.plugin_dir = self.mods_folder / InstallationEngine.PLUGIN_DIR_NAME
+        self.log: List[str] = []
+        self.release_dir = self.copy_source("packaged_release")
+    
+    def engine(self, config: Optional[InstallationConfig] = None, source_dir: Optional[Path] = None,
+               bundle: Optional[BundleReader] = None) -> InstallationEngine:
+        """Installation engine that logs into the sandbox instead of stdout"""
+        return InstallationEngine(config or InstallationConfig(), source_dir or self.release_dir,
+                                  log=self.log.append, bundle=bundle)
+    
+    def verify(self, plugin_dir: Optional[Path] = None) -> Dict:
+        return QuickVerification(plugin_dir or self.plugin_dir, quiet=True).verify()
+    
+    def copy_source(self, name: str) -> Path:
+        """Private packaged copy of the release files, for scenarios that modify them"""
+        source_dir = self.home / name
+        source_dir.mkdir()
+        for file_name in PLUGIN_FILES:
+            shutil.copy2(SOURCE_DIR / file_name, source_dir / file_name)
+        package_release(source_dir)
+        return source_dir
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Size of every file in the sandbox, caches included, with -1 for directories"""
+        return {
+            path.relative_to(self.home).as_posix(): path.stat().st_size if path.is_file() else -1
+            for path in sorted(self.home.rglob("*"))
+        }
+
+def failed_checks(result: Dict) -> List[str]:
+    return [item["check"].strip() for item in result.get("checks", []) if not item["passed"]]
+
+def expect_verified(sandbox: Sandbox, plugin_dir: Optional[Path] = None):
+    result = sandbox.verify(plugin_dir)
+    check(result["success"], f"verification failed: {failed_checks(result) or result.get('error')}")
+
+SCENARIOS: Dict[str, Callable[[Sandbox], str]] = {}
+
+def scenario(function: Callable[[Sandbox], str]) -> Callable[[Sandbox], str]:
+    SCENARIOS[function.__name__[len("scenario_"):]] = function
+    return function
+
+@scenario
+def scenario_fresh_install(sandbox: Sandbox) -> str:
+    check(sandbox.engine().install(), "engine verification failed")
+    expect_verified(sandbox)
+    for file_name in PLUGIN_FILES + [MANIFEST_NAME, "config.json"]:
+        check((sandbox.plugin_dir / file_name).is_file(), f"{file_name} was not installed")
+    check(Path(os.environ["TURBOLOADER_TRACE_PATH"]).is_file(), "installation trace was not saved")
+    return f"{len(list(sandbox.plugin_dir.iterdir()))} files installed"
+
+@scenario
+def scenario_rebuilt_release_verifies(sandbox: Sandbox) -> str:
+    source_dir = sandbox.copy_source("edited_release")
+    with open(source_dir / "README.md", 'a') as f:
+        f.write("\n## Local notes\n")
+    package_release(source_dir)
+    
+    check(sandbox.engine(source_dir=source_dir).install(), "engine verification failed")
+    expect_verified(sandbox)
+    return "shipped manifest matched the rebuilt release"
+
+@scenario
+def scenario_rejects_files_changed_after_packaging(sandbox: Sandbox) -> str:
+    source_dir = sandbox.copy_source("edited_release")
+    with open(source_dir / "README.md", 'a') as f:
+        f.write("\n## Local notes\n")
+    
+    try:
+        sandbox.engine(source_dir=source_dir).install()
+    except ValueError as e:
+        check(not sandbox.plugin_dir.exists(), "plugin files written before the release was rejected")
+        return f"rejected: {e}"
+    raise ScenarioFailure("README.md edited after packaging was installed")
+
+@scenario
+def scenario_upgrade_keeps_backup(sandbox: Sandbox) -> str:
+    sandbox.plugin_dir.mkdir(parents=True)
+    (sandbox.plugin_dir / "TurboLoaderV3.ddmod").write_text('{"name": "Turbo Loader", "version": "2.0.0"}')
+    (sandbox.plugin_dir / "user_settings.txt").write_text("keep me")
+    
+    check(sandbox.engine().install(), "engine verification failed")
+    expect_verified(sandbox)
+    
+    backups = list(sandbox.mods_folder.glob(f"{InstallationEngine.PLUGIN_DIR_NAME}_backup_*"))
+    check(len(backups) == 1, f"expected one backup, found {len(backups)}")
+    check((backups[0] / "user_settings.txt").read_text() == "keep me", "backup lost user files")
+    return f"backed up to {backups[0].name}"
+
+@scenario
+def scenario_overwrite_without_backup(sandbox: Sandbox) -> str:
+    sandbox.plugin_dir.mkdir(parents=True)
+    (sandbox.plugin_dir / "main.gd").write_text("extends Node\n")
+    
+    config = InstallationConfig(backup_existing=False)
+    check(sandbox.engine(config).install(), "engine verification failed")
+    expect_verified(sandbox)
+    
+    backups = list(sandbox.mods_folder.glob(f"{InstallationEngine.PLUGIN_DIR_NAME}_backup_*"))
+    check(not backups, f"backup created although disabled: {backups}")
+    return "existing files replaced in place"
+
+@scenario
+def scenario_preserves_other_mods(sandbox: Sandbox) -> str:
+    other_mod = sandbox.mods_folder / "OtherMod"
+    other_mod.mkdir(parents=True)
+    (other_mod / "OtherMod.ddmod").write_text('{"name": "Other", "unique_id": "other"}')
+    before = {path.name: path.read_bytes() for path in other_mod.iterdir()}
+    
+    check(sandbox.engine().install(), "engine verification failed")
+    after = {path.name: path.read_bytes() for path in other_mod.iterdir()}
+    check(before == after, "installer modified another mod")
+    return "other mods untouched"
+
+@scenario
+def scenario_dry_run_touches_nothing(sandbox: Sandbox) -> str:
+    before = sandbox.snapshot()
+    operations = sandbox.engine().plan()
+    check(operations, "plan is empty")
+    check(sandbox.snapshot() == before, "planning changed the filesystem")
+    return f"{len(operations)} operations planned, nothing written"
+
+@scenario
+def scenario_answer_file_custom_folder(sandbox: Sandbox) -> str:
+    mods_folder = sandbox.home / "Custom Mods"
+    answer_file = sandbox.home / "answers.json"
+    answer_file.write_text(json.dumps({"mods_folder": str(mods_folder), "enable_analytics": False}))
+    
+    config = InstallationConfig.from_answer_file(answer_file)
+    check(sandbox.engine(config).install(), "engine verification failed")
+    
+    plugin_dir = mods_folder / InstallationEngine.PLUGIN_DIR_NAME
+    expect_verified(sandbox, plugin_dir)
+    check(not sandbox.mods_folder.exists(), "installed into the default folder as well")
+    check(json.loads((plugin_dir / "config.json").read_text())["analytics_enabled"] is False,
+          "answer file setting not applied")
+    return f"installed to {plugin_dir.relative_to(sandbox.home)}"
+
+@scenario
+def scenario_rejects_broken_script(sandbox: Sandbox) -> str:
+    if installer.GDScriptValidator is None:
+        return "skipped (gdscript_validator.py not importable)"
+    
+    source_dir = sandbox.copy_source("release")
+    with open(source_dir / "main.gd", 'a') as f:
+        f.write("\nfunc broken(:\n\tpass\n")
+    package_release(source_dir)
+    
+    try:
+        sandbox.engine(source_dir=source_dir).install()
+    except ValueError as e:
+        check(not sandbox.plugin_dir.exists(), "plugin files written before the script was rejected")
+        return f"rejected: {e}"
+    raise ScenarioFailure("broken main.gd was installed")
+
+@scenario
+def scenario_verify_checks_mod_scripts(sandbox: Sandbox) -> str:
+    if installer.GDScriptValidator is None:
+        return "skipped (gdscript_validator.py not importable)"
+    
+    check(sandbox.engine().install(), "engine verification failed")
+    other_mod = sandbox.mods_folder / "OtherMod"
+    (other_mod / "scripts").mkdir(parents=True)
+    (other_mod / "OtherMod.ddmod").write_text('{"name": "Other Mod"}')
+    script = other_mod / "scripts" / "tool.gd"
+    script.write_text("extends Node\n\nfunc _ready():\n\t._ready()\n")
+    expect_verified(sandbox)
+    
+    script.write_text("extends Node\n\nfunc _ready()\n\tpass\n")
+    result = sandbox.verify()
+    check(failed_checks(result) == ["GDScript Code"], f"unexpected failures: {failed_checks(result)}")
+    return "broken OtherMod/scripts/tool.gd failed verification"
+
+@scenario
+def scenario_rejects_missing_file(sandbox: Sandbox) -> str:
+    source_dir = sandbox.copy_source("release")
+    (source_dir / "TurboLoaderV3.ddmod").unlink()
+    
+    try:
+        sandbox.engine(source_dir=source_dir).plan()
+    except FileNotFoundError:
+        check(not sandbox.mods_folder.exists(), "files written before the release was rejected")
+        return "missing .ddmod rejected"
+    raise ScenarioFailure("release without a .ddmod was accepted")
+
+@scenario
+def scenario_detects_damage(sandbox: Sandbox) -> str:
+    check(sandbox.engine().install(), "engine verification failed")
+    
+    with open(sandbox.plugin_dir / "main.gd", 'a') as f:
+        f.write("\n# edited\n")
+    tampered = failed_checks(sandbox.verify())
+    check(tampered, "edited main.gd passed verification")
+    
+    (sandbox.plugin_dir / "config.json").unlink()
+    missing = failed_checks(sandbox.verify())
+    check("Required Files" in missing, f"missing config.json not reported: {missing}")
+    return f"tampering failed {', '.join(tampered)}"
+
+@scenario
+def scenario_bundle_install(sandbox: Sandbox) -> str:
+    bundle_path = sandbox.home / "bundle.zip"
+    entries = [(file_name, SOURCE_DIR / file_name) for file_name in PLUGIN_FILES]
+    entries.append((MANIFEST_NAME, plugin_manifest(entries, "", "3.0.0")))
+    write_bundle(bundle_path, {InstallationEngine.BUNDLE_COMPONENT: entries}, "3.0.0", 315532800)
+    
+    bundle = BundleReader(bundle_path)
+    try:
+        check(sandbox.engine(bundle=bundle).install(), "engine verification failed")
+    finally:
+        bundle.close()
+    expect_verified(sandbox)
+    return f"installed from a {bundle_path.stat().st_size} byte bundle"
+
+@scenario
+def scenario_patch_upgrade(sandbox: Sandbox) -> str:
+    check(sandbox.engine().install(), "engine verification failed")
+    
+    new_release = sandbox.copy_source("release_3_0_1")
+    with open(new_release / "README.md", 'a') as f:
+        f.write("\n## 3.0.1\n- Patch release\n")
+    package_release(new_release)
+    
+    patch_path = sandbox.home / "upgrade.tlpatch"
+    old_release = sandbox.copy_source("release_3_0_0")
+    create_patch(read_release_tree(old_release), read_release_tree(new_release), patch_path)
+    
+    check(sandbox.engine().apply_patch(patch_path), "patched installation failed verification")
+    check((sandbox.plugin_dir / "README.md").read_bytes() == (new_release / "README.md").read_bytes(),
+          "README.md was not patched")
+    expect_verified(sandbox)
+    return f"patched with {patch_path.stat().st_size} bytes"
+
+def run_scenario(name: str, keep: bool = False) -> Dict:
+    """Run one scenario with HOME pointing at a fresh temporary directory"""
+    home = Path(tempfile.mkdtemp(prefix=f"tlv3_e2e_{name}_"))
+    saved = {variable: os.environ.get(variable) for variable in ISOLATED_VARIABLES}
+    for variable in ISOLATED_VARIABLES:
+        os.environ.pop(variable, None)
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(home)
+    for variable, relative_path in SANDBOX_CACHES.items():
+        os.environ[variable] = str(home / relative_path)
+    
+    sandbox = Sandbox(home)
+    result = {"scenario": name, "home": str(home)}
+    start_time = time.perf_counter()
+    try:
+        result["detail"] = SCENARIOS[name](sandbox)
+        result["passed"] = True
+    except Exception as e:
+        result["passed"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["log"] = sandbox.log[-20:]
+    finally:
+        result["duration"] = round(time.perf_counter() - start_time, 4)
+        for variable, value in saved.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+        if not keep:
+            shutil.rmtree(home, ignore_errors=True)
+    
+    return result
+
+def run_scenarios(names: List[str], jobs: Optional[int] = None, keep: bool = False) -> List[Dict]:
+    """Run scenarios in worker processes, since HOME is per process; jobs=1 runs them here in turn"""
+    if jobs == 1:
+        return [run_scenario(name, keep) for name in names]
+    
+    with ProcessPoolExecutor(max_workers=jobs or min(len(names), os.cpu_count() or 1)) as executor:
+        return list(executor.map(run_scenario, names, [keep] * len(names)))
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Sandboxed E2E Test")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--jobs", type=int,
+                        help="Scenarios run concurrently (default: one per CPU; 1 runs in this process)")
+    parser.add_argument("--keep", action="store_true",
+                        help="Keep each scenario's temporary HOME for inspection")
+    parser.add_argument("--json", action="store_true",
+                        help="Print results as JSON")
+    args = parser.parse_args()
+    
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    
+    start_time = time.perf_counter()
+    results = run_scenarios(args.scenarios or list(SCENARIOS), args.jobs, args.keep)
+    duration = time.perf_counter() - start_time
+    passed = sum(result["passed"] for result in results)
+    
+    if args.json:
+        print(json.dumps({"results": results, "passed": passed, "total": len(results),
+                          "duration": round(duration, 3)}, indent=2))
+    else:
+        print("Turbo Loader v3 - Sandboxed E2E Test")
+        print("=" * 55)
+        for result in results:
+            if result["passed"]:
+                print(f"PASS {result['scenario']} ({result['duration'] * 1000:.0f} ms): {result['detail']}")
+            else:
+                print(f"FAIL {result['scenario']} ({result['duration'] * 1000:.0f} ms): {result['error']}")
+                for line in result["log"]:
+                    print(f"      {line}")
+            if args.keep:
+                print(f"      HOME: {result['home']}")
+        print(f"\n{passed}/{len(results)} scenarios passed in {duration:.2f}s")
+    
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Turbo Loader v3 - Startup Log Parser
+Streams Dungeondraft log output, pairs pack load start and end lines and
+attributes startup wall time to each pack as a cost table and flame summary
+"""
+
+import sys
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from launch_profiler import DEFAULT_READY_PATTERN, TIMELINE_FORMAT
+
+# Dungeondraft's wording has changed between releases, so both patterns accept the
+# common variants; --start-pattern/--end-pattern override them with a (?P<pack>...) group
+DEFAULT_START_PATTERN = r"(?i)\b(?:started\s+)?loading\s+(?:asset\s+)?pack\b[:\s]+(?P<pack>.+?)\s*$"
+DEFAULT_END_PATTERN = (r"(?i)\b(?:loaded|finished loading|done loading)\s+(?:asset\s+)?pack\b[:\s]+"
+                       r"(?P<pack>.+?)(?:\s+(?:in|after)\s+[\d.]+\s*m?s)?\s*$")
+
+# Leading timestamps the parser understands: launch_profiler --echo's "[   1.234s]",
+# Godot-style "[12:34:56.789]" and ISO "2024-01-31 12:34:56.789"
+TIMESTAMP_PATTERN = re.compile(
+    r"^\s*\[?\s*(?:(?P<seconds>\d+(?:\.\d+)?)s"
+    r"|(?:\d{4}-\d{2}-\d{2}[ T])?(?P<hours>\d{1,2}):(?P<minutes>\d{2}):(?P<clock>\d{2}(?:\.\d+)?))\s*\]?\s*")
+
+PACK_EXTENSION = ".dungeondraft_pack"
+
+ROOT_NAME = "startup"
+
+class Frame:
+    """One timed span: the whole startup, or one pack load nested inside it"""
+    
+    def __init__(self, name: str, start: float, parent: Optional["Frame"] = None):
+        self.name = name
+        self.start = start
+        self.end = None
+        self.parent = parent
+        self.children = []
+        self.complete = True
+    
+    @property
+    def total(self) -> float:
+        return max(0.0, (self.end if self.end is not None else self.start) - self.start)
+    
+    @property
+    def self_time(self) -> float:
+        return max(0.0, self.total - sum(child.total for child in self.children))
+    
+    def stack(self) -> List[str]:
+        frame, names = self, []
+        while frame:
+            names.append(frame.name)
+            frame = frame.parent
+        return names[::-1]
+    
+    def walk(self) -> Iterator["Frame"]:
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+def pack_name(raw: str) -> str:
+    """Display name for a pack: file paths shorten to the pack file's stem"""
+    raw = raw.strip().strip("'\"")
+    if raw.lower().endswith(PACK_EXTENSION):
+        return Path(raw.replace("\\", "/")).stem
+    return raw
+
+def parse_timestamp(line: str) -> Tuple[Optional[float], str]:
+    """Seconds from a leading timestamp, if any, and the line without it"""
+    match = TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None, line
+    if match.group("seconds") is not None:
+        seconds = float(match.group("seconds"))
+    else:
+        seconds = int(match.group("hours")) * 3600 + int(match.group("minutes")) * 60 + float(match.group("clock"))
+    return seconds, line[match.end():]
+
+class PackLoadParser:
+    """Incremental parser: feed() one timestamped line at a time, then finish()
+    
+    Loads nest when a pack starts before the previous one ends. An end line closes
+    the most recent open load of that pack and anything opened inside it. Logs
+    that only announce starts can use sequential mode, where each start (and the
+    ready line) ends the load before it.
+    """
+    
+    def __init__(self, start_pattern: str = DEFAULT_START_PATTERN, end_pattern: str = DEFAULT_END_PATTERN,
+                 ready_pattern: Optional[str] = DEFAULT_READY_PATTERN, sequential: bool = False):
+        self.start_pattern = re.compile(start_pattern)
+        self.end_pattern = re.compile(end_pattern)
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.sequential = sequential
+        self.root = None
+        self.ready_at = None
+        self.lines = 0
+        self.unmatched_ends = []
+        self._stack = []
+        self._last_time = 0.0
+    
+    def _close(self, frame: Frame, t: float, complete: bool = True):
+        frame.end = t
+        frame.complete = complete
+    
+    def _close_down_to(self, depth: int, t: float, complete: bool):
+        while len(self._stack) > depth:
+            self._close(self._stack.pop(), t, complete)
+    
+    def begin(self, t: float):
+        """Start the clock before the first line, e.g. at process launch"""
+        if self.root is None:
+            self.root = Frame(ROOT_NAME, t)
+            self._stack = [self.root]
+            self._last_time = t
+    
+    def feed(self, line: str, t: float):
+        # Clocks in logs can step backwards at midnight or between sources; never let time run backwards
+        t = max(t, self._last_time)
+        self._last_time = t
+        self.lines += 1
+        self.begin(t)
+        if self.ready_at is not None:
+            return
+        
+        # Ends first: "Finished loading pack: X" also contains a start phrase
+        end = self.end_pattern.search(line)
+        if end:
+            name = pack_name(end.group("pack"))
+            for depth in range(len(self._stack) - 1, 0, -1):
+                if self._stack[depth].name == name:
+                    # Loads opened inside this one and never closed are cut off here
+                    self._close_down_to(depth + 1, t, False)
+                    self._close(self._stack.pop(), t)
+                    return
+            self.unmatched_ends.append({"t": round(t, 6), "pack": name})
+            return
+        
+        start = self.start_pattern.search(line)
+        if start:
+            if self.sequential:
+                self._close_down_to(1, t, True)
+            parent = self._stack[-1]
+            frame = Frame(pack_name(start.group("pack")), t, parent)
+            parent.children.append(frame)
+            self._stack.append(frame)
+            return
+        
+        if self.ready_pattern and self.ready_pattern.search(line):
+            self.ready_at = t
+            self._close_down_to(1, t, self.sequential)
+    
+    def finish(self, t: Optional[float] = None) -> Optional[Frame]:
+        """Close whatever is still open, at the ready line if there was one"""
+        if self.root is None:
+            return None
+        end = self.ready_at if self.ready_at is not None else max(t if t is not None else 0.0, self._last_time)
+        self._close_down_to(1, end, self.sequential)
+        self._close(self.root, end, self.ready_at is not None)
+        self._stack = []
+        return self.root
+
+def timed_lines(source: Iterable[str]) -> Iterator[Tuple[str, float]]:
+    """Lines with their time: from leading timestamps if the log has them, otherwise when each line arrived
+    
+    Once a timestamped line has been seen, unstamped lines (continuations,
+    stack traces) take the time of the last stamp. Arrival times cannot see
+    lines written before the parser started reading, so launch_profiler.py
+    timelines give better numbers for unstamped logs.
+    """
+    start_time = time.perf_counter()
+    first_stamp = last_stamp = None
+    for raw in source:
+        stamp, line = parse_timestamp(raw.rstrip("\r\n"))
+        if stamp is not None:
+            if first_stamp is None:
+                first_stamp = stamp
+            last_stamp = stamp - first_stamp
+        yield line, last_stamp if last_stamp is not None else time.perf_counter() - start_time
+
+def timeline_lines(path: Path) -> Iterator[Tuple[str, float]]:
+    """Lines recorded by launch_profiler.py, timed from the launch"""
+    timeline = json.loads(path.read_text(encoding="utf-8"))
+    if timeline.get("format") != TIMELINE_FORMAT or "log" not in timeline:
+        raise ValueError(f"{path} is not a launch timeline")
+    for entry in timeline["log"]:
+        yield entry["line"], entry["t"]
+
+def parse_log(lines: Iterable[Tuple[str, float]], parser: PackLoadParser,
+              start: Optional[float] = None) -> Optional[Frame]:
+    """Feed lines until the ready line, so a live stream is reported as soon as startup ends"""
+    if start is not None:
+        parser.begin(start)
+    for line, t in lines:
+        parser.feed(line, t)
+        if parser.ready_at is not None:
+            break
+    return parser.finish()
+
+def cost_table(root: Frame) -> List[Dict]:
+    """Per-pack wall time, most expensive first"""
+    packs = {}
+    for frame in root.walk():
+        if frame is root:
+            continue
+        entry = packs.setdefault(frame.name, {"pack": frame.name, "loads": 0, "total": 0.0, "self": 0.0,
+                                              "incomplete": 0})
+        entry["loads"] += 1
+        entry["self"] += frame.self_time
+        entry["incomplete"] += not frame.complete
+        # A pack loaded inside itself would otherwise be counted twice
+        if frame.parent is None or frame.name not in frame.parent.stack():
+            entry["total"] += frame.total
+    
+    startup = root.total or 1.0
+    table = sorted(packs.values(), key=lambda entry: (-entry["total"], entry["pack"]))
+    for entry in table:
+        entry["share"] = round(entry["total"] / startup, 4)
+        entry["total"] = round(entry["total"], 6)
+        entry["self"] = round(entry["self"], 6)
+    return table
+
+def folded_stacks(root: Frame) -> List[str]:
+    """Self time per call stack in microseconds, for flamegraph.pl, speedscope and similar"""
+    totals = {}
+    for frame in root.walk():
+        key = ";".join(name.replace(";", ":") for name in frame.stack())
+        totals[key] = totals.get(key, 0) + int(round(frame.self_time * 1_000_000))
+    return [f"{stack} {micros}" for stack, micros in totals.items() if micros > 0]
+
+def render_flame(root: Frame, width: int = 40, min_share: float = 0.005) -> List[str]:
+    """Indented tree with bars proportional to each frame's share of startup"""
+    startup = root.total or 1.0
+    lines = []
+    
+    def visit(frame: Frame, depth: int):
+        share = frame.total / startup
+        if frame is not root and share < min_share:
+            return
+        bar = "#" * max(1, round(share * width))
+        marker = "" if frame.complete else " (incomplete)"
+        lines.append(f"{'  ' * depth}{bar:<{width}} {frame.total * 1000:9.1f} ms {share:6.1%}  {frame.name}{marker}")
+        for child in sorted(frame.children, key=lambda child: -child.total):
+            visit(child, depth + 1)
+    
+    visit(root, 0)
+    return lines
+
+def print_report(root: Frame, parser: PackLoadParser, top: int):
+    table = cost_table(root)
+    print("Turbo Loader v3 - Startup Log Parser")
+    print("=" * 55)
+    ready = f"ready after {parser.ready_at:.3f}s" if parser.ready_at is not None else "no ready line found"
+    print(f"{parser.lines} log lines, {sum(entry['loads'] for entry in table)} pack loads, "
+          f"{len(table)} packs, {ready}")
+    attributed = sum(child.total for child in root.children)
+    print(f"Startup {root.total * 1000:.1f} ms, {attributed * 1000:.1f} ms ({attributed / (root.total or 1.0):.1%}) "
+          f"spent loading packs")
+    print()
+    
+    print(f"{'Pack':<36} {'Loads':>5} {'Total ms':>10} {'Self ms':>10} {'Share':>7}")
+    print("-" * 72)
+    for entry in table[:top]:
+        name = entry["pack"] if len(entry["pack"]) <= 36 else entry["pack"][:33] + "..."
+        flag = "  incomplete" if entry["incomplete"] else ""
+        print(f"{name:<36} {entry['loads']:>5} {entry['total'] * 1000:>10.1f} {entry['self'] * 1000:>10.1f} "
+              f"{entry['share']:>7.1%}{flag}")
+    if len(table) > top:
+        rest = sum(entry["total"] for entry in table[top:])
+        print(f"{f'... {len(table) - top} more packs':<36} {'':>5} {rest * 1000:>10.1f}")
+    print()
+    
+    print("Flame summary")
+    print("-" * 72)
+    for line in render_flame(root):
+        print(line)
+    
+    if parser.unmatched_ends:
+        print()
+        print(f"WARN {len(parser.unmatched_ends)} end lines had no matching start, e.g. "
+              f"{parser.unmatched_ends[0]['pack']!r}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Turbo Loader v3 - Startup Log Parser",
+        epilog="Examples: startup_log_parser.py ~/.local/share/Dungeondraft/logs/godot.log; "
+               "startup_log_parser.py --timeline launch.json; ./Dungeondraft.x86_64 | startup_log_parser.py -")
+    parser.add_argument("log", nargs="?", default="-",
+                        help="Log file, or - to read stdin as it arrives (default: -)")
+    parser.add_argument("--timeline", type=Path, help="Use the log recorded in a launch_profiler.py timeline")
+    parser.add_argument("--start-pattern", default=DEFAULT_START_PATTERN,
+                        help="Regular expression with a (?P<pack>...) group for a pack starting to load")
+    parser.add_argument("--end-pattern", default=DEFAULT_END_PATTERN,
+                        help="Regular expression with a (?P<pack>...) group for a pack finishing loading")
+    parser.add_argument("--ready-pattern", default=DEFAULT_READY_PATTERN,
+                        help="Regular expression for the line that ends startup")
+    parser.add_argument("--sequential", action="store_true",
+                        help="The log only announces starts; each start ends the previous load")
+    parser.add_argument("--top", type=int, default=25, help="Rows in the cost table (default: 25)")
+    parser.add_argument("--folded", type=Path, help="Write folded stacks for flame graph tools")
+    parser.add_argument("--json", action="store_true", help="Print the cost table as JSON")
+    args = parser.parse_args()
+    
+    for name in ("start_pattern", "end_pattern"):
+        try:
+            if "pack" not in re.compile(getattr(args, name)).groupindex:
+                parser.error(f"--{name.replace('_', '-')} needs a (?P<pack>...) group")
+        except re.error as e:
+            parser.error(f"--{name.replace('_', '-')}: {e}")
+    
+    pack_parser = PackLoadParser(args.start_pattern, args.end_pattern, args.ready_pattern, args.sequential)
+    try:
+        if args.timeline:
+            root = parse_log(timeline_lines(args.timeline), pack_parser, start=0.0)
+        elif args.log == "-":
+            # readline rather than iteration, so lines are timed as they arrive
+            root = parse_log(timed_lines(iter(sys.stdin.readline, "")), pack_parser)
+        else:
+            with open(args.log, 'r', encoding='utf-8', errors='replace') as f:
+                root = parse_log(timed_lines(f), pack_parser)
+    except (OSError, ValueError) as e:
+        print(f"FAIL Could not read log: {e}")
+        return 1
+    
+    if root is None:
+        print("FAIL The log was empty")
+        return 1
+    
+    if args.folded:
+        args.folded.write_text("\n".join(folded_stacks(root)) + "\n", encoding="utf-8")
+    
+    if args.json:
+        print(json.dumps({
+            "lines": pack_parser.lines,
+            "startup_seconds": round(root.total, 6),
+            "ready_at": None if pack_parser.ready_at is None else round(pack_parser.ready_at, 6),
+            "unmatched_ends": pack_parser.unmatched_ends,
+            "packs": cost_table(root)
+        }, indent=2))
+    else:
+        print_report(root, pack_parser, args.top)
+        if args.folded:
+            print()
+            print(f"Folded stacks: {args.folded}")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Concurrent Install Stress Test
+Runs many installs and verifications at once against one mods folder, then
+checks the folder ended up consistent and reports install lock wait times
+"""
+
+import os
+import sys
+import argparse
+import json
+import math
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+import TurboLoaderV3_Installer as installer
+import verify_installation
+from TurboLoaderV3_Installer import InstallationConfig, InstallationEngine
+from create_installer_package import stage_plugin_release
+from install_lock import LOCK_NAME, InstallLock
+from verify_installation import HashCache, QuickVerification
+
+SOURCE_DIR = Path(__file__).parent
+
+# Files an installation must contain, and nothing else
+INSTALLED_FILES = {"TurboLoaderV3.ddmod", "main.gd", "README.md", "TurboLoaderV3.manifest.json", "config.json"}
+
+# Relative frequency of each operation a worker performs
+OPERATION_WEIGHTS = {"install": 4, "install_no_backup": 1, "verify": 5}
+
+def run_worker(worker_id: int, mods_folder: str, operations: int, seed: int, start_at: float,
+               use_lock: bool) -> List[Dict]:
+    """One process performing a random mix of installs and verifications"""
+    if not use_lock:
+        installer.InstallLock = None
+        verify_installation.InstallLock = None
+    
+    mods_path = Path(mods_folder)
+    plugin_dir = mods_path / InstallationEngine.PLUGIN_DIR_NAME
+    cache_dir = mods_path.parent / "caches" / f"worker_{worker_id}"
+    release_dir = mods_path.parent / "release"
+    rng = random.Random(f"{seed}:{worker_id}")
+    kinds = list(OPERATION_WEIGHTS)
+    weights = list(OPERATION_WEIGHTS.values())
+    records = []
+    
+    # Start every worker at the same moment so they really contend
+    time.sleep(max(0.0, start_at - time.time()))
+    
+    for _ in range(operations):
+        kind = rng.choices(kinds, weights)[0]
+        record = {"worker": worker_id, "kind": kind, "backed_up": False, "lock_wait": 0.0}
+        start_time = time.perf_counter()
+        
+        try:
+            if kind == "verify":
+                verifier = QuickVerification(plugin_dir, quiet=True,
+                                             hash_cache=HashCache(cache_dir / "hash_cache.json"))
+                result = verifier.verify()
+                record["passed"] = result["success"]
+                record["lock_wait"] = verifier.lock_wait
+                if not result["success"]:
+                    failed = [check["check"].strip() for check in result.get("checks", []) if not check["passed"]]
+                    record["error"] = ", ".join(failed) or result.get("error")
+            else:
+                config = InstallationConfig(mods_folder=mods_path, backup_existing=(kind == "install"))
+                engine = InstallationEngine(config, release_dir, log=lambda message: None)
+                record["passed"] = engine.install()
+                record["lock_wait"] = engine.lock_wait
+                record["backed_up"] = any(span.name == "backup" and span.bytes_moved > 0
+                                          for span in engine.tracer.spans)
+        except Exception as e:
+            record["passed"] = False
+            record["error"] = f"{type(e).__name__}: {e}"
+        
+        record["duration"] = time.perf_counter() - start_time
+        records.append(record)
+    
+    return records
+
+def check_final_state(mods_folder: Path, records: List[Dict]) -> List[str]:
+    """Everything that must hold once all workers are done; returns the violations"""
+    problems = []
+    plugin_dir = mods_folder / InstallationEngine.PLUGIN_DIR_NAME
+    
+    failed = [record for record in records if not record["passed"]]
+    for record in failed[:10]:
+        problems.append(f"worker {record['worker']} {record['kind']} failed: {record.get('error', 'verification failed')}")
+    if len(failed) > 10:
+        problems.append(f"... {len(failed) - 10} more failed operations")
+    
+    result = QuickVerification(plugin_dir, quiet=True).verify()
+    if not result["success"]:
+        problems.append("final installation does not verify")
+    
+    if plugin_dir.is_dir():
+        installed = {path.name for path in plugin_dir.iterdir()}
+        if installed != INSTALLED_FILES:
+            problems.append(f"unexpected plugin contents: extra {sorted(installed - INSTALLED_FILES)}, "
+                            f"missing {sorted(INSTALLED_FILES - installed)}")
+    
+    backups = sorted(mods_folder.glob(f"{InstallationEngine.PLUGIN_DIR_NAME}_backup_*"))
+    expected_backups = sum(record["backed_up"] for record in records)
+    if len(backups) != expected_backups:
+        problems.append(f"{len(backups)} backup folders for {expected_backups} backups taken")
+    collided = [backup.name for backup in backups if (backup / InstallationEngine.PLUGIN_DIR_NAME).exists()]
+    if collided:
+        problems.append(f"{len(collided)} backups have an installation moved inside them (name collision): "
+                        f"{', '.join(collided[:3])}")
+    incomplete = [backup.name for backup in backups if backup.name not in collided
+                  and not QuickVerification(backup, quiet=True).verify()["success"]]
+    if incomplete:
+        problems.append(f"{len(incomplete)} backups are not complete installations: {', '.join(incomplete[:3])}")
+    
+    leftovers = [path.name for path in mods_folder.rglob("*.tmp")]
+    if leftovers:
+        problems.append(f"temporary files left behind: {leftovers[:5]}")
+    
+    try:
+        InstallLock(mods_folder, timeout=0).acquire().release()
+    except TimeoutError:
+        problems.append("install lock is still held")
+    if (mods_folder / LOCK_NAME).exists():
+        problems.append(f"{LOCK_NAME} left behind")
+    
+    return problems
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def lock_wait_summary(records: List[Dict]) -> Dict[str, Dict]:
+    """Lock wait percentiles in milliseconds, per operation kind"""
+    summary = {}
+    for kind in OPERATION_WEIGHTS:
+        waits = [record["lock_wait"] * 1000 for record in records if record["kind"] == kind]
+        if waits:
+            summary[kind] = {
+                "count": len(waits),
+                "p50_ms": round(percentile(waits, 0.5), 2),
+                "p95_ms": round(percentile(waits, 0.95), 2),
+                "max_ms": round(max(waits), 2)
+            }
+    return summary
+
+def run_stress_test(workers: int, operations: int, seed: int, use_lock: bool, keep: bool = False) -> Dict:
+    """Seed one installation, then let every worker loose on the same mods folder"""
+    sandbox = Path(tempfile.mkdtemp(prefix="tlv3_stress_"))
+    mods_folder = sandbox / "Documents" / "Dungeondraft Mods"
+    saved_home = {variable: os.environ.get(variable) for variable in ("HOME", "USERPROFILE")}
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(sandbox)
+    
+    try:
+        release_dir = stage_plugin_release(mods_folder.parent / "release", SOURCE_DIR)
+        InstallationEngine(InstallationConfig(mods_folder=mods_folder), release_dir, log=lambda message: None).install()
+        
+        start_time = time.perf_counter()
+        start_at = time.time() + 0.5
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_worker, worker_id, str(mods_folder), operations, seed, start_at, use_lock)
+                       for worker_id in range(workers)]
+            records = [record for future in futures for record in future.result()]
+        duration = time.perf_counter() - start_time - 0.5
+        
+        problems = check_final_state(mods_folder, records)
+        return {
+            "workers": workers,
+            "operations": len(records),
+            "locking": use_lock,
+            "duration": round(max(duration, 0.0), 3),
+            "consistent": not problems,
+            "problems": problems,
+            "lock_waits": lock_wait_summary(records),
+            "sandbox": str(sandbox) if keep else None
+        }
+    finally:
+        for variable, value in saved_home.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+        if not keep:
+            shutil.rmtree(sandbox, ignore_errors=True)
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Concurrent Install Stress Test")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent processes (default: 8)")
+    parser.add_argument("--operations", type=int, default=20,
+                        help="Installs and verifications per process (default: 20)")
+    parser.add_argument("--rounds", type=int, default=1, help="Independent repetitions (default: 1)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the operation mix (default: 1)")
+    parser.add_argument("--no-lock", action="store_true",
+                        help="Disable the install lock, to show what it prevents")
+    parser.add_argument("--keep", action="store_true", help="Keep the sandbox mods folder for inspection")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    
+    results = [run_stress_test(args.workers, args.operations, args.seed + round_index, not args.no_lock, args.keep)
+               for round_index in range(args.rounds)]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("Turbo Loader v3 - Concurrent Install Stress Test")
+        print("=" * 55)
+        for index, result in enumerate(results, 1):
+            marker = "PASS" if result["consistent"] else "FAIL"
+            print(f"{marker} Round {index}: {result['operations']} operations from {result['workers']} processes "
+                  f"in {result['duration']:.2f}s (locking {'on' if result['locking'] else 'off'})")
+            for problem in result["problems"]:
+                print(f"      {problem}")
+            for kind, waits in result["lock_waits"].items():
+                print(f"      {kind:<18} {waits['count']:4} ops  lock wait p50 {waits['p50_ms']:7.2f} ms  "
+                      f"p95 {waits['p95_ms']:7.2f} ms  max {waits['max_ms']:7.2f} ms")
+            if result["sandbox"]:
+                print(f"      Sandbox: {result['sandbox']}")
+    
+    return 0 if all(result["consistent"] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,19 +6,176 @@ Lightweight verification script for post-installation validation
 
 import os
 import sys
+import argparse
+import hashlib
 import json
+import mmap
+import threading
 import time
 import platform
+import queue
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
+try:
+    from gdscript_validator import GDScriptValidator, find_scripts
+except ImportError:
+    GDScriptValidator = find_scripts = None
+
+try:
+    from install_lock import InstallLock, InstallLockTimeout
+except ImportError:
+    InstallLock = None
+    InstallLockTimeout = TimeoutError
+
+MANIFEST_NAME = "TurboLoaderV3.manifest.json"
+
+# Shipped plugin files covered by the manifest, when present
+MANIFEST_FILES = ["TurboLoaderV3.ddmod", "main.gd", "preview.png", "README.md", "LICENSE"]
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class HashCache:
+    """SHA-256 results keyed by path and (inode, size, mtime_ns), persisted as JSON"""
+    
+    def __init__(self, cache_path: Optional[Path] = None):
+        default_path = Path.home() / ".cache" / "TurboLoaderV3" / "hash_cache.json"
+        self.cache_path = cache_path or Path(os.environ.get("TURBOLOADER_HASH_CACHE", default_path))
+        self._entries: Optional[Dict[str, List]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        """Read the cache file on first use"""
+        try:
+            with open(self.cache_path, 'r') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    def sha256(self, path: Path, st: os.stat_result) -> str:
+        """Hash a file, reusing the cached digest while its stat key is unchanged"""
+        key = [st.st_ino, st.st_size, st.st_mtime_ns]
+        cache_key = str(path)
+        
+        with self._lock:
+            if self._entries is None:
+                self._load()
+            cached = self._entries.get(cache_key)
+        
+        if cached and cached[:3] == key:
+            return cached[3]
+        
+        digest = sha256_file(path, st.st_size)
+        with self._lock:
+            self._entries[cache_key] = key + [digest]
+            self._dirty = True
+        return digest
+    
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+                with open(temp_path, 'w') as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.cache_path)
+                self._dirty = False
+            except OSError:
+                pass  # The cache is only an optimisation
+
+def sha256_file(path: Path, size: Optional[int] = None) -> str:
+    """Stream a file through SHA-256 using a read-only memory map"""
+    sha256_hash = hashlib.sha256()
+    
+    with open(path, 'rb') as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return sha256_hash.hexdigest()
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                for offset in range(0, len(view), HASH_CHUNK_SIZE):
+                    sha256_hash.update(view[offset:offset + HASH_CHUNK_SIZE])
+    
+    return sha256_hash.hexdigest()
+
+def manifest_for(files: Dict[str, Tuple[str, int]], version: str = "3.0.0") -> Dict:
+    """Manifest for files whose (sha256, size) is already known"""
+    return {
+        "version": version,
+        "algorithm": "sha256",
+        "files": {name: {"sha256": digest, "size": size} for name, (digest, size) in sorted(files.items())}
+    }
+
+def build_manifest(source_dir: Path, file_names: List[str], version: str = "3.0.0") -> Dict:
+    """Hash the shipped plugin files into a manifest"""
+    files = {}
+    for file_name in file_names:
+        file_path = source_dir / file_name
+        if file_path.is_file():
+            files[file_name] = (sha256_file(file_path), file_path.stat().st_size)
+    
+    return manifest_for(files, version)
+
 class QuickVerification:
     """Quick installation verification for end users"""
     
-    def __init__(self):
+    def __init__(self, plugin_directory: Optional[Path] = None, quiet: bool = False,
+                 hash_cache: Optional[HashCache] = None, gdscript_validator=None):
         self.os_name = platform.system()
-        self.plugin_directory = self._find_plugin_directory()
+        self.quiet = quiet
+        self.requested_directory = plugin_directory
+        self.hash_cache = hash_cache or HashCache()
+        self.gdscript_validator = gdscript_validator or (GDScriptValidator() if GDScriptValidator else None)
+        
+        # Seconds to wait for an installer to finish, and how long the last check waited
+        self.lock_timeout = 30.0
+        self.lock_wait = 0.0
+        
+        # Filled by a single directory scan and shared by every check
+        self._stats: Optional[Dict[str, os.stat_result]] = None
+        self._scan_error: Optional[OSError] = None
+        self._parsed: Dict[str, Tuple[Optional[object], Optional[Exception]]] = {}
+        
+        if plugin_directory is None:
+            self.plugin_directory = self._find_plugin_directory()
+        else:
+            self.plugin_directory = plugin_directory if plugin_directory.exists() else None
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the install lock shared, so no installer changes files mid-check"""
+        target = (self.requested_directory or self.plugin_directory
+                  or Path.home() / "Documents" / "Dungeondraft Mods" / "TurboLoaderV3")
+        lock = None
+        if InstallLock is not None:
+            try:
+                lock = InstallLock(target.parent, shared=True, timeout=self.lock_timeout).acquire()
+                self.lock_wait = lock.wait_seconds
+            except InstallLockTimeout:
+                raise
+            except OSError:
+                lock = None  # No mods folder yet, or a read-only one; nothing can be installing there
         
+        try:
+            # An installer may have created or replaced the directory while we waited
+            if self.requested_directory is not None:
+                self.plugin_directory = self.requested_directory if self.requested_directory.exists() else None
+            elif self.plugin_directory is None:
+                self.plugin_directory = self._find_plugin_directory()
+            yield
+        finally:
+            if lock is not None:
+                lock.release()
+    
     def _find_plugin_directory(self) -> Optional[Path]:
         """Find the Turbo Loader v3 plugin directory"""
         documents = Path.home() / "Documents"
@@ -26,40 +183,123 @@ class QuickVerification:
         
         return plugin_path if plugin_path.exists() else None
     
-    def verify(self) -> Dict[str, any]:
-        """Perform quick verification"""
+    def _scan(self):
+        """Stat every entry of the plugin directory in one scandir pass"""
+        self._stats = {}
+        self._scan_error = None
+        self._parsed = {}
+        
+        try:
+            with os.scandir(self.plugin_directory) as entries:
+                for entry in entries:
+                    try:
+                        self._stats[entry.name] = entry.stat()
+                    except OSError:
+                        continue
+        except OSError as e:
+            self._scan_error = e
+    
+    def _file_stats(self) -> Dict[str, os.stat_result]:
+        """Stat results of regular files in the plugin directory"""
+        if self._stats is None:
+            self._scan()
+        return {name: st for name, st in self._stats.items() if stat.S_ISREG(st.st_mode)}
+    
+    def _has_file(self, file_name: str) -> bool:
+        """Whether the scan found a regular file with this name"""
+        return file_name in self._file_stats()
+    
+    def _read_text(self, file_name: str) -> str:
+        """Read a file once; later calls reuse the content or the error"""
+        key = f"text:{file_name}"
+        if key not in self._parsed:
+            try:
+                with open(self.plugin_directory / file_name, 'r') as f:
+                    self._parsed[key] = (f.read(), None)
+            except Exception as e:
+                self._parsed[key] = (None, e)
+        
+        content, error = self._parsed[key]
+        if error is not None:
+            raise error
+        return content
+    
+    def _load_json(self, file_name: str) -> Dict:
+        """Parse a JSON file once; later calls reuse the data or the error"""
+        key = f"json:{file_name}"
+        if key not in self._parsed:
+            try:
+                self._parsed[key] = (json.loads(self._read_text(file_name)), None)
+            except Exception as e:
+                self._parsed[key] = (None, e)
+        
+        data, error = self._parsed[key]
+        if error is not None:
+            raise error
+        return data
+    
+    def _is_readable(self, st: os.stat_result) -> bool:
+        """Decide readability from a stat result instead of another access() call"""
+        if not hasattr(os, "geteuid"):
+            return True  # Windows files are readable unless locked
         
-        print("Turbo Loader v3 - Quick Installation Verification")
-        print("=" * 55)
+        euid = os.geteuid()
+        if euid == 0:
+            return True
+        if st.st_uid == euid:
+            return bool(st.st_mode & stat.S_IRUSR)
+        if st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+            return bool(st.st_mode & stat.S_IRGRP)
+        return bool(st.st_mode & stat.S_IROTH)
+    
+    def _print(self, message: str = ""):
+        """Print progress output unless running quietly"""
+        if not self.quiet:
+            print(message)
+    
+    def verify(self) -> Dict[str, any]:
+        """Perform quick verification, after any installation in progress has finished"""
+        try:
+            with self._locked():
+                return self._verify()
+        except InstallLockTimeout as e:
+            return {
+                "success": False,
+                "plugin_directory": str(self.requested_directory or self.plugin_directory),
+                "error": "Installation in progress",
+                "message": str(e),
+                "timestamp": time.time()
+            }
+    
+    def _verify(self) -> Dict[str, any]:
+        self._print("Turbo Loader v3 - Quick Installation Verification")
+        self._print("=" * 55)
         
         if not self.plugin_directory:
             return {
                 "success": False,
+                "plugin_directory": str(self.requested_directory) if self.requested_directory else None,
                 "error": "Plugin directory not found",
-                "message": "Turbo Loader v3 is not installed or not in the expected location"
+                "message": "Turbo Loader v3 is not installed or not in the expected location",
+                "timestamp": time.time()
             }
         
-        print(f"Plugin Directory: {self.plugin_directory}")
+        self._print(f"Plugin Directory: {self.plugin_directory}")
+        self._scan()
         
         # Core verification checks
-        checks = [
-            (" Required Files", self._check_required_files),
-            (" Configuration", self._check_configuration),
-            (" Mod Definition", self._check_ddmod_file),
-            (" GDScript Code", self._check_gdscript),
-            (" Permissions", self._check_permissions)
-        ]
+        checks = self._checks()
         
         results = []
         all_passed = True
         
         for check_name, check_function in checks:
-            print(f"\n{check_name}:")
+            self._print(f"\n{check_name}:")
             
             try:
                 passed, message, details = check_function()
                 status = "PASS PASS" if passed else "FAIL FAIL"
-                print(f"  {status}: {message}")
+                self._print(f"  {status}: {message}")
                 
                 results.append({
                     "check": check_name,
@@ -70,9 +310,9 @@ class QuickVerification:
                 
                 if not passed:
                     all_passed = False
-                    
+            
             except Exception as e:
-                print(f"  FAIL ERROR: {e}")
+                self._print(f"  FAIL ERROR: {e}")
                 results.append({
                     "check": check_name,
                     "passed": False,
@@ -82,19 +322,19 @@ class QuickVerification:
                 all_passed = False
         
         # Summary
-        print("\n" + "=" * 55)
+        self._print("\n" + "=" * 55)
         if all_passed:
-            print(" VERIFICATION SUCCESSFUL!")
-            print("PASS Turbo Loader v3 is correctly installed and ready to use")
-            print("\nNext Steps:")
-            print("  1. Start Dungeondraft")
-            print("  2. Go to Tools > Mods")
-            print("  3. Enable 'Turbo Loader v3'")
-            print("  4. Enjoy improved performance!")
+            self._print(" VERIFICATION SUCCESSFUL!")
+            self._print("PASS Turbo Loader v3 is correctly installed and ready to use")
+            self._print("\nNext Steps:")
+            self._print("  1. Start Dungeondraft")
+            self._print("  2. Go to Tools > Mods")
+            self._print("  3. Enable 'Turbo Loader v3'")
+            self._print("  4. Enjoy improved performance!")
         else:
-            print("WARN  VERIFICATION ISSUES FOUND")
-            print("FAIL Some issues were detected with the installation")
-            print("   Please review the details above and retry installation if needed")
+            self._print("WARN  VERIFICATION ISSUES FOUND")
+            self._print("FAIL Some issues were detected with the installation")
+            self._print("   Please review the details above and retry installation if needed")
         
         return {
             "success": all_passed,
@@ -103,6 +343,47 @@ class QuickVerification:
             "timestamp": time.time()
         }
     
+    def _checks(self) -> List[Tuple[str, object]]:
+        """Verification checks in the order they are reported"""
+        return [
+            (" Required Files", self._check_required_files),
+            (" Configuration", self._check_configuration),
+            (" Mod Definition", self._check_ddmod_file),
+            (" GDScript Code", self._check_gdscript),
+            (" File Integrity", self._check_manifest),
+            (" Permissions", self._check_permissions)
+        ]
+    
+    def run_checks(self, check_names: Optional[List[str]] = None) -> List[Dict]:
+        """Rescan the plugin directory and run only the named checks (all if None)"""
+        try:
+            with self._locked():
+                return self._run_checks(check_names)
+        except InstallLockTimeout as e:
+            return [{"check": "Install Lock", "passed": False, "message": str(e), "details": None}]
+    
+    def _run_checks(self, check_names: Optional[List[str]] = None) -> List[Dict]:
+        self._scan()
+        results = []
+        
+        for check_name, check_function in self._checks():
+            if check_names is not None and check_name.strip() not in check_names:
+                continue
+            
+            try:
+                passed, message, details = check_function()
+            except Exception as e:
+                passed, message, details = False, f"Check failed with error: {e}", None
+            
+            results.append({
+                "check": check_name,
+                "passed": passed,
+                "message": message,
+                "details": details
+            })
+        
+        return results
+    
     def _check_required_files(self) -> Tuple[bool, str, Dict]:
         """Check that all required files are present"""
         required_files = [
@@ -115,8 +396,7 @@ class QuickVerification:
         found_files = []
         
         for file_name in required_files:
-            file_path = self.plugin_directory / file_name
-            if file_path.exists():
+            if self._has_file(file_name):
                 found_files.append(file_name)
             else:
                 missing_files.append(file_name)
@@ -133,14 +413,11 @@ class QuickVerification:
     
     def _check_configuration(self) -> Tuple[bool, str, Dict]:
         """Check configuration file"""
-        config_path = self.plugin_directory / "config.json"
-        
-        if not config_path.exists():
+        if not self._has_file("config.json"):
             return False, "Configuration file not found", {}
         
         try:
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
+            config_data = self._load_json("config.json")
             
             # Check for expected fields
             expected_fields = ["installation_date", "installer_version"]
@@ -156,7 +433,7 @@ class QuickVerification:
                     "installer_version": config_data.get("installer_version"),
                     "installation_date": config_data.get("installation_date")
                 }
-                
+        
         except json.JSONDecodeError:
             return False, "Configuration file contains invalid JSON", {}
         except Exception as e:
@@ -164,14 +441,11 @@ class QuickVerification:
     
     def _check_ddmod_file(self) -> Tuple[bool, str, Dict]:
         """Check .ddmod file validity"""
-        ddmod_path = self.plugin_directory / "TurboLoaderV3.ddmod"
-        
-        if not ddmod_path.exists():
+        if not self._has_file("TurboLoaderV3.ddmod"):
             return False, "Mod definition file (.ddmod) not found", {}
         
         try:
-            with open(ddmod_path, 'r') as f:
-                ddmod_data = json.load(f)
+            ddmod_data = self._load_json("TurboLoaderV3.ddmod")
             
             # Check required fields
             required_fields = ["name", "unique_id", "version", "author"]
@@ -188,7 +462,7 @@ class QuickVerification:
                     "version": ddmod_data["version"],
                     "unique_id": ddmod_data["unique_id"]
                 }
-                
+        
         except json.JSONDecodeError:
             return False, "Mod definition file contains invalid JSON", {}
         except Exception as e:
@@ -196,44 +470,126 @@ class QuickVerification:
     
     def _check_gdscript(self) -> Tuple[bool, str, Dict]:
         """Check GDScript file"""
-        gdscript_path = self.plugin_directory / "main.gd"
-        
-        if not gdscript_path.exists():
+        if not self._has_file("main.gd"):
             return False, "GDScript file (main.gd) not found", {}
         
         try:
-            with open(gdscript_path, 'r') as f:
-                gdscript_content = f.read()
+            gdscript_content = self._read_text("main.gd")
             
             # Basic checks
             if not gdscript_content.strip():
                 return False, "GDScript file is empty", {}
             
-            # Check for required Dungeondraft function
-            if "func start(" not in gdscript_content:
-                return False, "Missing required start() function for Dungeondraft", {}
+            if self.gdscript_validator is None:
+                # Validator module unavailable: fall back to a presence check
+                if "func start(" not in gdscript_content:
+                    return False, "Missing required start() function for Dungeondraft", {}
+                return True, f"GDScript file is present ({len(gdscript_content)} characters)", {
+                    "file_size": len(gdscript_content),
+                    "line_count": gdscript_content.count('\n') + 1
+                }
+            
+            # Parse main.gd and every plugin script in the mods folder; unchanged scripts are cache hits
+            main_path = self.plugin_directory / "main.gd"
+            results = self.gdscript_validator.validate_many(self._plugin_scripts())
+            self.gdscript_validator.save()
+            main_result = results[main_path]
             
-            return True, f"GDScript file is valid ({len(gdscript_content)} characters)", {
+            mods_directory = self.plugin_directory.parent
+            syntax_errors = [
+                f"{path.relative_to(mods_directory).as_posix()}:{error.line}:{error.column}: {error.message}"
+                for path, result in results.items() for error in result.errors
+            ]
+            details = {
                 "file_size": len(gdscript_content),
-                "line_count": gdscript_content.count('\n') + 1
+                "line_count": gdscript_content.count('\n') + 1,
+                "scripts_checked": len(results),
+                "syntax_errors": syntax_errors
             }
             
+            # Dungeondraft would fail to load any of these scripts
+            if syntax_errors:
+                return False, f"GDScript syntax error: {syntax_errors[0]}", details
+            
+            # Check for required Dungeondraft function
+            if "start" not in main_result.functions:
+                return False, "Missing required start() function for Dungeondraft", details
+            
+            return True, f"GDScript file is valid ({len(gdscript_content)} characters)", details
+        
         except Exception as e:
             return False, f"Error reading GDScript file: {e}", {}
     
+    def _plugin_scripts(self) -> List[Path]:
+        """main.gd, then the scripts of every plugin folder (one with a .ddmod) in the mods folder
+        
+        Installer backups are skipped: Dungeondraft never loads them.
+        """
+        main_path = self.plugin_directory / "main.gd"
+        scripts = [main_path]
+        backup_prefix = f"{self.plugin_directory.name}_backup_"
+        
+        try:
+            plugin_folders = sorted(entry.path for entry in os.scandir(self.plugin_directory.parent)
+                                    if entry.is_dir() and not entry.name.startswith(backup_prefix))
+        except OSError:
+            return scripts
+        
+        for folder in map(Path, plugin_folders):
+            if folder == self.plugin_directory or any(folder.glob("*.ddmod")):
+                scripts.extend(path for path in find_scripts([folder]) if path != main_path)
+        return scripts
+    
+    def _check_manifest(self) -> Tuple[bool, str, Dict]:
+        """Check installed files against the shipped SHA-256 manifest"""
+        if not self._has_file(MANIFEST_NAME):
+            return True, "No integrity manifest installed - skipped", {}
+        
+        try:
+            manifest = self._load_json(MANIFEST_NAME)
+            expected_files = manifest["files"]
+        except (ValueError, KeyError, TypeError):
+            return False, "Integrity manifest is invalid", {}
+        
+        file_stats = self._file_stats()
+        missing_files = []
+        modified_files = []
+        
+        for file_name, expected in sorted(expected_files.items()):
+            st = file_stats.get(file_name)
+            if st is None:
+                missing_files.append(file_name)
+            elif st.st_size != expected.get("size", st.st_size):
+                modified_files.append(file_name)
+            elif self.hash_cache.sha256(self.plugin_directory / file_name, st) != expected.get("sha256"):
+                modified_files.append(file_name)
+        
+        self.hash_cache.save()
+        details = {
+            "files_checked": len(expected_files),
+            "missing": missing_files,
+            "modified": modified_files
+        }
+        
+        if missing_files or modified_files:
+            problems = missing_files + modified_files
+            return False, f"Files do not match the shipped build: {', '.join(problems)}", details
+        
+        return True, f"All {len(expected_files)} files match the shipped build", details
+    
     def _check_permissions(self) -> Tuple[bool, str, Dict]:
         """Check file permissions"""
         permission_issues = []
         
         # Check directory permissions
-        if not os.access(self.plugin_directory, os.R_OK):
+        file_stats = self._file_stats()
+        if self._scan_error is not None:
             permission_issues.append("Cannot read plugin directory")
         
-        # Check file permissions
-        for file_path in self.plugin_directory.iterdir():
-            if file_path.is_file():
-                if not os.access(file_path, os.R_OK):
-                    permission_issues.append(f"Cannot read {file_path.name}")
+        # Check file permissions from the scan's stat results
+        for file_name, st in sorted(file_stats.items()):
+            if not self._is_readable(st):
+                permission_issues.append(f"Cannot read {file_name}")
         
         if permission_issues:
             return False, f"Permission issues: {', '.join(permission_issues)}", {
@@ -242,15 +598,313 @@ class QuickVerification:
         else:
             return True, "All file permissions are correct", {}
 
+class VerificationWatcher:
+    """Re-run affected checks when the plugin or mods folder changes, publishing a status file"""
+    
+    ALL_CHECKS = ["Required Files", "Configuration", "Mod Definition",
+                  "GDScript Code", "File Integrity", "Permissions"]
+    
+    # Checks that depend on each plugin file; any other file affects the last two
+    CHECK_DEPENDENCIES = {
+        "TurboLoaderV3.ddmod": ["Required Files", "Mod Definition", "File Integrity", "Permissions"],
+        "main.gd": ["Required Files", "GDScript Code", "File Integrity", "Permissions"],
+        "config.json": ["Required Files", "Configuration", "Permissions"],
+        MANIFEST_NAME: ["File Integrity"]
+    }
+    
+    # Changes to the mods folder itself (e.g. the plugin folder being replaced)
+    MODS_FOLDER_CHANGE = "<mods folder>"
+    
+    def __init__(self, plugin_directory: Path, status_file: Path, interval: float = 2.0):
+        self.plugin_directory = plugin_directory
+        self.mods_directory = plugin_directory.parent
+        self.status_file = status_file
+        self.interval = interval
+        self.hash_cache = HashCache()
+        self.gdscript_validator = GDScriptValidator() if GDScriptValidator else None
+        self.check_results: Dict[str, Dict] = {}
+        self._events = None
+        self._observer = None
+        self._handler = None
+        self._plugin_watch = None
+    
+    def affected_checks(self, changed_names: List[str]) -> List[str]:
+        """Map changed file names to the checks that must be re-run"""
+        affected = set()
+        for name in changed_names:
+            if name == self.MODS_FOLDER_CHANGE:
+                return list(self.ALL_CHECKS)
+            if name.endswith(".gd"):
+                affected.add("GDScript Code")
+            affected.update(self.CHECK_DEPENDENCIES.get(name, ["File Integrity", "Permissions"]))
+        return [check for check in self.ALL_CHECKS if check in affected]
+    
+    def refresh(self, check_names: Optional[List[str]] = None, changed_names: Optional[List[str]] = None) -> Dict:
+        """Re-run the given checks and rewrite the status file"""
+        if not self.plugin_directory.is_dir():
+            self.check_results = {}
+            status = {
+                "status": "missing",
+                "success": False,
+                "message": "Plugin directory not found"
+            }
+        else:
+            verifier = QuickVerification(self.plugin_directory, quiet=True, hash_cache=self.hash_cache,
+                                         gdscript_validator=self.gdscript_validator)
+            for result in verifier.run_checks(check_names):
+                self.check_results[result["check"].strip()] = result
+            
+            success = all(result["passed"] for result in self.check_results.values())
+            status = {
+                "status": "healthy" if success else "unhealthy",
+                "success": success,
+                "checks": self.check_results
+            }
+        
+        status.update({
+            "plugin_directory": str(self.plugin_directory),
+            "rechecked": check_names if check_names is not None else list(self.ALL_CHECKS),
+            "changed": changed_names or [],
+            "updated_at": time.time(),
+            "pid": os.getpid()
+        })
+        self._write_status(status)
+        return status
+    
+    def _write_status(self, status: Dict):
+        """Replace the status file atomically so pollers never see a partial write"""
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.status_file.with_name(f"{self.status_file.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(temp_path, self.status_file)
+    
+    def _snapshot(self) -> Dict[str, Tuple]:
+        """Stat the plugin and mods folders for the polling fallback"""
+        snapshot = {}
+        
+        for directory, prefix in ((self.mods_directory, self.MODS_FOLDER_CHANGE), (self.plugin_directory, "")):
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        # Only the plugin folder itself matters at the mods-folder level
+                        if prefix and entry.name != self.plugin_directory.name:
+                            continue
+                        st = entry.stat()
+                        snapshot[prefix or entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        
+        return snapshot
+    
+    def _start_event_source(self) -> bool:
+        """Subscribe to filesystem events through watchdog when it is installed"""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return False
+        
+        self._events = queue.Queue()
+        watcher = self
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for raw_path in (event.src_path, getattr(event, "dest_path", "")):
+                    if not raw_path:
+                        continue
+                    path = Path(os.fsdecode(raw_path))
+                    if path == watcher.plugin_directory:
+                        watcher._events.put(watcher.MODS_FOLDER_CHANGE)
+                    elif watcher.plugin_directory in path.parents:
+                        watcher._events.put(path.relative_to(watcher.plugin_directory).as_posix())
+        
+        # Only the plugin folder's own entry matters in the mods folder, which may hold thousands of packs
+        self._handler = Handler()
+        self._observer = Observer()
+        self._observer.schedule(self._handler, str(self.mods_directory), recursive=False)
+        self._watch_plugin_directory()
+        self._observer.start()
+        return True
+    
+    def _watch_plugin_directory(self):
+        """(Re)subscribe to the plugin folder, which an install replaces with a new directory"""
+        if self._plugin_watch is not None:
+            self._observer.unschedule(self._plugin_watch)
+            self._plugin_watch = None
+        if self.plugin_directory.is_dir():
+            self._plugin_watch = self._observer.schedule(self._handler, str(self.plugin_directory), recursive=True)
+    
+    def _wait_for_changes(self, previous: Dict[str, Tuple]) -> Tuple[List[str], Dict[str, Tuple]]:
+        """Block until something changes; returns changed names and the new snapshot"""
+        while True:
+            if self._events is not None:
+                try:
+                    changed = {self._events.get(timeout=self.interval)}
+                except queue.Empty:
+                    continue
+                
+                # Let a burst of events (e.g. a reinstall) settle into one refresh
+                time.sleep(0.2)
+                while not self._events.empty():
+                    changed.add(self._events.get_nowait())
+                if self.MODS_FOLDER_CHANGE in changed:
+                    self._watch_plugin_directory()
+                return sorted(changed), previous
+            
+            time.sleep(self.interval)
+            current = self._snapshot()
+            changed = sorted(name for name in set(previous) | set(current)
+                             if previous.get(name) != current.get(name))
+            if changed:
+                return changed, current
+    
+    def run(self):
+        """Watch until interrupted"""
+        using_events = self._start_event_source()
+        snapshot = self._snapshot()
+        status = self.refresh()
+        print(f"Watching {self.plugin_directory} ({'filesystem events' if using_events else 'polling'})")
+        print(f"Status: {status['status']} -> {self.status_file}")
+        
+        try:
+            while True:
+                changed, snapshot = self._wait_for_changes(snapshot)
+                checks = self.affected_checks(changed)
+                status = self.refresh(checks, changed)
+                print(f"{time.strftime('%H:%M:%S')} Changed: {', '.join(changed)} "
+                      f"-> re-ran {len(checks)} checks, status {status['status']}")
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+
+def resolve_plugin_directory(target: Path) -> Path:
+    """Map a plugin directory, mods folder or home directory to the plugin directory"""
+    target = Path(target).expanduser()
+    
+    if (target / "TurboLoaderV3.ddmod").exists() or target.name == "TurboLoaderV3":
+        return target
+    if (target / "TurboLoaderV3").is_dir():
+        return target / "TurboLoaderV3"
+    
+    # Anything else is treated as a home directory
+    return target / "Documents" / "Dungeondraft Mods" / "TurboLoaderV3"
+
+def verify_many(targets: List[Path], workers: int = 32) -> List[Dict]:
+    """Verify many installations concurrently, preserving the input order"""
+    hash_cache = HashCache()
+    gdscript_validator = GDScriptValidator() if GDScriptValidator else None
+    
+    def verify_target(target: Path) -> Dict:
+        try:
+            verifier = QuickVerification(resolve_plugin_directory(target), quiet=True,
+                                         hash_cache=hash_cache, gdscript_validator=gdscript_validator)
+            result = verifier.verify()
+        except Exception as e:
+            result = {
+                "success": False,
+                "error": f"Verification failed with error: {e}",
+                "timestamp": time.time()
+            }
+        result["target"] = str(target)
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(verify_target, targets))
+    
+    hash_cache.save()
+    return results
+
+def write_batch_report(results: List[Dict], output, report_format: str, duration: float):
+    """Write batch results as one JSON document or as JSON lines"""
+    if report_format == "jsonl":
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+        return
+    
+    passed = sum(1 for result in results if result["success"])
+    report = {
+        "summary": {
+            "total": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "duration_seconds": round(duration, 3),
+            "timestamp": time.time()
+        },
+        "results": results
+    }
+    json.dump(report, output, indent=2)
+    output.write("\n")
+
+def run_batch(args) -> int:
+    """Verify every requested target and emit a single report"""
+    targets = [Path(target) for target in args.targets]
+    if args.targets_file:
+        with open(args.targets_file, 'r', encoding='utf-8') as f:
+            targets += [Path(line.strip()) for line in f if line.strip()]
+    
+    start_time = time.time()
+    results = verify_many(targets, workers=args.workers)
+    duration = time.time() - start_time
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            write_batch_report(results, f, args.format, duration)
+    else:
+        write_batch_report(results, sys.stdout, args.format, duration)
+    
+    return 0 if all(result["success"] for result in results) else 1
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Turbo Loader v3 - Quick Installation Verification")
+    parser.add_argument("targets", nargs="*",
+                        help="Plugin directories, mods folders or home directories to verify in batch")
+    parser.add_argument("--targets-file", type=Path,
+                        help="File listing one batch target per line")
+    parser.add_argument("--workers", type=int, default=32,
+                        help="Concurrent verifications in batch mode (default: 32)")
+    parser.add_argument("--format", choices=["json", "jsonl"], default="json",
+                        help="Batch report format (default: json)")
+    parser.add_argument("--output", type=Path,
+                        help="Write the batch report to a file instead of stdout")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-verify when the plugin or mods folder changes")
+    parser.add_argument("--status-file", type=Path,
+                        default=Path.home() / ".cache" / "TurboLoaderV3" / "status.json",
+                        help="Health status file maintained in watch mode")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Polling interval in seconds when filesystem events are unavailable")
+    parser.add_argument("--write-manifest", type=Path, metavar="DIR",
+                        help=f"Write {MANIFEST_NAME} for the plugin files in DIR")
+    args = parser.parse_args()
+    
+    if args.write_manifest:
+        manifest = build_manifest(args.write_manifest, MANIFEST_FILES)
+        with open(args.write_manifest / MANIFEST_NAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Wrote {args.write_manifest / MANIFEST_NAME} ({len(manifest['files'])} files)")
+        sys.exit(0)
+    
+    if args.watch:
+        plugin_directory = resolve_plugin_directory(Path(args.targets[0]) if args.targets else Path.home())
+        try:
+            VerificationWatcher(plugin_directory, args.status_file, args.interval).run()
+        except KeyboardInterrupt:
+            print("\nSTOP  Watch mode stopped")
+        sys.exit(0)
+    
+    if args.targets or args.targets_file:
+        sys.exit(run_batch(args))
+    
     try:
         verifier = QuickVerification()
         result = verifier.verify()
         
         # Exit with appropriate code
         sys.exit(0 if result["success"] else 1)
-        
+    
     except KeyboardInterrupt:
         print("\n\nSTOP  Verification cancelled by user")
         sys.exit(130)